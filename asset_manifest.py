@@ -0,0 +1,111 @@
+"""Content-fingerprinted asset URLs for a built site (site/ or a batch CV tree).
+
+Every asset an HTML page references (stylesheets, scripts, images, cv.pdf,
+cv.docx) is also written as `<stem>.<content hash><ext>` next to the
+original, and the page is rewritten to point at that copy. An unchanged file
+keeps its URL across deploys, so browsers/CDNs can cache it forever
+(`Cache-Control: immutable`), and a changed file gets a new one. The
+originals stay in place, so existing links to e.g. assets/cv.pdf keep working.
+
+assets/manifest.json records logical path -> fingerprinted path. Running
+fingerprint_site() again after an asset changed (build.py's publish stage
+copies in a fresh cv.pdf/cv.docx after the site build) re-resolves every
+reference - including ones that already carry an older hash - and removes the
+stale copies.
+"""
+import hashlib
+import json
+import posixpath
+import re
+import shutil
+from pathlib import Path
+
+HASH_LENGTH = 10
+MANIFEST_NAME = "assets/manifest.json"
+
+_HASHED = re.compile(r"^(?P<stem>.+)\.[0-9a-f]{%d}(?P<ext>\.[^./]+)$" % HASH_LENGTH)
+_URL_ATTR = re.compile(r"""(?P<attr>\b(?:href|src|srcset))=(?P<q>["'])(?P<value>[^"']*)(?P=q)""")
+# Already content-addressed by image_variants.py - no second hash needed.
+_SKIP_PREFIXES = ("assets/img/derived/",)
+
+
+def content_hash(path):
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=8).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(rel, digest):
+    base, ext = posixpath.splitext(rel)
+    return f"{base}.{digest}{ext}"
+
+
+def logical_name(rel):
+    """`stylesheets/style.<hash>.css` -> `stylesheets/style.css` (others unchanged)."""
+    match = _HASHED.match(rel)
+    return match["stem"] + match["ext"] if match else rel
+
+
+def _resolve(page_dir, url):
+    """Site-relative path of a page-relative URL, or None for anything that
+    isn't a local file reference."""
+    if not url or re.match(r"^(?:[a-z][a-z0-9+.-]*:|/|#)", url, re.IGNORECASE):
+        return None
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    return posixpath.normpath(posixpath.join(page_dir, path)) if path else None
+
+
+def fingerprint_site(site_dir):
+    """Fingerprint every local asset referenced from site_dir's HTML pages and
+    rewrite the pages to use the fingerprinted URLs. Returns the manifest."""
+    site_dir = Path(site_dir)
+    manifest_file = site_dir / MANIFEST_NAME
+    try:
+        previous = json.loads(manifest_file.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        previous = {}
+    manifest = {}
+
+    def fingerprinted(rel):
+        logical = logical_name(rel)
+        if logical.endswith(".html") or logical.startswith(_SKIP_PREFIXES) or not (site_dir / logical).is_file():
+            return None
+        if logical not in manifest:
+            target = hashed_name(logical, content_hash(site_dir / logical))
+            if not (site_dir / target).is_file():
+                shutil.copyfile(site_dir / logical, site_dir / target)
+            manifest[logical] = target
+        return manifest[logical]
+
+    def rewrite_url(page_dir, url):
+        rel = _resolve(page_dir, url)
+        target = rel and fingerprinted(rel)
+        if not target:
+            return url
+        suffix = url[len(url.split("#", 1)[0].split("?", 1)[0]):]
+        return posixpath.relpath(target, page_dir or ".") + suffix
+
+    for page in site_dir.rglob("*.html"):
+        page_dir = posixpath.dirname(page.relative_to(site_dir).as_posix())
+
+        def rewrite(match):
+            value = match["value"]
+            if match["attr"] == "srcset":
+                value = ", ".join(
+                    " ".join([rewrite_url(page_dir, parts[0])] + parts[1:])
+                    for parts in (candidate.split() for candidate in value.split(",")) if parts
+                )
+            else:
+                value = rewrite_url(page_dir, value)
+            return f"{match['attr']}={match['q']}{value}{match['q']}"
+
+        html = page.read_text(encoding="utf-8")
+        rewritten = _URL_ATTR.sub(rewrite, html)
+        if rewritten != html:
+            page.write_text(rewritten, encoding="utf-8")
+
+    for logical, stale in previous.items():
+        if manifest.get(logical) != stale:
+            for path in (stale, f"{stale}.gz", f"{stale}.br"):  # incl. site_optimize.py's siblings
+                (site_dir / path).unlink(missing_ok=True)
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    manifest_file.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return manifest
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Batch build: render HTML, DOCX and PDF for many consultants' CV data trees
+from one process pool.
+
+Each argument is a data directory laid out like docs/data/ (one per
+consultant); the profile photo is resolved relative to its parent, exactly
+like generate_docx.py does for docs/data/. Output per consultant goes to
+<out>/<name>/ with the same layout as site/ (cv.html, cv-print.html,
+assets/cv.pdf, assets/cv.docx), so the download links in the page keep working.
+
+The page is rendered without running MkDocs per CV: each worker loads the
+Jinja environments, the pages, their shell templates and the static assets once
+(_init_worker), then renders every CV it is handed with main.py's *_html()
+functions against that consultant's own DataStore. PDFs are printed afterwards
+from the parent process through one pdf_backends backend (e.g. `--pdf-backend
+pool`: one long-lived browser shared by all CVs instead of one per worker).
+
+DOCX and PDF are skipped for a CV whose inputs are unchanged since the last
+run into the same --out folder (build_cache.py manifest per CV; `--force`
+rebuilds everything).
+
+With --profile (or CV_PROFILE=1) the workers' timings (macros, data loads,
+DOCX sections) and the PDF stage end up in one table and trace, see profiling.py.
+
+Usage: python batch_build.py roster/*/data --out build/roster --jobs 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import markdown as md
+from jinja2 import Environment, FileSystemLoader
+from mkdocs.utils import yaml_load
+from mkdocs.utils.meta import get_data
+
+import generate_docx
+import main
+import profiling
+from site_optimize import optimize_site
+from build_cache import BuildManifest, fingerprint, pdf_inputs
+from consultants import consultant_names
+from cv_data import get_store
+from cv_model import load_cv
+from pdf_backends import BACKEND_HELP, BACKENDS, PdfError, backend_name, get_backend
+from template_cache import bytecode_cache, format_stats, take_stats
+
+ROOT = Path(__file__).resolve().parent
+DOCS_DIR = ROOT / "docs"
+OVERRIDES_DIR = ROOT / "overrides"
+MKDOCS_YML = ROOT / "mkdocs.yml"
+# docs page -> output file; cv-print.html is the PDF source (see generate_pdf.py).
+PAGES = {"cv.md": "cv.html", "cv-print.md": "cv-print.html"}
+PRINT_PAGE = "cv-print.html"
+
+# Shared, consultant-independent files copied into every output tree.
+STATIC_ASSETS = ["stylesheets", "javascripts", "assets/img/logo-header.jpg", "assets/img/icons"]
+
+# MkDocs always enables these on top of mkdocs.yml's markdown_extensions.
+MKDOCS_DEFAULT_EXTENSIONS = ["toc", "tables", "fenced_code"]
+
+FORMATS = ("html", "docx", "pdf")
+
+
+class _Page:
+    def __init__(self, content, meta):
+        self.content = content
+        self.meta = meta
+
+
+class WorkerContext:
+    """Everything that is identical for every CV, loaded once per worker process."""
+
+    def __init__(self):
+        with MKDOCS_YML.open(encoding="utf-8") as f:
+            self.config = yaml_load(f)
+        self.config.setdefault("extra_css", [])
+        self.config.setdefault("extra_javascript", [])
+
+        extensions = MKDOCS_DEFAULT_EXTENSIONS + [
+            e for e in self.config.get("markdown_extensions", []) if isinstance(e, str)
+        ]
+        self.markdown = md.Markdown(extensions=extensions)
+
+        # Page-level Jinja (what mkdocs-macros-plugin does to docs/*.md) and the
+        # page shells (what MkDocs does with overrides/*.html).
+        self.page_env = Environment(loader=FileSystemLoader(DOCS_DIR), bytecode_cache=bytecode_cache("batch-pages"))
+        shell_env = Environment(loader=FileSystemLoader(OVERRIDES_DIR), bytecode_cache=bytecode_cache("batch-shell"))
+        shell_env.filters["url"] = lambda value: value
+        shell_env.globals["inline_asset"] = lambda path: main.inline_asset(DOCS_DIR, path)
+        self.pages = {}
+        for page, output in PAGES.items():
+            source, meta = get_data((DOCS_DIR / page).read_text(encoding="utf-8"))
+            self.pages[output] = (
+                self.page_env.from_string(source),
+                shell_env.get_template(meta.get("template", "main.html")),
+                {**self.config.get("extra", {}), **meta},
+            )
+
+        self.static_files = {}
+        for entry in STATIC_ASSETS:
+            path = DOCS_DIR / entry
+            files = [p for p in path.rglob("*") if p.is_file()] if path.is_dir() else [path]
+            for f in files:
+                self.static_files[f.relative_to(DOCS_DIR).as_posix()] = f.read_bytes()
+
+    def macros(self, store, lazy_details):
+        """The define_env() macros, bound to one consultant's DataStore;
+        lazy engagement details are collected into `lazy_details`."""
+        def render_personal_text():
+            return main.personal_text_html(
+                store, lambda text: self.page_env.from_string(text).render(**macros)
+            )
+
+        macros = {
+            "render_personal_data": lambda print_layout=False: main.personal_data_html(store, bool(print_layout)),
+            "experience_years": lambda: main.compute_experience_years(load_cv(store).engagements),
+            "render_personal_text": render_personal_text,
+            "render_education_table": lambda source, bold=False: main.education_table_html(store, source, bold),
+            "render_courses": lambda source: main.courses_html(store, source),
+            "render_engagements": lambda expand_all=False, lazy=False: main.engagements_html(
+                store, bool(expand_all), lazy_details if lazy else None
+            ),
+            "render_timeline": lambda: main.timeline_html(store),
+            "render_expertise_tags": lambda: main.expertise_tags_html(store),
+        }
+        macros = {name: profiling.profiled("macro", name)(fn) for name, fn in macros.items()}
+        return macros
+
+    @profiling.profiled("page")
+    def render_html(self, store, output, lazy_details, search_index_url=None):
+        page_template, shell_template, variables = self.pages[output]
+        page_md = page_template.render(**variables, **self.macros(store, lazy_details))
+        content = self.markdown.reset().convert(page_md)
+        return shell_template.render(
+            config=self.config,
+            page=_Page(content, variables),
+            contact_sidebar_html=main.contact_sidebar_html(store),
+            download_name=main.download_name(store),
+            search_index_url=search_index_url,
+            **main.publication_dates(),
+        )
+
+
+_worker = None
+
+
+def _init_worker():
+    global _worker
+    _worker = WorkerContext()
+
+
+def manifest_for(out_dir):
+    return BuildManifest(Path(out_dir) / ".build-manifest.json")
+
+
+def build_one(data_dir, out_dir, formats, force=False):
+    """Render one consultant's HTML/DOCX. Runs inside a worker process."""
+    data_dir = Path(data_dir)
+    out_dir = Path(out_dir)
+    result = {"name": out_dir.name, "ok": True, "error": None, "timings": {}, "hits": [], "misses": []}
+    log = io.StringIO()
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            out_dir.mkdir(parents=True, exist_ok=True)
+            store = get_store(data_dir)
+            cv = load_cv(store)  # parsed and derived once, shared by HTML and DOCX
+
+            if "html" in formats or "pdf" in formats:
+                t = time.perf_counter()
+                lazy_details = {}
+                search_path, search_index = main.search_index_file(store)
+                if search_index.over_budget:
+                    print(f"⚠ {out_dir.name}: {main.search_index_summary(search_index)}", file=sys.stderr)
+                for output in PAGES.values():
+                    html = _worker.render_html(store, output, lazy_details, search_path)
+                    (out_dir / output).write_text(html, encoding="utf-8")
+                main.write_files(out_dir, lazy_details)
+                # Content-hashed name: drop the index (+ .gz/.br) of an earlier run.
+                (out_dir / main.SEARCH_INDEX_DIR).mkdir(parents=True, exist_ok=True)
+                for stale in (out_dir / main.SEARCH_INDEX_DIR).glob("search-index.*.json*"):
+                    if not stale.name.startswith(Path(search_path).name):
+                        stale.unlink()
+                (out_dir / search_path).write_bytes(search_index.data)
+                for rel, content in _worker.static_files.items():
+                    target = out_dir / rel
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(content)
+                for layout in (False, True):
+                    for rel, cached in main.profile_photo_variants(store, layout)[1].items():
+                        target = out_dir / rel
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        target.write_bytes(cached.read_bytes())
+                result["timings"]["html"] = time.perf_counter() - t
+
+            if "docx" in formats:
+                t = time.perf_counter()
+                manifest = manifest_for(out_dir)
+                ok = generate_docx.generate_docx_if_changed(
+                    data_dir, out_dir / "assets" / "cv.docx", force, manifest, cv
+                )
+                manifest.save()
+                result["hits"] += manifest.hits
+                result["misses"] += manifest.misses
+                if not ok:
+                    raise RuntimeError("DOCX generation failed")
+                result["timings"]["docx"] = time.perf_counter() - t
+            store.save_snapshot()  # the next run loads this CV in one read
+    except Exception as e:
+        result["ok"] = False
+        result["error"] = f"{type(e).__name__}: {e}\n{log.getvalue()}".strip()
+    result["timings"]["total"] = time.perf_counter() - started
+    # Template loads since this worker's previous CV (i.e. only its first one has any).
+    result["templates"] = take_stats()
+    result["profile"] = profiling.take_events()  # empty unless profiling
+    return result
+
+
+def print_report(results, formats, wall):
+    columns = [f for f in FORMATS if f in formats] + ["total"]
+    name_width = max([len(r["name"]) for r in results] + [10])
+    print()
+    print(f"{'CV':<{name_width}}  " + "  ".join(f"{c:>8}" for c in columns) + "  status")
+    for r in sorted(results, key=lambda r: r["name"]):
+        cells = "  ".join(
+            f"{r['timings'][c]:>7.2f}s" if c in r["timings"] else f"{'-':>8}" for c in columns
+        )
+        print(f"{r['name']:<{name_width}}  {cells}  {'ok' if r['ok'] else 'FAILED'}")
+
+    failed = [r for r in results if not r["ok"]]
+    for r in failed:
+        print(f"\n✗ {r['name']}: {r['error']}")
+
+    done = len(results) - len(failed)
+    rate = len(results) / wall if wall else 0.0
+    hits = sum(len(r["hits"]) for r in results)
+    misses = sum(len(r["misses"]) for r in results)
+    print()
+    print(f"✓ {done}/{len(results)} CVs built in {wall:.2f}s ({rate:.2f} CV/s)")
+    print(f"  artifact cache: {hits} hit(s), {misses} miss(es)")
+    if results:
+        templates = {key: sum(r["templates"][key] for r in results) for key in results[0]["templates"]}
+        print(f"  {format_stats(templates)}")
+
+
+def print_pdfs(results, out_root, pdf_backend, jobs, force=False):
+    """PDF stage: print every successfully rendered cv-print.html whose inputs
+    changed, through one backend."""
+    name = backend_name(pdf_backend)
+    todo = []
+    for r in results:
+        if not r["ok"]:
+            continue
+        out_dir = out_root / r["name"]
+        manifest = manifest_for(out_dir)
+        html_file, output_pdf = out_dir / PRINT_PAGE, out_dir / "assets" / "cv.pdf"
+        fp = fingerprint(pdf_inputs(html_file), extra=[name])
+        fresh = manifest.is_fresh(output_pdf.name, fp, output_pdf, force)
+        r["hits" if fresh else "misses"].append(output_pdf.name)
+        if fresh:
+            r["timings"]["pdf"] = 0.0
+        else:
+            todo.append((r, manifest, fp, html_file, output_pdf))
+    if not todo:
+        return
+
+    options = {"size": jobs or 4} if name == "pool" else {}
+    try:
+        backend = get_backend(name, **options)
+    except PdfError as e:
+        for r, *_ in todo:
+            r["ok"], r["error"] = False, f"PDF: {e}"
+        return
+    with backend:
+        printed = backend.print_many([(html_file, output_pdf) for _, _, _, html_file, output_pdf in todo])
+    for (r, manifest, fp, _, output_pdf), p in zip(todo, printed):
+        r["timings"]["pdf"] = p["seconds"]
+        r["timings"]["total"] += p["seconds"]
+        if p["ok"]:
+            manifest.record(output_pdf.name, fp, output_pdf)
+        else:
+            manifest.forget(output_pdf.name)
+            r["ok"], r["error"] = False, f"PDF: {p['error']}"
+        manifest.save()
+
+
+def build_batch(data_dirs, out_root, formats=FORMATS, jobs=None, pdf_backend=None, force=False):
+    """Build every data dir in `data_dirs` into <out_root>/<name>/; returns per-CV results."""
+    out_root = Path(out_root)
+    tasks = [(Path(d), out_root / name) for d, name in zip(data_dirs, consultant_names(data_dirs))]
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = [pool.submit(build_one, d, o, tuple(formats), force) for d, o in tasks]
+        for future in as_completed(futures):
+            r = future.result()
+            profiling.add_events(r.pop("profile"))
+            results.append(r)
+            print(f"{'✓' if r['ok'] else '✗'} {r['name']} ({r['timings']['total']:.2f}s)")
+    if "pdf" in formats:
+        print_pdfs(results, out_root, pdf_backend, jobs, force)
+    if "html" in formats:
+        # Last, so the URLs point at this run's cv.pdf/cv.docx.
+        for r in results:
+            if r["ok"]:
+                optimize_site(out_root / r["name"], log=lambda line: None)
+    wall = time.perf_counter() - started
+    print_report(results, formats, wall)
+    return results
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Build many CVs (HTML, DOCX, PDF) in parallel.")
+    parser.add_argument("data_dirs", nargs="+", type=Path, help="docs/data-style directories, one per consultant")
+    parser.add_argument("--out", type=Path, default=ROOT / "build" / "batch", help="output root (default: build/batch)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: CPU count)")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="comma-separated subset of html,docx,pdf")
+    parser.add_argument("--pdf-backend", choices=list(BACKENDS), help=BACKEND_HELP)
+    parser.add_argument("--force", action="store_true", help="regenerate DOCX/PDF even if their inputs are unchanged")
+    parser.add_argument("--profile", action="store_true",
+                        help="time macros, data loads, DOCX sections and PDF stages (also: CV_PROFILE=1)")
+    args = parser.parse_args(argv)
+    if args.profile:
+        profiling.enable()
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+    missing = [d for d in args.data_dirs if not d.is_dir()]
+    if missing:
+        parser.error(f"not a directory: {', '.join(map(str, missing))}")
+
+    results = build_batch(args.data_dirs, args.out, formats, args.jobs, args.pdf_backend, args.force)
+    profiling.finish("batch_build")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main_cli())
+    except KeyboardInterrupt:
+        print("\nCancelled by user")
+        sys.exit(1)
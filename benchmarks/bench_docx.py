@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""DOCX throughput: python-docx writer vs docx_writer.py's fast path.
+
+For docs/data/ and synthetic trees of --scales engagements (synthetic_data.py),
+writes the CV with both writers, checks that every package part (document.xml,
+relationships, content types, media, styles) is byte-identical, and reports
+the median time per document and documents per second over --rounds rounds:
+
+    python benchmarks/bench_docx.py
+    python benchmarks/bench_docx.py --scales 100,1000,5000 --rounds 3
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import generate_docx  # noqa: E402
+from cv_data import get_store  # noqa: E402
+from cv_model import load_cv  # noqa: E402
+from synthetic_data import generate  # noqa: E402
+
+
+def parts(path):
+    with zipfile.ZipFile(path) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+def timed(cv, output_file, writer, rounds):
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_docx.generate_docx(output_file=output_file, cv=cv, writer=writer)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def bench(label, data_dir, rounds, work):
+    cv = load_cv(get_store(data_dir))
+    results = {}
+    for writer in generate_docx.WRITERS:
+        results[writer] = timed(cv, work / f"{writer}.docx", writer, rounds)
+    reference, fast = parts(work / "python-docx.docx"), parts(work / "fast.docx")
+    different = sorted(name for name in reference.keys() | fast.keys() if reference.get(name) != fast.get(name))
+    slow, quick = results["python-docx"], results["fast"]
+    print(f"{label:<22} {slow * 1000:>9.1f} ms {1 / slow:>7.1f}/s   {quick * 1000:>9.1f} ms {1 / quick:>7.1f}/s"
+          f"   {slow / quick:>5.1f}x   {len(reference['word/document.xml']) / 1024:>8.0f} KiB   "
+          + ("identical" if not different else f"DIFFERENT: {', '.join(different)}"))
+    return not different
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the python-docx and fast DOCX writers.")
+    parser.add_argument("--scales", default="100,1000", help="synthetic engagement counts (default: 100,1000)")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'':<22} {'python-docx':>22}   {'fast':>22}   {'':>6}   {'document.xml':>12}")
+    trees = [("docs/data", generate_docx.DATA_DIR)]
+    trees += [(f"{n} engagements", generate(ROOT / "build" / "bench" / f"cv-{n}", engagements=n))
+              for n in map(int, args.scales.split(","))]
+    with tempfile.TemporaryDirectory() as work:
+        identical = [bench(label, data_dir, args.rounds, Path(work)) for label, data_dir in trees]
+    if not all(identical):
+        print("✗ the writers' output differs")
+        return 1
+    print("✓ both writers produce identical packages")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
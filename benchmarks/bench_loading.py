@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark: loading a docs/data tree three ways.
+
+- python:   PyYAML's pure-Python SafeLoader, every file parsed
+- libyaml:  the CSafeLoader cv_data uses when PyYAML has it
+- snapshot: the tree's .cache/data snapshot (one read, a stat per file)
+
+Each round starts from a fresh DataStore, as a new build process or batch
+worker would, and loads every file cv_model reads. Prints the median time per
+load and the speed-up over the pure-Python parser:
+
+    python benchmarks/bench_loading.py [data_dir ...] [--rounds 20]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from cv_data import DataStore, compile_snapshot  # noqa: E402
+from cv_model import INPUT_FILES  # noqa: E402
+
+
+def load_tree(store):
+    """Every file cv_model reads, the way it reads them."""
+    store.load_files([name for name, _ in INPUT_FILES.values()], default=None)
+    return len(store.load_engagements())
+
+
+def time_rounds(make_store, rounds):
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        load_tree(make_store())
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def seeded(data_dir):
+    store = DataStore(data_dir)
+    if not store.load_snapshot():
+        raise RuntimeError(f"no snapshot for {data_dir}")
+    return store
+
+
+def bench(data_dir, rounds):
+    compile_snapshot(data_dir)
+    paths = {"python": lambda: DataStore(data_dir, loader=yaml.SafeLoader)}
+    if hasattr(yaml, "CSafeLoader"):
+        paths["libyaml"] = lambda: DataStore(data_dir, loader=yaml.CSafeLoader)
+    paths["snapshot"] = lambda: seeded(data_dir)
+    return {name: time_rounds(make_store, rounds) for name, make_store in paths.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare YAML parsing (pure Python / libyaml) with the data snapshot.")
+    parser.add_argument("data_dirs", nargs="*", type=Path, default=[ROOT / "docs" / "data"])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    if not hasattr(yaml, "CSafeLoader"):
+        print("! PyYAML without libyaml: skipping the libyaml path")
+    for data_dir in args.data_dirs:
+        files = len(list(data_dir.glob("*.yml"))) + len(list((data_dir / "engagements").glob("*.yml")))
+        results = bench(data_dir, args.rounds)
+        print(f"\n{data_dir} ({files} YAML files, median of {args.rounds})")
+        for name, seconds in results.items():
+            print(f"  {name:<9} {seconds * 1000:8.2f} ms  {results['python'] / seconds:5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
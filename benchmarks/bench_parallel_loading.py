@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark: serial vs concurrent loading of a docs/data tree, on a local
+disk and on a simulated network share.
+
+The network share is a DataStore whose stat, read and directory listing each
+sleep `--latency` milliseconds first (like a round trip to an SMB/NFS
+server). Every round uses a fresh store without snapshot, so every file is
+stat'ed, read and parsed. Prints the median per worker count and the
+speed-up over one worker, and checks that each worker count returns the
+engagements in the same order:
+
+    python benchmarks/bench_parallel_loading.py [data_dir] [--latency 5] [--workers 1,4,8,16]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_loading import load_tree  # noqa: E402
+from cv_data import DataStore  # noqa: E402
+
+
+class SlowStore(DataStore):
+    """DataStore on a file system with a fixed per-call latency."""
+
+    def __init__(self, data_dir, latency, workers):
+        super().__init__(data_dir, workers=workers)
+        self.latency = latency
+
+    def _stat(self, path):
+        time.sleep(self.latency)
+        return super()._stat(path)
+
+    def _read(self, path):
+        time.sleep(self.latency)
+        return super()._read(path)
+
+    def _list(self, directory, pattern):
+        time.sleep(self.latency)
+        return super()._list(directory, pattern)
+
+
+def run(data_dir, latency, workers, rounds):
+    times, orders = [], set()
+    for _ in range(rounds):
+        store = SlowStore(data_dir, latency, workers)
+        started = time.perf_counter()
+        load_tree(store)
+        times.append(time.perf_counter() - started)
+        orders.add(tuple(r.get("order") for r in store.load_engagements()))
+    if len(orders) != 1:
+        raise AssertionError(f"engagement order differs between rounds with {workers} workers")
+    return statistics.median(times), orders.pop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare serial and concurrent data loading.")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=ROOT / "docs" / "data")
+    parser.add_argument("--latency", type=float, default=5.0, help="simulated latency per call in ms (default: 5)")
+    parser.add_argument("--workers", default="1,4,8,16", help="worker counts to compare (default: 1,4,8,16)")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    worker_counts = [int(w) for w in args.workers.split(",")]
+
+    files = len(list(args.data_dir.glob("*.yml"))) + len(list((args.data_dir / "engagements").glob("*.yml")))
+    print(f"{args.data_dir} ({files} YAML files, median of {args.rounds})")
+    expected = None
+    for label, latency in (("local", 0.0), (f"{args.latency:g} ms", args.latency / 1000)):
+        print(f"\n  {label}")
+        baseline = None
+        for workers in worker_counts:
+            seconds, order = run(args.data_dir, latency, workers, args.rounds)
+            if expected is None:
+                expected = order
+            elif order != expected:
+                raise AssertionError(f"engagement order differs with {workers} workers")
+            baseline = baseline or seconds
+            print(f"    {workers:>3} worker(s) {seconds * 1000:8.2f} ms  {baseline / seconds:5.1f}x")
+    print("\n✓ engagement order identical for every worker count")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
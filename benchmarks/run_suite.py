@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Benchmark suite: every pipeline stage on synthetic CVs of several sizes.
+
+For each --scales entry (number of engagements) a tree is generated with
+synthetic_data.py into build/bench/cv-<n>/, then timed, each over --rounds
+rounds (median and minimum reported):
+
+- load          fresh DataStore without snapshot + cv_model.load_cv (parse + derive)
+- macro.*       each main.py macro function, fragment and Markdown caches
+                cleared first (a cold `mkdocs build`)
+- docx          generate_docx.generate_docx() from the loaded CV
+- docx.fast     the same with docx_writer.py's fast writer
+- pdf.html      rendering cv-print.html, the page the PDF is printed from
+                (generate_pdf.py prints it as is; this is all its preparation)
+- pdf.print     printing it with --pdf-backend (default fake: no browser)
+- build         batch_build.build_batch() for the one CV: HTML, DOCX, PDF and
+                site optimisation, as `batch_build.py` runs it
+
+Results go to build/bench/<timestamp>.json (or --out) with the commit,
+Python version and machine, so runs can be compared over time; --compare
+prints the change per stage against an earlier result file:
+
+    python benchmarks/run_suite.py --scales 10,1000,10000 --rounds 3
+    python benchmarks/run_suite.py --compare build/bench/20261018-120000.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import batch_build  # noqa: E402
+import cv_markdown  # noqa: E402
+import generate_docx  # noqa: E402
+import main  # noqa: E402
+from cv_data import DataStore, get_store  # noqa: E402
+from cv_model import load_cv  # noqa: E402
+from fragment_cache import FRAGMENTS  # noqa: E402
+from pdf_backends import get_backend  # noqa: E402
+from synthetic_data import generate  # noqa: E402
+
+BENCH_DIR = ROOT / "build" / "bench"
+
+MACROS = {
+    "personal_data": lambda store: main.personal_data_html(store),
+    "personal_text": lambda store: main.personal_text_html(store),
+    "education_table": lambda store: main.education_table_html(store, "educations"),
+    "courses": lambda store: main.courses_html(store, "courses"),
+    "engagements": lambda store: main.engagements_html(store),
+    "engagements_print": lambda store: main.engagements_html(store, expand_all=True),
+    "timeline": lambda store: main.timeline_html(store),
+    "expertise_tags": lambda store: main.expertise_tags_html(store),
+    "search_index": lambda store: main.search_index_file(store),
+}
+
+
+def cold():
+    FRAGMENTS.clear()
+    cv_markdown.cache_clear()
+
+
+def measure(fn, rounds, setup=None):
+    times = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return {"median": statistics.median(times), "min": min(times), "rounds": rounds}
+
+
+def quiet(fn):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+
+def bench_scale(engagements, rounds, pdf_backend, work):
+    data_dir = generate(BENCH_DIR / f"cv-{engagements}", engagements=engagements)
+    store = get_store(data_dir)
+    load_cv(store)
+    results = {"load": measure(lambda: load_cv(DataStore(data_dir)), rounds)}
+    for name, macro in MACROS.items():
+        results[f"macro.{name}"] = measure(lambda: macro(store), rounds, setup=cold)
+
+    docx_file = work / f"cv-{engagements}.docx"
+    for stage, writer in (("docx", "python-docx"), ("docx.fast", "fast")):
+        results[stage] = measure(
+            quiet(lambda: generate_docx.generate_docx(data_dir, docx_file, load_cv(store), writer)), rounds
+        )
+
+    batch_build._init_worker()
+    print_html = work / f"cv-{engagements}-print.html"
+
+    def render_print_page():
+        print_html.write_text(batch_build._worker.render_html(store, batch_build.PRINT_PAGE, {}), encoding="utf-8")
+
+    results["pdf.html"] = measure(render_print_page, rounds, setup=cold)
+    with get_backend(pdf_backend) as backend:
+        results["pdf.print"] = measure(lambda: backend.print_pdf(print_html, work / f"cv-{engagements}.pdf"), rounds)
+
+    results["build"] = measure(
+        quiet(lambda: batch_build.build_batch([data_dir], work / "batch", jobs=1, pdf_backend=pdf_backend, force=True)),
+        rounds,
+    )
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, previous=None):
+    for scale, stages in results.items():
+        print(f"\n{scale} engagements")
+        before = (previous or {}).get(scale, {})
+        for stage, r in stages.items():
+            line = f"  {stage:<24} {r['median'] * 1000:>10.1f} ms  (min {r['min'] * 1000:.1f})"
+            if stage in before:
+                change = (r["median"] - before[stage]["median"]) / before[stage]["median"] * 100
+                line += f"  {change:+6.1f}%"
+            print(line)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic CVs.")
+    parser.add_argument("--scales", default="10,1000", help="engagement counts, comma-separated (default: 10,1000)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--pdf-backend", default="fake", help="PDF backend for pdf.print and build (default: fake)")
+    parser.add_argument("--out", type=Path, help="result file (default: build/bench/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(",")]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work:
+        for scale in scales:
+            print(f"… {scale} engagements", flush=True)
+            results[str(scale)] = bench_scale(scale, args.rounds, args.pdf_backend, Path(work))
+
+    now = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "date": now.isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "rounds": args.rounds,
+            "pdf_backend": args.pdf_backend,
+        },
+        "results": results,
+    }
+    previous = json.loads(args.compare.read_text(encoding="utf-8"))["results"] if args.compare else None
+    print_results(results, previous)
+
+    out = args.out or BENCH_DIR / f"{now:%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\n✓ results: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Synthetic CV data: a docs/data/ tree of any size, for benchmarks.
+
+Writes <out>/docs/data/ (personal data, contacts, personal text, educations,
+certifications, courses, courses-short, one YAML file per engagement) and
+<out>/docs/assets/img/profile-photo.jpg (this repo's photo), i.e. a tree
+batch_build.py, roster_index.py and the benchmarks accept as is:
+
+    python benchmarks/synthetic_data.py build/bench/cv-1000 --engagements 1000
+
+Engagements get random but valid periods between 1985 and now in every
+format periods.py reads ("mrt 2019 – jun 2020", "03-2019 – 06-2020",
+"2019 – 2021", "2024 – heden"), so they overlap like a long freelance
+career would; activities are Markdown bullet lists of --activity-lines
+lines. The same --seed always gives the same tree.
+"""
+import argparse
+import random
+import shutil
+import sys
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from cv_data import to_yaml  # noqa: E402
+
+MONTH_NAMES = ["jan", "feb", "mrt", "apr", "mei", "jun", "jul", "aug", "sep", "okt", "nov", "dec"]
+ORGANISATIONS = [
+    "Gemeente Utrecht", "Rabobank", "Belastingdienst", "ProRail", "Rijkswaterstaat", "UWV", "Achmea",
+    "Gemeente Amsterdam", "Kadaster", "DUO", "Nationale-Nederlanden", "ING", "KLM", "Alliander", "SVB",
+]
+ROLES = [
+    "Solution Architect", "Enterprise Architect", "Integratie Architect", "Lead Developer",
+    "Domeinarchitect", "Technisch Architect", "Cloud Architect", "Security Architect",
+]
+KEYWORDS = [
+    "ArchiMate", "TOGAF", "Common Ground", "GEMMA", "Kubernetes", "OpenShift", "Kafka", "IAM", "Azure",
+    "AWS", "API-management", "Microservices", "Event Driven Architecture", "SAFe", "Java", "Python",
+    "Terraform", "DevOps", "Zero Trust", "Datamodellering", "BPMN", "Camunda", "Keycloak", "Mulesoft",
+]
+VERBS = ["Ontwerpen", "Beschrijven", "Begeleiden", "Toetsen", "Opzetten", "Uitwerken", "Afstemmen", "Realiseren"]
+OBJECTS = [
+    "de doelarchitectuur", "een integratieplatform", "de API-strategie", "het informatiemodel",
+    "de migratie naar de cloud", "de beveiligingsrichtlijnen", "het ontwerp van de keten",
+    "de architectuurprincipes", "een event-gedreven koppeling", "de roadmap",
+]
+CONTEXT = ["met het ontwikkelteam", "voor de product owner", "binnen het programma", "samen met de leverancier",
+           "in de architectuurboard", "over meerdere domeinen", ""]
+INSTITUTES = ["Vijfhart", "Arcitura", "The Open Group", "Scaled Agile Inc", "Xebia", "Cibit Academy", "IBM Coursera"]
+COURSES = ["ArchiMate 3", "TOGAF 10", "Kubernetes Fundamentals", "Microservices", "Azure Architect",
+           "Domain Driven Design", "Event Storming", "Zakelijk schrijven", "Leiderschap", "Security by Design"]
+
+
+def sentence(rng):
+    return " ".join(filter(None, [rng.choice(VERBS), rng.choice(OBJECTS), rng.choice(CONTEXT)])) + "."
+
+
+def bullets(rng, lines):
+    return "\n".join(f"- {sentence(rng)}" for _ in range(lines))
+
+
+def period_text(rng, start, end, ongoing):
+    """One of the formats periods.py reads, for months start..end (inclusive)."""
+    if ongoing:
+        return f"{start.year} – heden"
+    style = rng.randrange(3)
+    if style == 0:
+        return f"{MONTH_NAMES[start.month - 1]} {start.year} – {MONTH_NAMES[end.month - 1]} {end.year}"
+    if style == 1:
+        return f"{start.month:02d}-{start.year} – {end.month:02d}-{end.year}"
+    return f"{start.year} – {end.year}"
+
+
+def engagement(rng, activity_lines, today, ongoing=False):
+    months = (today.year - 1985) * 12 + today.month - 1
+    first = rng.randrange(months - 1)
+    start = date(1985 + first // 12, first % 12 + 1, 1)
+    last = min(months - 1, first + rng.randrange(1, 36))
+    end = date(1985 + last // 12, last % 12 + 1, 1)
+    return {
+        "period": period_text(rng, start, end, ongoing),
+        "order": int(start.strftime("%Y%m%d")),
+        "organisation": rng.choice(ORGANISATIONS),
+        "role": rng.choice(ROLES),
+        "activities": bullets(rng, activity_lines),
+        "achievements": bullets(rng, max(1, activity_lines // 3)),
+        "keywords": ", ".join(rng.sample(KEYWORDS, rng.randint(3, 8))),
+    }
+
+
+def course_group(rng, year, items):
+    return {
+        "period": str(year),
+        "items_text": ", ".join(f"{rng.choice(COURSES)}, {rng.choice(INSTITUTES)}" for _ in range(items)),
+    }
+
+
+def generate(out, engagements=10, course_groups=10, courses_per_group=3, activity_lines=8, seed=0, today=None):
+    """Write a synthetic tree below `out`; returns its data directory."""
+    rng = random.Random(seed)
+    today = today or date.today()
+    data_dir = Path(out) / "docs" / "data"
+    if data_dir.exists():
+        shutil.rmtree(data_dir)
+    (data_dir / "engagements").mkdir(parents=True)
+    photo = ROOT / "docs" / "assets" / "img" / "profile-photo.jpg"
+    if photo.is_file():
+        (data_dir.parent / "assets" / "img").mkdir(parents=True, exist_ok=True)
+        shutil.copy2(photo, data_dir.parent / "assets" / "img" / photo.name)
+
+    files = {
+        "personal-data.yml": {
+            "photo": "assets/img/profile-photo.jpg",
+            "headline": "IT-Architect",
+            "fields": [
+                {"label": "Naam", "value": f"Consultant {seed}"},
+                {"label": "Woonplaats", "value": "Utrecht"},
+                {"label": "Functie", "value": rng.choice(ROLES)},
+                {"label": "Beschikbaar per", "value": "1 september 2026"},
+            ],
+        },
+        "contact.yml": [
+            {"type": "email", "label": f"consultant{seed}@example.com",
+             "url": f"mailto:consultant{seed}@example.com", "title": f"consultant{seed}@example.com"},
+            {"type": "website", "label": "Website", "url": "https://example.com/", "title": "https://example.com/"},
+        ],
+        "educations.yml": [
+            {"period": "1989–1995", "name": "WO Informatica", "institute": "Universiteit Utrecht",
+             "place": "Utrecht", "description": sentence(rng)},
+            {"period": "1983–1989", "name": "VWO", "institute": "Stedelijk Gymnasium", "place": "Utrecht"},
+        ],
+        "certifications.yml": [
+            {"period": str(today.year - i), "name": f"{rng.choice(COURSES)} Practitioner",
+             "institute": rng.choice(INSTITUTES)}
+            for i in range(max(1, course_groups // 3))
+        ],
+        "courses.yml": [course_group(rng, today.year - i, courses_per_group) for i in range(course_groups)],
+        "courses-short.yml": [course_group(rng, today.year - i, 1) for i in range(max(1, course_groups // 2))],
+    }
+    for name, value in files.items():
+        (data_dir / name).write_text(to_yaml(value), encoding="utf-8")
+    (data_dir / "personal-text.md").write_text(
+        "\n\n".join(" ".join(sentence(rng) for _ in range(4)) for _ in range(3)) + "\n", encoding="utf-8"
+    )
+    for i in range(engagements):
+        record = engagement(rng, activity_lines, today, ongoing=i == 0)
+        (data_dir / "engagements" / f"{i:05d}-{record['order']}.yml").write_text(to_yaml(record), encoding="utf-8")
+    return data_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic docs/data tree.")
+    parser.add_argument("out", type=Path, help="output root: <out>/docs/data is (re)created")
+    parser.add_argument("--engagements", type=int, default=10)
+    parser.add_argument("--course-groups", type=int, default=10)
+    parser.add_argument("--courses-per-group", type=int, default=3)
+    parser.add_argument("--activity-lines", type=int, default=8, help="Markdown bullets per engagement's activities")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    data_dir = generate(args.out, args.engagements, args.course_groups, args.courses_per_group,
+                        args.activity_lines, args.seed)
+    print(f"✓ {args.engagements} engagements, {args.course_groups} course groups -> {data_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
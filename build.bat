@@ -1,4 +1,6 @@
 @echo off
+rem Thin wrapper around build.py (site, PDF, DOCX, publish copy as a parallel
+rem dependency graph). Usage: build.bat [--pdf-backend pool] [--force]
 setlocal
 
 set PYTHONIOENCODING=utf-8
@@ -8,19 +10,8 @@ if not exist "%VENV_PY%" (
     exit /b 1
 )
 
-echo 1/4 Building site (pass 1, for PDF source)...
-"%VENV_PY%" -m mkdocs build --strict || exit /b 1
+"%VENV_PY%" "%~dp0build.py" %*
+set BUILD_EXIT=%ERRORLEVEL%
 
-echo 2/4 Generating PDF...
-"%VENV_PY%" generate_pdf.py || exit /b 1
-
-echo 3/4 Generating DOCX...
-"%VENV_PY%" generate_docx.py || exit /b 1
-
-echo 4/4 Building site (pass 2, includes PDF/DOCX as static assets)...
-"%VENV_PY%" -m mkdocs build --strict || exit /b 1
-
-echo.
-echo Build complete. Preview with: .venv\Scripts\python -m mkdocs serve
-echo Publish with:                .venv\Scripts\python -m mkdocs gh-deploy
 pause
+exit /b %BUILD_EXIT%
@@ -1,8 +1,8 @@
-# Full local build pipeline for the MkDocs-based CV site.
-# Order matters: PDF generation needs a first `mkdocs build` pass to read from,
-# then a second pass so the freshly generated PDF/DOCX are copied into site/ as static assets.
+# Full local build pipeline for the MkDocs-based CV site - thin wrapper around
+# build.py, which runs the stages (site, PDF, DOCX, publish copy) as a
+# dependency graph, independent stages in parallel.
 #
-# Usage: .\build.ps1
+# Usage: .\build.ps1 [--pdf-backend pool] [--force]
 
 $ErrorActionPreference = "Stop"
 $env:PYTHONIOENCODING = "utf-8"
@@ -12,22 +12,5 @@ if (-not (Test-Path $venvPython)) {
     exit 1
 }
 
-Write-Host "1/4 Building site (pass 1, for PDF source)..." -ForegroundColor Cyan
-& $venvPython -m mkdocs build --strict
-if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
-
-Write-Host "2/4 Generating PDF..." -ForegroundColor Cyan
-& $venvPython generate_pdf.py
-if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
-
-Write-Host "3/4 Generating DOCX..." -ForegroundColor Cyan
-& $venvPython generate_docx.py
-if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
-
-Write-Host "4/4 Building site (pass 2, includes PDF/DOCX as static assets)..." -ForegroundColor Cyan
-& $venvPython -m mkdocs build --strict
-if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
-
-Write-Host ""
-Write-Host "Build complete. Preview with: .venv\Scripts\python -m mkdocs serve" -ForegroundColor Green
-Write-Host "Publish with:                .venv\Scripts\python -m mkdocs gh-deploy" -ForegroundColor Green
+& $venvPython (Join-Path $PSScriptRoot "build.py") @args
+exit $LASTEXITCODE
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Full local build pipeline (site + PDF + DOCX), cross-platform.
+
+The pipeline is a small dependency graph instead of a fixed sequence:
+
+    data ──► site ──► pdf ──┐
+      │                     ├──► publish
+      └────► docx ──────────┘
+
+- data:    parses docs/data/** into its snapshot (cv_data.py), so the
+           mkdocs process and the DOCX writer each load it in one read
+- site:    `mkdocs build --strict` (incl. the print-ready cv-print.html)
+- pdf:     docs/assets/cv.pdf from site/cv-print.html (needs site)
+- docx:    docs/assets/cv.docx - reads docs/data/** only, so it runs
+           alongside the site build and the PDF
+- publish: copies cv.pdf/cv.docx into site/assets/ and re-runs the
+           site_optimize.py pass for them (needs all of the above)
+
+Every stage starts as soon as its dependencies are done, so a full build
+takes roughly as long as the longest chain (site -> pdf), not the sum of all
+stages. PDF and DOCX are skipped when their inputs are unchanged (shared
+build_cache.py manifest); `--force` regenerates them anyway. A per-stage
+timing table is printed at the end.
+
+build.ps1 / build.bat are thin wrappers around this script.
+
+With --profile (or CV_PROFILE=1) every stage, the mkdocs process and the DOCX
+writer are timed in detail; see profiling.py.
+
+Usage: python build.py [--pdf-backend cli|pool|fake] [--force] [--profile]
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import cv_data
+import generate_docx
+import generate_pdf
+import profiling
+from site_optimize import optimize_site
+from build_cache import BuildManifest
+from pdf_backends import BACKEND_HELP, BACKENDS
+
+ROOT = Path(__file__).resolve().parent
+SITE_ASSETS = ROOT / "site" / "assets"
+
+
+def stage_data(options):
+    count, path = cv_data.compile_snapshot(generate_docx.DATA_DIR)
+    print(f"✓ data snapshot: {count} files ({path.stat().st_size / 1024:.1f} KB)")
+    return True
+
+
+def stage_site(options):
+    """Runs mkdocs in its own process (it reloads config/hooks per build);
+    output is captured so it doesn't interleave with the other stages."""
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    proc = subprocess.run(
+        [sys.executable, "-m", "mkdocs", "build", "--strict"],
+        cwd=ROOT, env=env, capture_output=True, text=True, encoding="utf-8",
+    )
+    # stdout only carries main.py's own ✓ lines (MkDocs logs to stderr).
+    print(proc.stdout if proc.returncode == 0 else proc.stdout + proc.stderr, end="")
+    return proc.returncode == 0
+
+
+def stage_pdf(options):
+    return generate_pdf.generate_pdf_if_changed(
+        backend=options.pdf_backend, force=options.force, manifest=options.manifest
+    )
+
+
+def stage_docx(options):
+    return generate_docx.generate_docx_if_changed(force=options.force, manifest=options.manifest)
+
+
+def stage_publish(options):
+    SITE_ASSETS.mkdir(parents=True, exist_ok=True)
+    for artifact in (generate_pdf.OUTPUT_PDF, generate_docx.OUTPUT_FILE):
+        shutil.copy2(artifact, SITE_ASSETS / artifact.name)
+    # The site stage fingerprinted the cv.pdf/cv.docx that were in docs/assets/ then.
+    optimize_site(SITE_ASSETS.parent)
+    print(f"✓ cv.pdf and cv.docx copied to {SITE_ASSETS}")
+    return True
+
+
+# name -> (dependencies, function); declaration order is the report order.
+STAGES = {
+    "data": ((), stage_data),
+    "site": (("data",), stage_site),
+    "pdf": (("site",), stage_pdf),
+    "docx": (("data",), stage_docx),
+    "publish": (("site", "pdf", "docx"), stage_publish),
+}
+
+
+def timed(fn, options):
+    start = time.perf_counter()
+    try:
+        with profiling.span("stage", fn.__name__.removeprefix("stage_")):
+            ok, error = bool(fn(options)), None
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    return ok, error, start, time.perf_counter()
+
+
+def run_graph(stages, options):
+    """Run every stage as soon as all its dependencies succeeded. A failed
+    stage makes everything downstream of it 'skipped'. Returns
+    name -> {"status", "start", "end", "error"} (times relative to the start)."""
+    t0 = time.perf_counter()
+    results = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+        while len(results) < len(stages):
+            for name, (deps, fn) in stages.items():
+                if name in results or name in running.values():
+                    continue
+                if any(results.get(d, {}).get("status") in ("failed", "skipped") for d in deps):
+                    results[name] = {"status": "skipped", "start": None, "end": None, "error": None}
+                elif all(results.get(d, {}).get("status") == "ok" for d in deps):
+                    running[pool.submit(timed, fn, options)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                ok, error, start, end = future.result()
+                results[name] = {
+                    "status": "ok" if ok else "failed",
+                    "start": start - t0,
+                    "end": end - t0,
+                    "error": error,
+                }
+    return results
+
+
+def print_report(results, wall):
+    print()
+    print(f"{'stage':<10}{'start':>9}{'duration':>10}  status")
+    for name in STAGES:
+        r = results[name]
+        if r["start"] is None:
+            print(f"{name:<10}{'-':>9}{'-':>10}  {r['status']}")
+        else:
+            duration = r["end"] - r["start"]
+            status = r["status"] + (f" ({r['error']})" if r["error"] else "")
+            print(f"{name:<10}{r['start']:>8.2f}s{duration:>9.2f}s  {status}")
+    serial = sum(r["end"] - r["start"] for r in results.values() if r["start"] is not None)
+    print(f"{'total':<10}{'':>9}{wall:>9.2f}s  (stages summed: {serial:.2f}s)")
+
+
+def build(pdf_backend=None, force=False):
+    """Run the whole pipeline; True when every stage succeeded."""
+    options = argparse.Namespace(pdf_backend=pdf_backend, force=force, manifest=BuildManifest())
+    start = time.perf_counter()
+    results = run_graph(STAGES, options)
+    wall = time.perf_counter() - start
+    options.manifest.save()
+    print_report(results, wall)
+    print(f"  {options.manifest.summary()}")
+    return all(r["status"] == "ok" for r in results.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the site, cv.pdf and cv.docx (independent stages in parallel)")
+    parser.add_argument("--pdf-backend", choices=list(BACKENDS), help=BACKEND_HELP)
+    parser.add_argument("--force", action="store_true", help="regenerate PDF/DOCX even if their inputs are unchanged")
+    parser.add_argument("--profile", action="store_true",
+                        help="time macros, data loads, DOCX sections and PDF stages (also: CV_PROFILE=1)")
+    args = parser.parse_args()
+    if args.profile:
+        profiling.enable()
+    if profiling.enabled():
+        profiling.clear_traces(profiling.trace_dir())
+    try:
+        success = build(args.pdf_backend, args.force)
+    except KeyboardInterrupt:
+        print("\nCancelled by user")
+        sys.exit(1)
+    if profiling.finish("build"):
+        trace, count = profiling.merge_traces(profiling.trace_dir(), profiling.trace_dir() / profiling.MERGED_TRACE)
+        print(f"✓ merged trace (build + mkdocs, {count} events): {trace}")
+    if success:
+        print()
+        print("Build complete. Preview with: python -m mkdocs serve")
+        print("Publish with:                python -m mkdocs gh-deploy")
+    sys.exit(0 if success else 1)
@@ -0,0 +1,115 @@
+"""Content-hash build manifest: skip regenerating cv.pdf / cv.docx when
+nothing they are made from has changed.
+
+Each artifact gets a fingerprint over the *contents* of its inputs (not their
+mtimes, so a fresh checkout or a touched file doesn't count as a change):
+
+- PDF:  the rendered site/cv-print.html (which already inlines style.css and
+        print.css), those stylesheets themselves, every local image the page
+        references, and the PDF backend name.
+- DOCX: every docs/data/** file, the profile photo and contact icons, and
+        generate_docx.py / cv_model.py / image_variants.py themselves (a layout or photo
+        size change must regenerate too).
+
+The manifest (.build-manifest.json in the project root, or per CV output
+folder for batch_build.py) maps artifact name -> input fingerprint plus the
+digest of the output that was produced. An artifact is fresh when both still
+match - so a PDF replaced by e.g. a git checkout is regenerated as well. Hits
+and misses are counted for the build report.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+MANIFEST_FILE = ROOT / ".build-manifest.json"
+
+_IMG_SRC = re.compile(r"""<img\b[^>]*\bsrc=["']([^"'#?]+)""", re.IGNORECASE)
+
+
+def file_digest(path):
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).hexdigest()
+
+
+def fingerprint(paths, extra=()):
+    """Stable hash over the given files' contents (plus any extra strings).
+    Missing files are part of the fingerprint too, so adding one later counts
+    as a change."""
+    h = hashlib.blake2b(digest_size=16)
+    for path in sorted({Path(p) for p in paths}, key=lambda p: p.as_posix()):
+        h.update(path.name.encode())
+        h.update(file_digest(path).encode() if path.is_file() else b"<missing>")
+    for item in extra:
+        h.update(b"\0" + str(item).encode())
+    return h.hexdigest()
+
+
+def pdf_inputs(html_file, docs_dir=ROOT / "docs"):
+    """Files the PDF of `html_file` depends on: the page, the stylesheets it
+    inlines and the local images it references."""
+    html_file = Path(html_file)
+    inputs = [html_file]
+    inputs += sorted((Path(docs_dir) / "stylesheets").glob("*.css"))
+    for src in _IMG_SRC.findall(html_file.read_text(encoding="utf-8")):
+        if "://" not in src and not src.startswith("data:"):
+            inputs.append(html_file.parent / src)
+    return inputs
+
+
+def docx_inputs(data_dir, generator=ROOT / "generate_docx.py"):
+    """Files the DOCX built from `data_dir` depends on."""
+    import generate_docx  # late: avoids importing python-docx for PDF-only callers
+    from cv_data import get_store
+    from cv_model import load_cv
+
+    data_dir = Path(data_dir)
+    inputs = [p for p in data_dir.rglob("*") if p.is_file()]
+    photo = load_cv(get_store(data_dir)).photo
+    if photo:
+        inputs.append(data_dir.parent / photo)
+    inputs += generate_docx.CONTACT_ICON_IMAGES.values()
+    inputs += [Path(generator), ROOT / "docx_writer.py", ROOT / "cv_model.py", ROOT / "image_variants.py",
+               generate_docx.STYLESHEET]
+    return inputs
+
+
+class BuildManifest:
+    """artifact name -> {"inputs": fingerprint, "output": digest}, persisted as JSON."""
+
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = Path(path)
+        try:
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+        self.hits = []
+        self.misses = []
+
+    def is_fresh(self, name, fp, output, force=False):
+        """True (cache hit) when `output` exists and was built from inputs
+        with fingerprint `fp`; records the hit/miss either way. `force`
+        always counts as a miss."""
+        entry = self.entries.get(name)
+        fresh = (
+            not force
+            and isinstance(entry, dict)
+            and entry.get("inputs") == fp
+            and Path(output).is_file()
+            and entry.get("output") == file_digest(output)
+        )
+        (self.hits if fresh else self.misses).append(name)
+        return fresh
+
+    def record(self, name, fp, output):
+        self.entries[name] = {"inputs": fp, "output": file_digest(output)}
+
+    def forget(self, name):
+        self.entries.pop(name, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    def summary(self):
+        return f"cache: {len(self.hits)} hit(s), {len(self.misses)} miss(es)"
@@ -0,0 +1,33 @@
+"""Consultant names for data trees (one docs/data/-style directory each).
+
+batch_build.py names its output folders with them and roster_index.py its
+people. Kept apart from both so the roster index doesn't import the render
+stack (main.py, MkDocs, python-docx) just to name a folder.
+"""
+from pathlib import Path
+
+
+def consultant_name(data_dir):
+    """The first path component that isn't a generic 'data'/'docs'."""
+    for part in reversed(Path(data_dir).resolve().parts):
+        if part.lower() not in ("data", "docs"):
+            return part
+    return "cv"
+
+
+def unique_name(name, taken):
+    """`name`, or `name-2`, `name-3`, ... for the first one not in `taken`."""
+    candidate, n = name, 1
+    while candidate in taken:
+        n += 1
+        candidate = f"{name}-{n}"
+    return candidate
+
+
+def consultant_names(data_dirs):
+    """One distinct name per data dir, in order: a repeated folder name
+    gets -2, -3, ... (two people's trees both called 'cv')."""
+    names = []
+    for data_dir in data_dirs:
+        names.append(unique_name(consultant_name(data_dir), set(names)))
+    return names
@@ -0,0 +1,301 @@
+"""Shared parse cache for docs/data/** (YAML + Markdown content files).
+
+main.py is re-executed by MkDocs on every `mkdocs serve` rebuild (config and
+hooks are reloaded each time), so caches kept there would start empty on every
+rebuild. This module is imported normally and therefore lives in sys.modules
+for the lifetime of the process: each file is parsed once, and re-parsed only
+when its mtime/size changed *and* its content hash differs.
+
+YAML is parsed with libyaml's CSafeLoader when PyYAML was built with it
+(same results, several times faster), else with the pure-Python SafeLoader.
+
+Across processes the cache lives on as a snapshot: the whole tree's parsed
+files in one marshal file, .cache/data/<tree>.snapshot, written by the build's
+data stage (and after every build/batch CV that had to parse something):
+
+    python cv_data.py docs/data roster/*/docs/data
+
+get_store() seeds a new DataStore from it, so a build, batch worker or the
+roster indexer loads a CV with one read and a stat per file. Each entry keeps
+its file's stamp and content hash, i.e. it is validated exactly like an
+in-memory entry: a changed file is parsed again. Values marshal can't store
+(a YAML date, say) are left out and simply parsed.
+
+Files are stat'ed, read and parsed concurrently on a bounded thread pool
+(load_files(), load_engagements(); CV_DATA_WORKERS threads, default 8), so on
+a network share the per-file latency overlaps instead of adding up. Results
+come back in a fixed order regardless: the order asked for, and engagements
+sorted on `order` with ties broken by file name.
+
+Returned data is shared between callers - treat it as read-only.
+"""
+import functools
+import hashlib
+import marshal
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+from profiling import span
+
+ROOT = Path(__file__).resolve().parent
+SNAPSHOT_DIR = ROOT / ".cache" / "data"
+# Bump when what gets parsed (or how) changes: older snapshots are ignored.
+SNAPSHOT_VERSION = 1
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+LOAD_WORKERS = int(os.environ.get("CV_DATA_WORKERS", 8))
+
+_MISSING = object()
+
+
+def parse_yaml(text, loader=SafeLoader):
+    return yaml.load(text, Loader=loader)
+
+
+class _Dumper(yaml.SafeDumper):
+    pass
+
+
+def _str_representer(dumper, value):
+    style = "|" if "\n" in value else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", value, style=style)
+
+
+_Dumper.add_representer(str, _str_representer)
+
+
+def to_yaml(record):
+    """A data file's YAML text (scripts/import_legacy.py, synthetic data): keys
+    in the given order, multi-line strings as | blocks, nothing wrapped."""
+    return yaml.dump(record, Dumper=_Dumper, allow_unicode=True, sort_keys=False, width=10_000)
+
+
+def _snapshot_header():
+    return SNAPSHOT_VERSION, marshal.version, sys.version_info[:2]
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _forget_pools():
+    """A forked child (e.g. a batch_build.py worker) inherits the pools but
+    not their threads: start over with fresh ones."""
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pools)
+
+
+def _map(fn, items, workers):
+    """list(map(fn, items)), on a shared pool of `workers` threads when that
+    is more than one and there is more than one item."""
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ThreadPoolExecutor(workers, thread_name_prefix="cv-data")
+    return list(pool.map(fn, items))
+
+
+def _marshallable(value):
+    try:
+        marshal.dumps(value)
+    except ValueError:
+        return False
+    return True
+
+
+class DataStore:
+    """Per-data-directory cache: path -> (stat stamp, content hash, parsed value)."""
+
+    def __init__(self, data_dir, loader=SafeLoader, workers=LOAD_WORKERS):
+        self.data_dir = Path(data_dir)
+        self.parse_yaml = functools.partial(parse_yaml, loader=loader)
+        self.workers = workers
+        self.parsed = 0  # files parsed (not taken from the cache or snapshot)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    # File system access, one place (benchmarks/bench_loading.py slows it down).
+    def _stat(self, path):
+        return path.stat()
+
+    def _read(self, path):
+        return path.read_bytes()
+
+    def _list(self, directory, pattern):
+        return sorted(directory.glob(pattern))
+
+    def _load(self, path, parse):
+        try:
+            st = self._stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return _MISSING
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(path)
+        if entry and entry[0] == stamp:
+            return entry[2]
+
+        with span("yaml" if parse is self.parse_yaml else "text", path.relative_to(self.data_dir).as_posix()):
+            raw = self._read(path)
+            digest = hashlib.blake2b(raw, digest_size=16).digest()
+            if entry and entry[1] == digest:
+                # Touched (e.g. editor save without changes) - keep the parsed value.
+                value = entry[2]
+            else:
+                value = parse(raw.decode("utf-8"))
+        with self._lock:
+            self._entries[path] = (stamp, digest, value)
+            if entry is None or entry[1] != digest:
+                self.parsed += 1
+        return value
+
+    def _forget_removed(self, directory, present):
+        present = set(present)
+        with self._lock:
+            for path in [p for p in self._entries if p.parent == directory and p not in present]:
+                del self._entries[path]
+
+    def load_yaml(self, name, default=_MISSING):
+        """Parsed docs/data/<name>. Raises FileNotFoundError when the file is
+        missing, unless a `default` is given."""
+        path = self.data_dir / name
+        value = self._load(path, self.parse_yaml)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise FileNotFoundError(path)
+            return default
+        return value
+
+    def read_text(self, name, default=_MISSING):
+        """Raw text of docs/data/<name> (e.g. personal-text.md), cached the same way."""
+        path = self.data_dir / name
+        value = self._load(path, lambda text: text)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise FileNotFoundError(path)
+            return default
+        return value
+
+    def load_files(self, names, default=_MISSING):
+        """[load_yaml(name) or read_text(name) (.md files) for each name], loaded
+        concurrently. `default` stands in for missing files, as there."""
+        def load(name):
+            path = self.data_dir / name
+            value = self._load(path, (lambda text: text) if path.suffix == ".md" else self.parse_yaml)
+            if value is _MISSING and default is _MISSING:
+                raise FileNotFoundError(path)
+            return default if value is _MISSING else value
+
+        return _map(load, names, self.workers)
+
+    def load_engagements(self):
+        """All engagement records, newest first, sorted by their explicit `order`
+        field (equal orders: by file name). Files are loaded concurrently."""
+        eng_dir = self.data_dir / "engagements"
+        paths = self._list(eng_dir, "*.yml")
+        self._forget_removed(eng_dir, paths)
+        records = _map(lambda p: self._load(p, self.parse_yaml), paths, self.workers)
+        records = [r for r in records if r is not _MISSING]
+        return sorted(records, key=lambda r: r["order"], reverse=True)
+
+    @property
+    def snapshot_path(self):
+        tree = hashlib.blake2b(str(self.data_dir.resolve()).encode(), digest_size=8).hexdigest()
+        return SNAPSHOT_DIR / f"{tree}.snapshot"
+
+    def load_snapshot(self):
+        """Seed the cache from this tree's snapshot (entries already in memory
+        win). Returns the number of files it held; 0 when there is none or it
+        was written by another SNAPSHOT_VERSION/Python."""
+        try:
+            header, files = marshal.loads(self.snapshot_path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return 0
+        if header != _snapshot_header():
+            return 0
+        with self._lock:
+            for rel, (stamp, digest, value) in files.items():
+                self._entries.setdefault(self.data_dir / rel, (stamp, digest, value))
+        return len(files)
+
+    def save_snapshot(self, force=False):
+        """Write every cached file to the snapshot - only when something was
+        parsed since the last save (or `force`). Returns whether it wrote."""
+        if not (self.parsed or force):
+            return False
+        with self._lock:
+            entries = list(self._entries.items())
+            self.parsed = 0
+        files = {
+            path.relative_to(self.data_dir).as_posix(): entry
+            for path, entry in entries
+            if _marshallable(entry[2])
+        }
+        target = self.snapshot_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_bytes(marshal.dumps((_snapshot_header(), files)))
+        tmp.replace(target)  # atomic: concurrent builds of one tree don't clash
+        return True
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(data_dir):
+    """The process-wide DataStore for `data_dir` (one per consultant data
+    tree), seeded from its snapshot when there is one."""
+    key = Path(data_dir).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = DataStore(key)
+            store.load_snapshot()
+        return store
+
+
+def compile_snapshot(data_dir):
+    """Parse everything cv_model reads from `data_dir` and write its snapshot.
+    Returns (number of files, snapshot path)."""
+    from cv_model import load_cv  # late: cv_model builds on this module
+
+    store = get_store(data_dir)
+    load_cv(store)
+    store.save_snapshot(force=True)
+    return len(store._entries), store.snapshot_path
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile docs/data trees into parse snapshots (.cache/data/).")
+    parser.add_argument("data_dirs", nargs="*", type=Path, default=[ROOT / "docs" / "data"],
+                        help="docs/data-style directories (default: docs/data)")
+    args = parser.parse_args(argv)
+    missing = [d for d in args.data_dirs if not d.is_dir()]
+    if missing:
+        parser.error(f"not a directory: {', '.join(map(str, missing))}")
+    for data_dir in args.data_dirs:
+        count, path = compile_snapshot(data_dir)
+        print(f"✓ {data_dir}: {count} files -> {path.relative_to(ROOT)} ({path.stat().st_size / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
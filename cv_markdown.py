@@ -0,0 +1,50 @@
+"""The `markdown` Jinja filter used by templates/*.html (activities,
+achievements, ...).
+
+`markdown.markdown(text)` builds a new Markdown instance - and re-registers
+all its processors - on every call, which made it the hottest function in
+batch renders. Here each thread keeps one instance that is reset() and reused,
+and conversions are memoized in a bounded LRU keyed on the (stripped) source
+text, so identical blocks are converted once (profiling.py times the conversions).
+
+The memo pays off across rebuilds more than within one: after editing one
+engagement under `mkdocs serve`, only that engagement's text is converted
+again. It lives here rather than in main.py, which is re-executed (and would
+start with an empty memo) on each rebuild.
+"""
+import threading
+from functools import lru_cache
+
+import markdown as md
+
+from profiling import span
+
+CACHE_SIZE = 4096
+
+_local = threading.local()
+
+
+def _engine():
+    engine = getattr(_local, "engine", None)
+    if engine is None:
+        engine = _local.engine = md.Markdown()
+    return engine
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _convert(text):
+    with span("markdown", "convert", {"chars": len(text)}):
+        return _engine().reset().convert(text)
+
+
+def markdown_filter(text):
+    """Markdown -> HTML; same output as markdown.markdown(text.strip())."""
+    return _convert(text.strip()) if text else ""
+
+
+def cache_info():
+    return _convert.cache_info()
+
+
+def cache_clear():
+    _convert.cache_clear()
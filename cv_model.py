@@ -0,0 +1,275 @@
+"""Typed document model of one CV, built once per data tree and shared by
+every renderer: main.py's macros (site + print page / PDF), generate_docx.py,
+search_index.py and roster_index.py.
+
+load_cv(store) reads docs/data/** through the DataStore and derives
+everything the outputs need exactly once: the expertise tags, each
+engagement's parsed period (periods.py), record id and content digest, and
+the Markdown fields' block tree. Renderers never touch the raw YAML again.
+
+Markdown fields are RichText: a str (so templates, the `markdown` filter and
+digests keep working on the source text) that also carries `.blocks`, the
+text pre-parsed into Paragraph/BulletList blocks for renderers without a
+Markdown engine (the DOCX writer). Only what the content actually uses is
+recognised: paragraphs of hard-broken lines and "- " bullet lists; inline
+markup stays in the text.
+
+The model is cached per data tree and rebuilt only when the DataStore hands
+out different parsed objects, i.e. when a file changed - so `mkdocs serve`
+and batch builds derive each CV once per change.
+"""
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from fragment_cache import digest, record_id
+from periods import Period, engagement_period
+
+
+@dataclass(frozen=True, slots=True)
+class Paragraph:
+    lines: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class BulletList:
+    items: tuple
+
+
+class RichText(str):
+    """Markdown source text plus its block tree (`.blocks`)."""
+
+    def __new__(cls, text):
+        self = super().__new__(cls, text or "")
+        self.blocks = parse_blocks(self)
+        return self
+
+
+def parse_blocks(text):
+    """Paragraph/BulletList blocks of a Markdown text: blank lines separate
+    paragraphs, "- " lines form a list, trailing hard-break spaces go."""
+    blocks, lines, items = [], [], []
+
+    def flush():
+        if lines:
+            blocks.append(Paragraph(tuple(lines)))
+            lines.clear()
+        if items:
+            blocks.append(BulletList(tuple(items)))
+            items.clear()
+
+    for raw in str(text or "").splitlines():
+        line = raw.strip()
+        if not line:
+            flush()
+        elif line.startswith("- "):
+            if lines:
+                flush()
+            items.append(line[2:].strip())
+        elif items and raw[:1].isspace():
+            items[-1] += " " + line  # continuation of a list item
+        else:
+            if items:
+                flush()
+            lines.append(line)
+    flush()
+    return tuple(blocks)
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    label: str
+    value: str
+
+
+@dataclass(frozen=True, slots=True)
+class Contact:
+    type: str
+    label: str
+    url: str
+    title: str
+
+
+@dataclass(frozen=True, slots=True)
+class Qualification:
+    """A row of educations.yml or certifications.yml."""
+    period: str
+    name: str
+    institute: str
+    place: str
+    description: str
+
+
+@dataclass(frozen=True, slots=True)
+class CourseGroup:
+    period: str
+    items_text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Engagement:
+    id: str  # short record id: data-engagement="..." / search index
+    digest: str  # content digest of the source record (fragment cache key)
+    period: str
+    dates: Period | None  # None: period text periods.py can't read
+    order: int
+    organisation: str
+    role: str
+    activities: RichText
+    achievements: RichText
+    keywords: str
+    keyword_list: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CV:
+    data_dir: Path
+    headline: str
+    fields: tuple
+    photo: str  # as written in personal-data.yml, relative to data_dir.parent
+    contacts: tuple
+    personal_text: RichText
+    educations: tuple
+    certifications: tuple
+    courses: tuple
+    courses_short: tuple
+    engagements: tuple
+    tags: tuple
+
+    @property
+    def photo_path(self):
+        """The profile photo file, or None when there is none."""
+        path = self.data_dir.parent / self.photo if self.photo else None
+        return path if path is not None and path.is_file() else None
+
+    def field(self, label):
+        """Value of the personal-data field `label` ("Naam"), or ""."""
+        return next((f.value for f in self.fields if f.label.strip().lower() == label.lower()), "")
+
+    @property
+    def name(self):
+        """The name people know the consultant by: Roepnaam plus the surname
+        (from the first lowercase particle of Naam - "van Dijk" - else its last
+        word), or just Naam; "" without either."""
+        full, called = self.field("Naam").split(), self.field("Roepnaam").strip()
+        if not called:
+            return " ".join(full)
+        start = next((i for i, word in enumerate(full[1:], 1) if word[0].islower()), len(full) - 1)
+        return " ".join([called, *full[start:]]) if len(full) > 1 else called
+
+    def rows(self, source):
+        """Rows by data file stem, as docs/*.md macros name them."""
+        return {
+            "educations": self.educations,
+            "certifications": self.certifications,
+            "courses": self.courses,
+            "courses-short": self.courses_short,
+        }[source]
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _qualification(row):
+    return Qualification(*(_text(row.get(k)) for k in ("period", "name", "institute", "place", "description")))
+
+
+def _engagement(item):
+    keywords = _text(item.get("keywords"))
+    return Engagement(
+        id=record_id(item),
+        digest=digest(item),
+        period=_text(item.get("period")),
+        dates=engagement_period(item),
+        order=item.get("order") or 0,
+        organisation=_text(item.get("organisation")),
+        role=_text(item.get("role")),
+        activities=RichText(item.get("activities")),
+        achievements=RichText(item.get("achievements")),
+        keywords=keywords,
+        keyword_list=tuple(k.strip() for k in keywords.split(",") if k.strip()),
+    )
+
+
+def expertise_tags(engagements, certifications):
+    """Deduplicated (case-insensitive, first spelling wins) engagement
+    keywords followed by certification names."""
+    seen, tags = set(), []
+    for tag in [k for e in engagements for k in e.keyword_list] + [c.name.strip() for c in certifications]:
+        if tag and tag.lower() not in seen:
+            seen.add(tag.lower())
+            tags.append(tag)
+    return tuple(tags)
+
+
+# Shared (never mutated) stand-ins for missing files, so that their identity
+# is stable for load_cv's cache key too.
+_NO_MAPPING = {}
+_NO_ROWS = ()
+
+
+# input -> (data file, stand-in when missing or empty)
+INPUT_FILES = {
+    "personal": ("personal-data.yml", _NO_MAPPING),
+    "contacts": ("contact.yml", _NO_ROWS),
+    "personal_text": ("personal-text.md", ""),
+    "educations": ("educations.yml", _NO_ROWS),
+    "certifications": ("certifications.yml", _NO_ROWS),
+    "courses": ("courses.yml", _NO_ROWS),
+    "courses_short": ("courses-short.yml", _NO_ROWS),
+}
+
+
+def _inputs(store):
+    values = store.load_files([name for name, _ in INPUT_FILES.values()], default=None)
+    raw = {key: value or empty for (key, (_, empty)), value in zip(INPUT_FILES.items(), values)}
+    raw["engagements"] = tuple(store.load_engagements())
+    return raw
+
+
+def _build(data_dir, raw):
+    personal = raw["personal"]
+    engagements = tuple(_engagement(item) for item in raw["engagements"])
+    certifications = tuple(_qualification(row) for row in raw["certifications"])
+    return CV(
+        data_dir=Path(data_dir),
+        headline=_text(personal.get("headline")),
+        fields=tuple(Field(_text(f.get("label")), _text(f.get("value"))) for f in personal.get("fields") or []),
+        photo=_text(personal.get("photo")),
+        contacts=tuple(Contact(*(_text(c.get(k)) for k in ("type", "label", "url", "title"))) for c in raw["contacts"]),
+        personal_text=RichText(raw["personal_text"]),
+        educations=tuple(_qualification(row) for row in raw["educations"]),
+        certifications=certifications,
+        courses=tuple(CourseGroup(_text(g.get("period")), _text(g.get("items_text"))) for g in raw["courses"]),
+        courses_short=tuple(
+            CourseGroup(_text(g.get("period")), _text(g.get("items_text"))) for g in raw["courses_short"]
+        ),
+        engagements=engagements,
+        tags=expertise_tags(engagements, certifications),
+    )
+
+
+# data dir -> (identity key, the raw inputs it was taken from, CV)
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_cv(store):
+    """The CV model for `store`'s data tree, rebuilt only after a file changed.
+
+    The DataStore returns the very same parsed objects until a file's content
+    changes, so their identities are the cache key; the entry keeps those
+    objects alive, so an id can't be reused by a different object meanwhile."""
+    raw = _inputs(store)
+    engagements = raw.pop("engagements")  # a fresh list each call: key on its items
+    key = tuple(id(value) for value in raw.values()) + tuple(id(item) for item in engagements)
+    raw["engagements"] = engagements
+    with _models_lock:
+        cached = _models.get(store.data_dir)
+        if cached and cached[0] == key:
+            return cached[2]
+    cv = _build(store.data_dir, raw)
+    with _models_lock:
+        _models[store.data_dir] = (key, raw, cv)
+    return cv
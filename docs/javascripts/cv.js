@@ -17,5 +17,26 @@ document.addEventListener('DOMContentLoaded', function() {
   function toggleEngagement(summary) {
     const expanded = summary.getAttribute('aria-expanded') === 'true';
     summary.setAttribute('aria-expanded', !expanded);
+    if (!expanded) {
+      loadDetails(summary.parentElement.querySelector('.engagement-details[data-details]'));
+    }
+  }
+
+  // Lazy mode (extra.lazy_engagement_details): collapsed items ship without
+  // their details; fetch the prebuilt fragment on first expand.
+  function loadDetails(details) {
+    if (!details) return;
+    const url = details.getAttribute('data-details');
+    details.removeAttribute('data-details');
+    fetch(url)
+      .then(response => {
+        if (!response.ok) throw new Error(response.status);
+        return response.text();
+      })
+      .then(html => {
+        details.innerHTML = html;
+        details.dispatchEvent(new CustomEvent('cv-details-loaded', { bubbles: true }));
+      })
+      .catch(() => { details.setAttribute('data-details', url); });
   }
 });
@@ -0,0 +1,28 @@
+// Print readiness signal, inlined by overrides/print.html (not loaded on the
+// normal site). window.__cvPrintReady resolves once fonts, images and layout
+// have settled, with per-stage timings in ms; the "pool" PDF backend
+// (pdf_backends.py) prints as soon as it resolves instead of waiting out a
+// fixed time budget. Engagements are already expanded server-side.
+window.__cvPrintReady = (async function() {
+  const stages = {};
+  const start = performance.now();
+  let t = start;
+  const mark = (name) => {
+    const now = performance.now();
+    stages[name] = Math.round((now - t) * 10) / 10;
+    t = now;
+  };
+  if (document.readyState === 'loading') {
+    await new Promise(resolve => document.addEventListener('DOMContentLoaded', resolve, {once: true}));
+  }
+  mark('dom');
+  await document.fonts.ready;
+  mark('fonts');
+  await Promise.all(Array.from(document.images, img => img.decode().catch(() => null)));
+  mark('images');
+  await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+  mark('layout');
+  stages.total = Math.round((performance.now() - start) * 10) / 10;
+  document.documentElement.setAttribute('data-print-ready', 'true');
+  return stages;
+})();
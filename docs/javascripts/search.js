@@ -0,0 +1,121 @@
+// Instant search over the prebuilt index (search_index.py): the page only does
+// prefix lookups in the index's term table, nothing is indexed in the browser.
+// Matching engagements/sections are outlined and expanded, matching words marked.
+document.addEventListener('DOMContentLoaded', function() {
+  const input = document.querySelector('.cv-search');
+  if (!input || !window.fetch) return;
+  const status = document.querySelector('.cv-search-status');
+  let index = null;
+  let stopwords = new Set();
+  let words = [];
+  let opened = [];
+  let timer = null;
+
+  // Must match search_index.normalize(): accents stripped, lowercase, a-z0-9 runs
+  // of two or more, minus the stopwords (never indexed, so they'd match nothing).
+  function normalize(text) {
+    return text.normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase()
+      .split(/[^a-z0-9]+/).filter(term => term.length >= 2 && !stopwords.has(term));
+  }
+
+  // Documents containing a term that starts with every query word.
+  // Postings are stored as gaps from the previous doc index.
+  function lookup(words) {
+    let hits = null;
+    words.forEach(word => {
+      const docs = new Set();
+      Object.keys(index.terms).forEach(term => {
+        if (!term.startsWith(word)) return;
+        let doc = 0;
+        index.terms[term].forEach(gap => docs.add(doc += gap));
+      });
+      hits = hits ? new Set([...hits].filter(doc => docs.has(doc))) : docs;
+    });
+    return hits ? [...hits] : [];
+  }
+
+  function target(doc) {
+    if (doc[0] === 'e') return document.querySelector('.engagement-item[data-engagement="' + doc[1] + '"]');
+    const heading = document.getElementById(doc[1]);
+    return heading && heading.closest('section');
+  }
+
+  function clear() {
+    document.querySelectorAll('mark.search-mark').forEach(mark => {
+      const parent = mark.parentNode;
+      parent.replaceChild(document.createTextNode(mark.textContent), mark);
+      parent.normalize();
+    });
+    document.querySelectorAll('.search-hit').forEach(el => el.classList.remove('search-hit'));
+  }
+
+  function mark(root, words) {
+    const pattern = new RegExp('(' + words.map(w => w.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')).join('|') + ')', 'i');
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+    const nodes = [];
+    while (walker.nextNode()) nodes.push(walker.currentNode);
+    nodes.forEach(node => {
+      const folded = node.data.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+      if (folded.length !== node.data.length) return;  // offsets would not line up
+      let match;
+      let offset = 0;
+      while ((match = pattern.exec(folded.slice(offset)))) {
+        const word = node.splitText(match.index);
+        node = word.splitText(match[0].length);
+        offset += match.index + match[0].length;
+        const el = document.createElement('mark');
+        el.className = 'search-mark';
+        word.parentNode.replaceChild(el, word);
+        el.appendChild(word);
+      }
+    });
+  }
+
+  function search() {
+    clear();
+    words = normalize(input.value);
+    // Several documents can share one element (e.g. all certifications -> #achtergrond).
+    const hits = [...new Set(words.length ? lookup(words).map(doc => target(index.docs[doc])).filter(Boolean) : [])];
+    const items = new Set();
+    hits.forEach(el => {
+      el.classList.add('search-hit');
+      (el.matches('.engagement-item') ? [el] : el.querySelectorAll('.engagement-item')).forEach(item => items.add(item));
+    });
+    // Collapse what an earlier query opened, expand the new hits.
+    opened.filter(item => !items.has(item)).forEach(item => item.querySelector('.engagement-summary').click());
+    opened = opened.filter(item => items.has(item));
+    items.forEach(item => {
+      const summary = item.querySelector('.engagement-summary');
+      if (summary.getAttribute('aria-expanded') !== 'true') {
+        summary.click();
+        opened.push(item);
+      }
+    });
+    hits.forEach(el => mark(el, words));
+    status.textContent = words.length ? (hits.length ? hits.length + ' treffer(s)' : 'Geen treffers') : '';
+    if (hits.length) hits[0].scrollIntoView({ block: 'nearest', behavior: 'smooth' });
+  }
+
+  fetch(input.getAttribute('data-index'))
+    .then(response => {
+      if (!response.ok) throw new Error(response.status);
+      return response.json();
+    })
+    .then(data => {
+      index = data;
+      stopwords = new Set(data.stop || []);
+      input.hidden = false;
+      status.hidden = false;
+      input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(search, 150);
+      });
+    })
+    .catch(() => {});
+
+  // Lazy details (cv.js) arrive after the item was expanded and marked:
+  // mark them once they are in.
+  document.addEventListener('cv-details-loaded', event => {
+    if (words.length && event.target.closest('.search-hit')) mark(event.target, words);
+  });
+});
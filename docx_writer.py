@@ -0,0 +1,380 @@
+"""Fast DOCX writer: cv_model's CV straight to WordprocessingML text.
+
+generate_docx.py builds the document through python-docx: every paragraph,
+run, cell, border and shading is an lxml element created, mutated and
+finally serialised - hundreds of objects for the tag grid and the personal
+data table alone. This writer produces the same word/document.xml as a
+stream of string fragments instead, written straight into the zip:
+
+- everything that doesn't depend on the CV (styles.xml with the Normal font
+  and generate_docx.STYLES, theme, settings, the document root and the
+  section with its margins) comes from generate_docx.new_document(), saved
+  once per process (base_package());
+- paragraphs, runs and table cells are small precomputed XML fragments
+  (pStyle/rStyle/tcPr strings) filled in with escaped text;
+- hyperlinks and images get relationship ids, part names and picture ids
+  assigned in the order python-docx would, and images are measured by
+  python-docx's own image header parser, so sizes match to the EMU.
+
+The result is the document generate_docx(writer="python-docx") writes, with
+a byte-identical word/document.xml (benchmarks/bench_docx.py checks this).
+Only the order of the zip entries differs. Layout changes must be made in both
+writers.
+"""
+import io
+import re
+import zipfile
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from docx.image.image import Image
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.shared import Inches, Pt
+
+import profiling
+from generate_docx import (
+    BODY, CONTACT, CONTACT_ICON_IMAGES, CONTACT_ICONS, DETAIL_LABEL, ENTRY, FIELD_LABEL, LAYOUT_TABLE, LINK, MUTED,
+    SECTION_TITLE, SEPARATOR, SMALL, TAG, TAG_TABLE, block_lines, new_document, style_id,
+)
+from image_variants import docx_photo
+
+DOCUMENT = "word/document.xml"
+DOCUMENT_RELS = "word/_rels/document.xml.rels"
+CONTENT_TYPES = "[Content_Types].xml"
+
+# Page width between the margins (twips) - what python-docx divides over a new table's columns.
+BLOCK_WIDTH = int(Inches(7.5).twips)
+
+
+def _twips(length):
+    return int(length.twips)
+
+
+# Precomputed property fragments ------------------------------------------------
+# Formatting itself lives in the named styles new_document() puts in styles.xml;
+# the body only refers to them.
+
+def ppr(style):
+    return f'<w:pPr><w:pStyle w:val="{style_id(style)}"/></w:pPr>'
+
+
+def rpr(style):
+    return f'<w:rPr><w:rStyle w:val="{style_id(style)}"/></w:rPr>'
+
+
+PPR_SECTION_TITLE = ppr(SECTION_TITLE)
+PPR_DETAIL_LABEL = ppr(DETAIL_LABEL)
+PPR_BODY = ppr(BODY)
+PPR_ENTRY = ppr(ENTRY)
+PPR_CONTACT = ppr(CONTACT)
+PPR_TAG = ppr(TAG)
+PPR_RIGHT = '<w:pPr><w:jc w:val="right"/></w:pPr>'
+RPR_MUTED = rpr(MUTED)
+RPR_FIELD_LABEL = rpr(FIELD_LABEL)
+RPR_SMALL = rpr(SMALL)
+RPR_LINK = rpr(LINK)
+HORIZONTAL_LINE = f"<w:p>{ppr(SEPARATOR)}</w:p>"
+TBL_LOOK = (
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" '
+    'w:noVBand="1" w:val="04A0"/>'
+)
+
+
+# Fragments ------------------------------------------------------------------------
+
+def text(value):
+    """Run content of `value`: <w:t> pieces, with tabs and line breaks as
+    <w:tab/>/<w:br/> (python-docx's run text rules)."""
+    out = []
+    for piece in re.split(r"([\t\n\r])", value):
+        if piece == "\t":
+            out.append("<w:tab/>")
+        elif piece in ("\n", "\r"):
+            out.append("<w:br/>")
+        elif piece:
+            space = ' xml:space="preserve"' if piece != piece.strip() else ""
+            out.append(f"<w:t{space}>{escape(piece)}</w:t>")
+    return "".join(out)
+
+
+def run(value, props=""):
+    return f"<w:r>{props}{text(value)}</w:r>"
+
+
+def paragraph(runs="", ppr=""):
+    return f"<w:p>{ppr}{runs}</w:p>" if ppr or runs else "<w:p/>"
+
+
+def text_with_breaks(value):
+    """generate_docx.add_text_with_breaks() as runs."""
+    lines = value.split("\n")
+    runs = []
+    for i, line in enumerate(lines):
+        if line.strip():
+            runs.append(run(line.strip()))
+            if i < len(lines) - 1:
+                runs.append("<w:r><w:br/></w:r>")
+    return "".join(runs)
+
+
+def cell(content, width, shading=None):
+    shd = f'<w:shd w:val="clear" w:fill="{shading}"/>' if shading else ""
+    return f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/>{shd}</w:tcPr>{content}</w:tc>'
+
+
+def table(rows, columns, style, fixed):
+    grid = "".join(f'<w:gridCol w:w="{BLOCK_WIDTH // columns}"/>' for _ in range(columns))
+    layout = "fixed" if fixed else "autofit"
+    return (
+        f'<w:tbl><w:tblPr><w:tblStyle w:val="{style_id(style)}"/><w:tblW w:type="auto" w:w="0"/>'
+        f'<w:tblLayout w:type="{layout}"/>{TBL_LOOK}</w:tblPr>'
+        f"<w:tblGrid>{grid}</w:tblGrid>{''.join(f'<w:tr>{row}</w:tr>' for row in rows)}</w:tbl>"
+    )
+
+
+def section_title(title):
+    return paragraph(run(title.upper()), PPR_SECTION_TITLE)
+
+
+def detail_label(label):
+    return paragraph(run(label), PPR_DETAIL_LABEL)
+
+
+class Relations:
+    """Relationships of word/document.xml beyond the base document's:
+    ids, image part names and picture ids in python-docx's order."""
+
+    def __init__(self, taken_ids):
+        self.taken = set(taken_ids)
+        self.entries = []  # (rId, type, target, external)
+        self.images = {}  # sha1 -> (rId, partname, blob)
+        self.hyperlinks = {}
+        self.pictures = 0
+
+    def _next_id(self):
+        n = 1
+        while f"rId{n}" in self.taken:
+            n += 1
+        self.taken.add(f"rId{n}")
+        return f"rId{n}"
+
+    def hyperlink(self, url):
+        if url not in self.hyperlinks:
+            self.hyperlinks[url] = r_id = self._next_id()
+            self.entries.append((r_id, RT.HYPERLINK, url, True))
+        return self.hyperlinks[url]
+
+    def image(self, image):
+        if image.sha1 not in self.images:
+            partname = f"word/media/image{len(self.images) + 1}.{image.ext}"
+            r_id = self._next_id()
+            self.images[image.sha1] = (r_id, partname, image.blob)
+            self.entries.append((r_id, RT.IMAGE, partname.removeprefix("word/"), False))
+        return self.images[image.sha1][0]
+
+    def picture(self, path, width):
+        """<w:r> holding an inline picture `width` wide (height keeps the aspect ratio)."""
+        image = Image.from_file(str(path))
+        r_id = self.image(image)
+        cx, cy = image.scaled_dimensions(width, None)
+        self.pictures += 1
+        n = self.pictures
+        return (
+            '<w:r><w:drawing><wp:inline xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+            'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+            f'<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{n}" name="Picture {n}"/>'
+            '<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+            '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+            f'<pic:pic><pic:nvPicPr><pic:cNvPr id="0" name="{escape(image.filename, {chr(34): "&quot;"})}"/>'
+            f'<pic:cNvPicPr/></pic:nvPicPr><pic:blipFill><a:blip r:embed="{r_id}"/><a:stretch><a:fillRect/>'
+            '</a:stretch></pic:blipFill><pic:spPr><a:xfrm><a:off x="0" y="0"/>'
+            f'<a:ext cx="{cx}" cy="{cy}"/></a:xfrm><a:prstGeom prst="rect"/></pic:spPr></pic:pic>'
+            "</a:graphicData></a:graphic></wp:inline></w:drawing></w:r>"
+        )
+
+    def xml(self, base_xml):
+        added = "".join(
+            f'<Relationship Id="{r_id}" Type="{type_}" Target="{escape(target, {chr(34): "&quot;"})}"'
+            + (' TargetMode="External"/>' if external else "/>")
+            for r_id, type_, target, external in self.entries
+        )
+        return base_xml.replace("</Relationships>", f"{added}</Relationships>")
+
+
+# Document body ----------------------------------------------------------------------
+
+def personal_data(cv, rels):
+    """PERSOONLIJKE GEGEVENS: contacts + photo row, then the fields table."""
+    yield section_title("PERSOONLIJKE GEGEVENS")
+    photo_path = cv.photo_path
+    if cv.contacts or photo_path is not None:
+        contacts = []
+        for item in cv.contacts:
+            icon_image = CONTACT_ICON_IMAGES.get(item.type)
+            if icon_image and icon_image.is_file():
+                icon = rels.picture(icon_image, Pt(11)) + run(" ")
+            else:
+                icon = run(CONTACT_ICONS.get(item.type, "") + " ", RPR_SMALL)
+            link = f'<w:hyperlink r:id="{rels.hyperlink(item.url)}">{run(item.label, RPR_LINK)}</w:hyperlink>'
+            contacts.append(paragraph(icon + link, PPR_CONTACT))
+        photo = "<w:p/>" if photo_path is None else paragraph(
+            rels.picture(docx_photo(photo_path), Inches(1.2)), PPR_RIGHT
+        )
+        row = (cell("".join(contacts) or paragraph(ppr=PPR_CONTACT), _twips(Inches(5.0)))
+               + cell(photo, _twips(Inches(1.4))))
+        yield table([row], 2, LAYOUT_TABLE, fixed=True)
+        yield paragraph(ppr=PPR_ENTRY)
+    if cv.fields:
+        width = BLOCK_WIDTH // 2
+        rows = [
+            cell(paragraph(run(f.label, RPR_FIELD_LABEL)), width) + cell(paragraph(run(f.value)), width)
+            for f in cv.fields
+        ]
+        yield table(rows, 2, LAYOUT_TABLE, fixed=True)
+    yield HORIZONTAL_LINE
+
+
+def tag_grid(tags, columns=4):
+    width = BLOCK_WIDTH // columns
+    cells = [cell(paragraph(run(tag), PPR_TAG), width) for tag in tags]
+    rows = (len(tags) + columns - 1) // columns
+    cells += [cell("<w:p/>", width, "FFFFFF")] * (rows * columns - len(tags))
+    return table(["".join(cells[r * columns:(r + 1) * columns]) for r in range(rows)], columns, TAG_TABLE, fixed=False)
+
+
+def dated_rows(rows, with_place=False):
+    for row in rows:
+        runs = run(f"{row.period}  ", RPR_MUTED) + run(row.name)
+        if row.institute:
+            runs += run(f" — {row.institute}")
+        if with_place and row.place:
+            runs += run(f", {row.place}")
+        yield paragraph(runs, PPR_ENTRY)
+
+
+def course_rows(groups, optional_period=False):
+    for group in groups:
+        runs = "" if optional_period and not group.period else run(f"{group.period}  ", RPR_MUTED)
+        yield paragraph(runs + run(group.items_text), PPR_ENTRY)
+
+
+def engagement(eng):
+    runs = (run(f"{eng.period}  ", RPR_MUTED) if eng.period else "")
+    runs += (run(eng.organisation) if eng.organisation else "") + (run(f" — {eng.role}") if eng.role else "")
+    yield paragraph(runs, PPR_BODY)
+    for label, value in (
+        ("Werkzaamheden", eng.activities and block_lines(eng.activities.blocks)),
+        ("Belangrijkste prestaties", eng.achievements and block_lines(eng.achievements.blocks)),
+        ("Trefwoorden", eng.keywords),
+    ):
+        if value:
+            yield detail_label(label)
+            yield paragraph(text_with_breaks(value), PPR_BODY)
+    yield HORIZONTAL_LINE
+
+
+def body(cv, rels, phase):
+    """The document body as XML fragments, in generate_docx() order."""
+    phase("PERSOONLIJKE GEGEVENS")
+    yield from personal_data(cv, rels)
+
+    phase("KERNEXPERTISE")
+    if cv.tags:
+        yield section_title("KERNEXPERTISE")
+        yield tag_grid(cv.tags)
+        yield paragraph(ppr=PPR_ENTRY)
+        yield HORIZONTAL_LINE
+
+    phase("PERSOONLIJK")
+    for block in cv.personal_text.blocks:
+        yield paragraph(text_with_breaks(block_lines([block])), PPR_BODY)
+    yield HORIZONTAL_LINE
+
+    phase("ACHTERGROND")
+    yield section_title("ACHTERGROND")
+    if cv.educations:
+        yield detail_label("Opleidingen")
+        yield from dated_rows(cv.educations, with_place=True)
+    if cv.certifications:
+        yield detail_label("Belangrijkste certificeringen")
+        yield from dated_rows(cv.certifications)
+    yield HORIZONTAL_LINE
+
+    phase("CURSUSSEN")
+    yield section_title("CURSUSSEN")
+    yield from course_rows(cv.courses)
+    yield HORIZONTAL_LINE
+
+    phase("OVERIGE CURSUSSEN")
+    if cv.courses_short:
+        yield section_title("OVERIGE CURSUSSEN")
+        yield from course_rows(cv.courses_short, optional_period=True)
+        yield HORIZONTAL_LINE
+
+    phase("WERKERVARING")
+    yield section_title("WERKERVARING")
+    for eng in cv.engagements:
+        yield from engagement(eng)
+
+
+# Package --------------------------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def base_package():
+    """{entry name: bytes} of generate_docx.new_document() (page setup, fonts,
+    named styles), plus its document.xml split around the body content:
+    (entries, head, tail)."""
+    doc = new_document()
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    with zipfile.ZipFile(buffer) as package:
+        entries = {name: package.read(name) for name in package.namelist()}
+    document = entries.pop(DOCUMENT).decode("utf-8")
+    split = document.index("<w:body>") + len("<w:body>")
+    return entries, document[:split], document[split:]
+
+
+def content_types(base_xml, extensions):
+    """[Content_Types].xml with Defaults for the image `extensions` added,
+    sorted like python-docx sorts them."""
+    defaults = dict(re.findall(r'<Default Extension="([^"]+)" ContentType="([^"]+)"/>', base_xml))
+    for ext, content_type in extensions.items():
+        defaults.setdefault(ext, content_type)
+    head = base_xml[:base_xml.index("<Default")]
+    overrides = base_xml[base_xml.index("<Override"):]
+    return head + "".join(
+        f'<Default Extension="{ext}" ContentType="{defaults[ext]}"/>' for ext in sorted(defaults)
+    ) + overrides
+
+
+def write_docx(cv, output_file):
+    """Write the DOCX of `cv` to `output_file` (see the module docstring)."""
+    phase = profiling.phases("docx fast")
+    phase("setup")
+    entries, head, tail = base_package()
+    rels = Relations(re.findall(r'Id="(rId\d+)"', entries[DOCUMENT_RELS].decode("utf-8")))
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output_file.with_name(output_file.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as package:
+        with package.open(DOCUMENT, "w") as document:
+            document.write(head.encode("utf-8"))
+            chunk = []
+            for fragment in body(cv, rels, phase):
+                chunk.append(fragment)
+                if len(chunk) >= 64:
+                    document.write("".join(chunk).encode("utf-8"))
+                    chunk.clear()
+            document.write(("".join(chunk) + tail).encode("utf-8"))
+        phase("save")
+        extensions = {}
+        for _, partname, blob in rels.images.values():
+            ext = partname.rsplit(".", 1)[1]
+            extensions[ext] = Image.from_blob(blob).content_type
+            package.writestr(partname, blob)
+        package.writestr(DOCUMENT_RELS, rels.xml(entries[DOCUMENT_RELS].decode("utf-8")))
+        package.writestr(CONTENT_TYPES, content_types(entries[CONTENT_TYPES].decode("utf-8"), extensions))
+        for name, data in entries.items():
+            if name not in (DOCUMENT_RELS, CONTENT_TYPES):
+                package.writestr(name, data)
+    tmp.replace(output_file)
+    phase.end()
@@ -0,0 +1,75 @@
+"""Rendered-HTML cache for per-record template fragments (one engagement item).
+
+render_engagements() used to re-render the whole engagements loop - every
+Markdown conversion included - on each rebuild, even when one file changed.
+Fragments are now cached under (template digest, record digest, variant):
+an edited record or template gets a new key, everything else is reused and
+spliced back together by the caller. `variant` carries the position-dependent
+bits the caller derives itself (e.g. whether the item renders expanded).
+
+Keys are content digests, never file names or mtimes, so nothing has to be
+invalidated: a stale entry just stops being asked for and ages out of the
+bounded LRU (least recently used entries go first). The shared instances
+(FRAGMENTS, LAZY_DETAILS) are created here rather than in main.py, which each
+`mkdocs serve` rebuild re-executes, so one edited record costs one render.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+MAX_FRAGMENTS = 4096
+
+
+def digest(value):
+    """Content hash of a parsed record (dict/list/str/date/...)."""
+    raw = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def record_id(value):
+    """Short stable id of a record, e.g. for data-engagement="..." in the page
+    and the search index entries pointing at it."""
+    return digest(value)[:12]
+
+
+class FragmentCache:
+    def __init__(self, maxsize=MAX_FRAGMENTS):
+        self.maxsize = maxsize
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self.take_stats()
+
+    def get(self, key, render):
+        """Cached fragment for `key`, rendering (and storing) it via render() on a miss."""
+        with self._lock:
+            html = self._fragments.get(key)
+            if html is not None:
+                self._fragments.move_to_end(key)
+                self._stats["reused"] += 1
+                return html
+        html = render()
+        with self._lock:
+            self._fragments[key] = html
+            if len(self._fragments) > self.maxsize:
+                self._fragments.popitem(last=False)
+            self._stats["rendered"] += 1
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+
+    def take_stats(self):
+        """Reused/rendered counts since the last call, then reset them."""
+        with self._lock:
+            stats, self._stats = getattr(self, "_stats", None), {"reused": 0, "rendered": 0}
+        return stats
+
+
+FRAGMENTS = FragmentCache()
+
+# Lazy engagement details rendered during a MkDocs build, {site path: html},
+# written out by main.py's on_post_build. Kept here rather than in main.py:
+# mkdocs-macros-plugin and MkDocs' hooks each load their own copy of main.py.
+LAZY_DETAILS = {}
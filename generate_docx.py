@@ -2,31 +2,105 @@
 """
 Generate DOCX from CV data with similar layout to PDF.
 
-Reads directly from docs/data/**/*.yml (plain content, no HTML/CSS
-round-tripping) - the same source of truth the MkDocs site itself is
-built from via main.py's macros.
+Renders cv_model's CV of docs/data/** (plain content, no HTML/CSS
+round-tripping) - the same document model the MkDocs site itself is
+rendered from via main.py's macros, so tags, periods and the Markdown
+fields are derived once, identically for both.
+
+Formatting lives in named styles (STYLES: paragraph, character and table
+styles with the colours of docs/stylesheets/style.css's :root palette),
+created once in styles.xml by new_document(); paragraphs, runs and tables
+only refer to them by name instead of repeating font, colour, spacing and
+borders inline.
+
+Two writers produce the same document: python-docx (the default, below) and
+docx_writer.py, which streams the same WordprocessingML as precomputed text
+fragments - several times faster on CVs with hundreds of engagements.
+Pick one with `--writer` or CV_DOCX_WRITER=fast.
+
+Skipped when none of its inputs changed since the last run (build_cache.py's
+content-hash manifest); `--force` regenerates regardless.
 """
 
 from pathlib import Path
-import yaml
+import argparse
+import os
+import re
+import tempfile
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.enum.style import WD_STYLE_TYPE
+
+import profiling
+from cv_data import get_store
+from cv_model import BulletList, load_cv
+from image_variants import docx_photo
 
 # Paths
 ROOT = Path(__file__).resolve().parent
 DATA_DIR = ROOT / "docs" / "data"
-ENGAGEMENTS_DIR = DATA_DIR / "engagements"
 OUTPUT_FILE = ROOT / "docs" / "assets" / "cv.docx"
+STYLESHEET = ROOT / "docs" / "stylesheets" / "style.css"
+
+
+def css_palette(stylesheet=STYLESHEET):
+    """The colour custom properties of the stylesheet's :root rule, as Word
+    hex colours: {"text-muted": "636E72", ...}."""
+    root = re.search(r":root\s*\{([^}]*)\}", Path(stylesheet).read_text(encoding="utf-8"))
+    palette = {}
+    for name, value in re.findall(r"--([\w-]+)\s*:\s*#([0-9a-fA-F]{6}|[0-9a-fA-F]{3})\b", root.group(1) if root else ""):
+        palette[name] = (value if len(value) == 6 else "".join(c * 2 for c in value)).upper()
+    return palette
+
+
+# Colors (docs/stylesheets/style.css)
+PALETTE = css_palette()
+TEXT_PRIMARY = RGBColor.from_string(PALETTE["text-primary"])  # var(--text-primary)
+GREY_TEXT = RGBColor.from_string(PALETTE["text-muted"])  # var(--text-muted)
+GREY_LIGHT = RGBColor.from_string(PALETTE["sep-block"])  # var(--sep-block)
+TAG_BG = PALETTE["sep-course"]  # var(--sep-course), same background as the site's expertise-tag chips
+LINK_COLOR = RGBColor.from_string("1155CC")
+
+# Named styles, created in styles.xml by add_styles(): name -> (type, properties).
+# Paragraph/character properties: bold, color, size (pt), space_before/space_after (pt),
+# border (bottom border colour); table properties: shading (cell fill).
+SECTION_TITLE = "CV Section Title"
+DETAIL_LABEL = "CV Detail Label"
+BODY = "CV Body"
+ENTRY = "CV Entry"
+CONTACT = "CV Contact"
+TAG = "CV Tag"
+SEPARATOR = "CV Separator"
+MUTED = "CV Muted"
+FIELD_LABEL = "CV Field Label"
+SMALL = "CV Small"
+LINK = "CV Link"
+LAYOUT_TABLE = "CV Layout Table"
+TAG_TABLE = "CV Tag Table"
+
+STYLES = {
+    SECTION_TITLE: (WD_STYLE_TYPE.PARAGRAPH, {"bold": True, "color": TEXT_PRIMARY}),
+    DETAIL_LABEL: (WD_STYLE_TYPE.PARAGRAPH, {"bold": True, "color": GREY_TEXT, "size": 10, "space_after": 3}),
+    BODY: (WD_STYLE_TYPE.PARAGRAPH, {"space_after": 6}),
+    ENTRY: (WD_STYLE_TYPE.PARAGRAPH, {"space_after": 3}),
+    CONTACT: (WD_STYLE_TYPE.PARAGRAPH, {"space_after": 2}),
+    TAG: (WD_STYLE_TYPE.PARAGRAPH, {"size": 9.5, "space_before": 2, "space_after": 2}),
+    SEPARATOR: (WD_STYLE_TYPE.PARAGRAPH, {"border": GREY_LIGHT}),
+    MUTED: (WD_STYLE_TYPE.CHARACTER, {"color": GREY_TEXT}),
+    FIELD_LABEL: (WD_STYLE_TYPE.CHARACTER, {"bold": True, "color": GREY_TEXT}),
+    SMALL: (WD_STYLE_TYPE.CHARACTER, {"size": 9.5}),
+    LINK: (WD_STYLE_TYPE.CHARACTER, {"color": LINK_COLOR, "size": 9.5}),
+    LAYOUT_TABLE: (WD_STYLE_TYPE.TABLE, {}),
+    TAG_TABLE: (WD_STYLE_TYPE.TABLE, {"shading": TAG_BG}),
+}
 
-# Colors (matching docs/stylesheets/style.css)
-TEXT_PRIMARY = RGBColor(0x11, 0x11, 0x11)  # #111 - var(--text-primary)
-GREY_TEXT = RGBColor(99, 110, 114)   # #636e72 - var(--text-muted)
-GREY_LIGHT = RGBColor(178, 190, 195)  # #b2bec3 - var(--sep-block)
-TAG_BG = "DFE6E9"  # #dfe6e9 - var(--sep-course), same background as the site's expertise-tag chips
+# "python-docx" or "fast" (docx_writer.py); both write the same document.
+WRITERS = ("python-docx", "fast")
+DEFAULT_WRITER = os.environ.get("CV_DOCX_WRITER", "python-docx")
 
 CONTACT_ICONS = {
     "linkedin": "🔗",
@@ -42,84 +116,109 @@ CONTACT_ICON_IMAGES = {
     "github": ROOT / "docs" / "assets" / "img" / "icons" / "github.png",
 }
 
-def load_yaml(name):
-    path = DATA_DIR / name
-    if not path.is_file():
-        return None
-    return yaml.safe_load(path.read_text(encoding='utf-8'))
-
-def load_engagements():
-    """All engagement records, newest first - same sort key as main.py's macro."""
-    if not ENGAGEMENTS_DIR.is_dir():
-        return []
-    files = sorted(
-        ENGAGEMENTS_DIR.glob("*.yml"),
-        key=lambda p: yaml.safe_load(p.read_text(encoding='utf-8'))["order"],
-        reverse=True,
-    )
-    return [yaml.safe_load(f.read_text(encoding='utf-8')) for f in files]
-
-def collect_expertise_tags(engagements):
-    """Deduplicated tag list from engagement keywords + certification names -
-    same algorithm as main.py's render_expertise_tags(), so the DOCX shows the
-    same Kernexpertise content as the site/PDF."""
-    seen = set()
-    tags = []
-
-    def add(raw):
-        tag = (raw or "").strip()
-        key = tag.lower()
-        if tag and key not in seen:
-            seen.add(key)
-            tags.append(tag)
-
-    for engagement in engagements:
-        for kw in (engagement.get("keywords") or "").split(","):
-            add(kw)
-    for cert in load_yaml("certifications.yml") or []:
-        add(cert.get("name", ""))
-    return tags
-
-def md_bullets_to_docx_text(text):
-    """Normalize migrated content ('- ' Markdown bullets, trailing hard-break
-    spaces) into the plain '• '-bulleted, line-broken text add_text_with_breaks()
-    expects - the same bullet character the site/PDF renders via the |markdown
-    Jinja filter turning '- ' into <li>, here turned into '• ' directly."""
-    if not text:
-        return ""
+def block_lines(blocks):
+    """Lines of a cv_model block tree as add_text_with_breaks() expects them:
+    paragraph lines as-is, list items as '• ' bullets - the same bullet
+    character the site/PDF renders via the |markdown Jinja filter."""
     lines = []
-    for raw_line in text.splitlines():
-        line = raw_line.rstrip()
-        if line.startswith("- "):
-            line = "• " + line[2:]
-        lines.append(line)
+    for block in blocks:
+        if isinstance(block, BulletList):
+            lines += [f"• {item}" for item in block.items]
+        else:
+            lines += block.lines
     return "\n".join(lines)
 
+def style_id(name):
+    """styleId python-docx gives a custom style called `name`."""
+    return name.replace(" ", "")
+
+def _add_table_properties(style, shading=None):
+    """No borders at all (the site's blocks have none); `shading` fills every cell."""
+    tblPr = OxmlElement('w:tblPr')
+    borders = OxmlElement('w:tblBorders')
+    for edge in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
+        border = OxmlElement(f'w:{edge}')
+        border.set(qn('w:val'), 'none')
+        borders.append(border)
+    tblPr.append(borders)
+    style.element.append(tblPr)
+    if shading:
+        tcPr = OxmlElement('w:tcPr')
+        shd = OxmlElement('w:shd')
+        shd.set(qn('w:val'), 'clear')
+        shd.set(qn('w:fill'), shading)
+        tcPr.append(shd)
+        style.element.append(tcPr)
+
+def add_styles(doc):
+    """Create STYLES in the document's styles.xml."""
+    for name, (style_type, props) in STYLES.items():
+        style = doc.styles.add_style(name, style_type)
+        if style_type == WD_STYLE_TYPE.TABLE:
+            style.base_style = doc.styles['Normal Table']
+            _add_table_properties(style, props.get("shading"))
+            continue
+        style.base_style = doc.styles['Normal' if style_type == WD_STYLE_TYPE.PARAGRAPH else 'Default Paragraph Font']
+        if props.get("bold"):
+            style.font.bold = True
+        if props.get("color"):
+            style.font.color.rgb = props["color"]
+        if props.get("size"):
+            style.font.size = Pt(props["size"])
+        if props.get("space_before"):
+            style.paragraph_format.space_before = Pt(props["space_before"])
+        if props.get("space_after"):
+            style.paragraph_format.space_after = Pt(props["space_after"])
+        if props.get("border"):
+            pBdr = OxmlElement('w:pBdr')
+            bottom = OxmlElement('w:bottom')
+            bottom.set(qn('w:val'), 'single')
+            bottom.set(qn('w:sz'), '6')
+            bottom.set(qn('w:space'), '1')
+            bottom.set(qn('w:color'), str(props["border"]))
+            pBdr.append(bottom)
+            style.element.get_or_add_pPr().insert_element_before(pBdr, 'w:spacing', 'w:jc')
+
+def new_document():
+    """Empty document with the CV's page setup, default font and STYLES."""
+    doc = Document()
+
+    # Set default font
+    style = doc.styles['Normal']
+    font = style.font
+    font.name = 'Segoe UI'
+    font.size = Pt(11)
+
+    # Set margins
+    sections = doc.sections
+    for section in sections:
+        section.top_margin = Inches(0.5)
+        section.bottom_margin = Inches(0.5)
+        section.left_margin = Inches(0.5)
+        section.right_margin = Inches(0.5)
+
+    add_styles(doc)
+    return doc
+
+def set_style(paragraph, style):
+    """Give `paragraph` one of STYLES by id. (`paragraph.style = name` makes
+    python-docx scan every style in styles.xml on each call.)"""
+    paragraph._p.get_or_add_pPr().style = style_id(style)
+    return paragraph
+
+def add_paragraph(container, style, text=None):
+    """New paragraph with one of STYLES in a document or table cell."""
+    return set_style(container.add_paragraph(text), style)
+
+def add_run(paragraph, text, style):
+    """New run with one of STYLES' character styles."""
+    run = paragraph.add_run(text)
+    run._r.get_or_add_rPr().style = style_id(style)
+    return run
+
 def add_horizontal_line(doc):
     """Add a horizontal line separator"""
-    p = doc.add_paragraph()
-    pPr = p._element.get_or_add_pPr()
-    pBdr = OxmlElement('w:pBdr')
-    bottom = OxmlElement('w:bottom')
-    bottom.set(qn('w:val'), 'single')
-    bottom.set(qn('w:sz'), '6')
-    bottom.set(qn('w:space'), '1')
-    bottom.set(qn('w:color'), 'B2BEC3')
-    pBdr.append(bottom)
-    pPr.append(pBdr)
-    return p
-
-def set_cell_border(cell, **kwargs):
-    """Set cell borders"""
-    tc = cell._tc
-    tcPr = tc.get_or_add_tcPr()
-    tcBorders = OxmlElement('w:tcBorders')
-    for edge in ('top', 'left', 'bottom', 'right'):
-        if edge in kwargs:
-            border = OxmlElement(f'w:{edge}')
-            border.set(qn('w:val'), 'none')
-            tcBorders.append(border)
-    tcPr.append(tcBorders)
+    return add_paragraph(doc, SEPARATOR)
 
 def set_cell_shading(cell, hex_color):
     """Fill a table cell with a solid background color"""
@@ -131,14 +230,9 @@ def set_cell_shading(cell, hex_color):
 
 def add_section_title(doc, title):
     """Add section title (dark, uppercase, bold)"""
-    p = doc.add_paragraph()
-    p.add_run(title.upper()).font.color.rgb = TEXT_PRIMARY
-    p.runs[0].font.bold = True
-    p.runs[0].font.size = Pt(11)
-    p.space_after = Pt(6)
-    return p
-
-def add_hyperlink(paragraph, url, text, color="1155CC", size_pt=None):
+    return add_paragraph(doc, SECTION_TITLE, title.upper())
+
+def add_hyperlink(paragraph, url, text, style=LINK):
     """Add a clickable hyperlink run to a paragraph (python-docx has no
     built-in API for this - standard low-level OOXML recipe)."""
     part = paragraph.part
@@ -149,14 +243,9 @@ def add_hyperlink(paragraph, url, text, color="1155CC", size_pt=None):
 
     run = OxmlElement('w:r')
     rPr = OxmlElement('w:rPr')
-    if color:
-        c = OxmlElement('w:color')
-        c.set(qn('w:val'), color)
-        rPr.append(c)
-    if size_pt:
-        sz = OxmlElement('w:sz')
-        sz.set(qn('w:val'), str(int(size_pt * 2)))  # half-points
-        rPr.append(sz)
+    rStyle = OxmlElement('w:rStyle')
+    rStyle.set(qn('w:val'), style_id(style))
+    rPr.append(rStyle)
     run.append(rPr)
     t = OxmlElement('w:t')
     t.text = text
@@ -171,18 +260,13 @@ def add_tag_grid(doc, tags, columns=4):
     if not tags:
         return
     rows = (len(tags) + columns - 1) // columns
-    table = doc.add_table(rows=rows, cols=columns)
+    table = doc.add_table(rows=rows, cols=columns, style=TAG_TABLE)
     table.autofit = True
     for idx, tag in enumerate(tags):
         r, c = divmod(idx, columns)
-        cell = table.rows[r].cells[c]
-        set_cell_border(cell, top=True, left=True, bottom=True, right=True)
-        set_cell_shading(cell, TAG_BG)
-        p = cell.paragraphs[0]
-        p.paragraph_format.space_after = Pt(2)
-        p.paragraph_format.space_before = Pt(2)
-        run = p.add_run(tag)
-        run.font.size = Pt(9.5)
+        p = table.rows[r].cells[c].paragraphs[0]
+        set_style(p, TAG)
+        p.add_run(tag)
     # Fill any leftover cells in the last row with empty shaded space (keeps a tidy grid)
     for idx in range(len(tags), rows * columns):
         r, c = divmod(idx, columns)
@@ -190,13 +274,7 @@ def add_tag_grid(doc, tags, columns=4):
 
 def add_detail_label(doc, text):
     """Small grey/bold sub-label, e.g. 'Werkzaamheden' or 'Opleidingen'."""
-    p = doc.add_paragraph()
-    run = p.add_run(text)
-    run.font.color.rgb = GREY_TEXT
-    run.font.bold = True
-    run.font.size = Pt(10)
-    p.paragraph_format.space_after = Pt(3)
-    return p
+    return add_paragraph(doc, DETAIL_LABEL, text)
 
 def add_text_with_breaks(paragraph, text):
     """Add text with line breaks preserved"""
@@ -207,37 +285,39 @@ def add_text_with_breaks(paragraph, text):
             if i < len(lines) - 1:
                 paragraph.add_run('\n')
 
-def generate_docx():
-    """Generate Word document"""
+def generate_docx(data_dir=DATA_DIR, output_file=OUTPUT_FILE, cv=None, writer=None):
+    """Generate Word document from `data_dir` (default: this repo's docs/data/),
+    or from an already loaded cv_model CV of it, with `writer` (one of
+    WRITERS, default CV_DOCX_WRITER or python-docx)."""
+    writer = writer or DEFAULT_WRITER
+    if writer not in WRITERS:
+        raise ValueError(f"unknown DOCX writer {writer!r} (choose from {', '.join(WRITERS)})")
+    data_dir = Path(data_dir)
+    cv = cv or load_cv(get_store(data_dir))
+    output_file = Path(output_file)
     # Check whether the output file is locked by another process (e.g. Word)
-    if OUTPUT_FILE.exists():
+    if output_file.exists():
         try:
-            with OUTPUT_FILE.open('r+b'):
+            with output_file.open('r+b'):
                 pass
         except PermissionError:
-            print(f"Error: {OUTPUT_FILE} is locked by another application (e.g. Word).")
+            print(f"Error: {output_file} is locked by another application (e.g. Word).")
             print("Sluit het Word-document en probeer opnieuw.")
             return False
 
-    doc = Document()
-
-    # Set default font
-    style = doc.styles['Normal']
-    font = style.font
-    font.name = 'Segoe UI'
-    font.size = Pt(11)
+    if writer == "fast":
+        from docx_writer import write_docx
+        write_docx(cv, output_file)
+        print(f"✓ Word document generated: {output_file}")
+        return True
 
-    # Set margins
-    sections = doc.sections
-    for section in sections:
-        section.top_margin = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-        section.left_margin = Inches(0.5)
-        section.right_margin = Inches(0.5)
+    phase = profiling.phases("docx")
+    phase("setup")
+    doc = new_document()
 
     # Personal Data
-    personal = load_yaml("personal-data.yml") or {}
-    fields = personal.get("fields", [])
+    phase("PERSOONLIJKE GEGEVENS")
+    fields = cv.fields
 
     add_section_title(doc, 'PERSOONLIJKE GEGEVENS')
 
@@ -245,192 +325,193 @@ def generate_docx():
     # sidebar has no direct DOCX equivalent, but a recruiter reading a
     # downloaded Word file still needs a way to reach out. Icon + short label
     # only (never the raw URL), each a real clickable hyperlink.
-    contacts = load_yaml("contact.yml") or []
-    photo_path = DATA_DIR.parent / personal.get("photo", "")
-    has_photo = bool(personal.get("photo")) and photo_path.is_file()
+    contacts = cv.contacts
+    photo_path = cv.photo_path
+    has_photo = photo_path is not None
 
     if contacts or has_photo:
-        header = doc.add_table(rows=1, cols=2)
+        header = doc.add_table(rows=1, cols=2, style=LAYOUT_TABLE)
         header.autofit = False
         header.allow_autofit = False
         contact_cell, photo_cell = header.rows[0].cells
-        set_cell_border(contact_cell, top=True, left=True, bottom=True, right=True)
-        set_cell_border(photo_cell, top=True, left=True, bottom=True, right=True)
         contact_cell.width = Inches(5.0)
         photo_cell.width = Inches(1.4)
 
-        contact_cell.paragraphs[0].paragraph_format.space_after = Pt(2)
+        set_style(contact_cell.paragraphs[0], CONTACT)
         for i, item in enumerate(contacts):
-            p = contact_cell.paragraphs[0] if i == 0 else contact_cell.add_paragraph()
-            p.paragraph_format.space_after = Pt(2)
-            icon_type = item.get("type")
+            p = contact_cell.paragraphs[0] if i == 0 else add_paragraph(contact_cell, CONTACT)
+            icon_type = item.type
             icon_image = CONTACT_ICON_IMAGES.get(icon_type)
             if icon_image and icon_image.is_file():
                 p.add_run().add_picture(str(icon_image), width=Pt(11))
                 p.add_run(" ")
             else:
-                icon = p.add_run(CONTACT_ICONS.get(icon_type, "") + " ")
-                icon.font.size = Pt(9.5)
-            add_hyperlink(p, item.get("url", ""), item.get("label", ""), size_pt=9.5)
+                add_run(p, CONTACT_ICONS.get(icon_type, "") + " ", SMALL)
+            add_hyperlink(p, item.url, item.label)
 
         if has_photo:
             photo_p = photo_cell.paragraphs[0]
             photo_p.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-            photo_p.add_run().add_picture(str(photo_path), width=Inches(1.2))
+            # Small pre-sized JPEG instead of the full-resolution original.
+            photo_p.add_run().add_picture(str(docx_photo(photo_path)), width=Inches(1.2))
 
-        doc.add_paragraph().paragraph_format.space_after = Pt(3)
+        add_paragraph(doc, ENTRY)
 
     if fields:
-        table = doc.add_table(rows=len(fields), cols=2)
+        table = doc.add_table(rows=len(fields), cols=2, style=LAYOUT_TABLE)
         table.autofit = False
         table.allow_autofit = False
 
         for idx, f in enumerate(fields):
-            row = table.rows[idx]
-            label_cell = row.cells[0]
-            value_cell = row.cells[1]
-
-            set_cell_border(label_cell, top=True, left=True, bottom=True, right=True)
-            set_cell_border(value_cell, top=True, left=True, bottom=True, right=True)
-
-            p = label_cell.paragraphs[0]
-            run = p.add_run(f.get("label", ""))
-            run.font.color.rgb = GREY_TEXT
-            run.font.bold = True
-            run.font.size = Pt(11)
-
-            value_cell.text = f.get("value", "")
-            value_cell.paragraphs[0].runs[0].font.size = Pt(11)
+            label_cell, value_cell = table.rows[idx].cells
+            add_run(label_cell.paragraphs[0], f.label, FIELD_LABEL)
+            value_cell.text = f.value
 
     add_horizontal_line(doc)
 
     # Kernexpertise (deduplicated tags - same source/order as the site's Kernexpertise block)
-    engagements = load_engagements()
-    tags = collect_expertise_tags(engagements)
+    engagements = cv.engagements
+    tags = cv.tags
 
+    phase("KERNEXPERTISE")
     if tags:
         add_section_title(doc, 'KERNEXPERTISE')
         add_tag_grid(doc, tags)
-        doc.add_paragraph().paragraph_format.space_after = Pt(3)
+        add_paragraph(doc, ENTRY)
         add_horizontal_line(doc)
 
     # Personal Text
-    personal_text_file = DATA_DIR / "personal-text.md"
-    text = personal_text_file.read_text(encoding='utf-8') if personal_text_file.is_file() else ""
-    if text:
-        paragraphs = text.split('\n\n')
-        for para in paragraphs:
-            if para.strip():
-                p = doc.add_paragraph()
-                add_text_with_breaks(p, para.strip())
-                p.paragraph_format.space_after = Pt(6)
+    phase("PERSOONLIJK")
+    for block in cv.personal_text.blocks:
+        add_text_with_breaks(add_paragraph(doc, BODY), block_lines([block]))
 
     add_horizontal_line(doc)
 
     # Achtergrond (Opleidingen + Belangrijkste certificeringen, merged like the site's
     # collapsed "Achtergrond" block - always shown here since DOCX has no accordion)
+    phase("ACHTERGROND")
     add_section_title(doc, 'ACHTERGROND')
 
-    educations = load_yaml("educations.yml") or []
-    if educations:
+    if cv.educations:
         add_detail_label(doc, "Opleidingen")
-        for row in educations:
-            p = doc.add_paragraph()
-            run = p.add_run(f"{row.get('period', '')}  ")
-            run.font.color.rgb = GREY_TEXT
-            run.font.size = Pt(11)
-            run = p.add_run(row.get("name", ""))
-            if row.get("institute"):
-                run = p.add_run(f" — {row['institute']}")
-            if row.get("place"):
-                run = p.add_run(f", {row['place']}")
-            p.paragraph_format.space_after = Pt(3)
-
-    certifications = load_yaml("certifications.yml") or []
-    if certifications:
+        for row in cv.educations:
+            p = add_paragraph(doc, ENTRY)
+            add_run(p, f"{row.period}  ", MUTED)
+            p.add_run(row.name)
+            if row.institute:
+                p.add_run(f" — {row.institute}")
+            if row.place:
+                p.add_run(f", {row.place}")
+
+    if cv.certifications:
         add_detail_label(doc, "Belangrijkste certificeringen")
-        for row in certifications:
-            p = doc.add_paragraph()
-            run = p.add_run(f"{row.get('period', '')}  ")
-            run.font.color.rgb = GREY_TEXT
-            run = p.add_run(row.get("name", ""))
-            if row.get("institute"):
-                run = p.add_run(f" — {row['institute']}")
-            p.paragraph_format.space_after = Pt(3)
+        for row in cv.certifications:
+            p = add_paragraph(doc, ENTRY)
+            add_run(p, f"{row.period}  ", MUTED)
+            p.add_run(row.name)
+            if row.institute:
+                p.add_run(f" — {row.institute}")
 
     add_horizontal_line(doc)
 
     # Courses
+    phase("CURSUSSEN")
     add_section_title(doc, 'CURSUSSEN')
-    courses = load_yaml("courses.yml") or []
-
-    for group in courses:
-        p = doc.add_paragraph()
-        run = p.add_run(f"{group.get('period', '')}  ")
-        run.font.color.rgb = GREY_TEXT
-        run = p.add_run(group.get("items_text", ""))
-        p.paragraph_format.space_after = Pt(3)
+    for group in cv.courses:
+        p = add_paragraph(doc, ENTRY)
+        add_run(p, f"{group.period}  ", MUTED)
+        p.add_run(group.items_text)
 
     add_horizontal_line(doc)
 
     # Overige cursussen
-    courses_short = load_yaml("courses-short.yml") or []
-    if courses_short:
+    phase("OVERIGE CURSUSSEN")
+    if cv.courses_short:
         add_section_title(doc, 'OVERIGE CURSUSSEN')
-        for group in courses_short:
-            p = doc.add_paragraph()
-            if group.get('period'):
-                run = p.add_run(f"{group['period']}  ")
-                run.font.color.rgb = GREY_TEXT
-            run = p.add_run(group.get("items_text", ""))
-            p.paragraph_format.space_after = Pt(3)
+        for group in cv.courses_short:
+            p = add_paragraph(doc, ENTRY)
+            if group.period:
+                add_run(p, f"{group.period}  ", MUTED)
+            p.add_run(group.items_text)
         add_horizontal_line(doc)
 
     # Werkervaring (Engagements)
+    phase("WERKERVARING")
     add_section_title(doc, 'WERKERVARING')
 
     if engagements:
         for eng in engagements:
             # Summary line
-            p = doc.add_paragraph()
-            if eng.get("period"):
-                run = p.add_run(f"{eng['period']}  ")
-                run.font.color.rgb = GREY_TEXT
-            if eng.get("organisation"):
-                run = p.add_run(eng["organisation"])
-            if eng.get("role"):
-                run = p.add_run(f" — {eng['role']}")
-            p.paragraph_format.space_after = Pt(6)
+            p = add_paragraph(doc, BODY)
+            if eng.period:
+                add_run(p, f"{eng.period}  ", MUTED)
+            if eng.organisation:
+                p.add_run(eng.organisation)
+            if eng.role:
+                p.add_run(f" — {eng.role}")
 
             # Details
-            if eng.get("activities"):
+            if eng.activities:
                 add_detail_label(doc, "Werkzaamheden")
-                p = doc.add_paragraph()
-                add_text_with_breaks(p, md_bullets_to_docx_text(eng["activities"]))
-                p.paragraph_format.space_after = Pt(6)
+                add_text_with_breaks(add_paragraph(doc, BODY), block_lines(eng.activities.blocks))
 
-            if eng.get("achievements"):
+            if eng.achievements:
                 add_detail_label(doc, "Belangrijkste prestaties")
-                p = doc.add_paragraph()
-                add_text_with_breaks(p, md_bullets_to_docx_text(eng["achievements"]))
-                p.paragraph_format.space_after = Pt(6)
+                add_text_with_breaks(add_paragraph(doc, BODY), block_lines(eng.achievements.blocks))
 
-            if eng.get("keywords"):
+            if eng.keywords:
                 add_detail_label(doc, "Trefwoorden")
-                p = doc.add_paragraph()
-                add_text_with_breaks(p, eng["keywords"])
-                p.paragraph_format.space_after = Pt(6)
+                add_text_with_breaks(add_paragraph(doc, BODY), eng.keywords)
 
             # Separator between engagements
             add_horizontal_line(doc)
 
     # Save document
-    doc.save(OUTPUT_FILE)
-    print(f"✓ Word document generated: {OUTPUT_FILE}")
+    phase("save")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    # Unique temp file, then an atomic rename: build.py's site stage copies
+    # docs/ (assets/cv.docx included) while this runs, and must never see half a file.
+    with tempfile.NamedTemporaryFile(dir=output_file.parent, prefix=f"{output_file.name}.", suffix=".tmp",
+                                     delete=False) as tmp:
+        doc.save(tmp)
+    Path(tmp.name).replace(output_file)
+    phase.end()
+    print(f"✓ Word document generated: {output_file}")
+    return True
+
+def generate_docx_if_changed(data_dir=DATA_DIR, output_file=OUTPUT_FILE, force=False, manifest=None, cv=None,
+                             writer=None):
+    """generate_docx(), skipped when the manifest says output_file was already
+    built from identical inputs by the same writer."""
+    from build_cache import BuildManifest, docx_inputs, fingerprint
+
+    output_file = Path(output_file)
+    writer = writer or DEFAULT_WRITER
+    own_manifest = manifest is None
+    manifest = manifest or BuildManifest()
+    fp = fingerprint(docx_inputs(data_dir), extra=[writer])
+    if manifest.is_fresh(output_file.name, fp, output_file, force):
+        print(f"✓ {output_file.name} is up to date (inputs unchanged), skipped")
+        success = True
+    else:
+        success = generate_docx(data_dir, output_file, cv, writer)
+        if success:
+            manifest.record(output_file.name, fp, output_file)
+        else:
+            manifest.forget(output_file.name)
+    if own_manifest:
+        manifest.save()
+        print(f"  {manifest.summary()}")
+    return success
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate docs/assets/cv.docx from docs/data/")
+    parser.add_argument("--force", action="store_true", help="regenerate even if the inputs are unchanged")
+    parser.add_argument("--writer", choices=WRITERS, default=DEFAULT_WRITER,
+                        help="DOCX writer (default: CV_DOCX_WRITER or python-docx)")
+    args = parser.parse_args()
     try:
-        generate_docx()
+        generate_docx_if_changed(force=args.force, writer=args.writer)
     except Exception as e:
         print(f"Error: {e}")
         import traceback
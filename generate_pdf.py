@@ -1,287 +1,141 @@
 #!/usr/bin/env python3
 """
-Generate PDF from cv.html using Chrome/Edge headless browser
+Generate PDF from cv-print.html using Chrome/Edge headless browser
+
+site/cv-print.html is rendered print-ready by MkDocs itself (docs/cv-print.md
++ overrides/print.html: every block expanded, print CSS inlined, no download
+buttons or date footer), so it is printed as-is - no HTML post-processing.
+The printing is done by a pluggable backend from pdf_backends.py:
+`--backend pool` (default: long-lived browser over the DevTools protocol,
+prints as soon as the page signals it is ready), `cli` (one browser process
+per PDF, fixed 15 s budget) or `fake` (no browser, for tests).
+
+The PDF is only regenerated when its inputs changed (build_cache.py's
+content-hash manifest); `--force` regenerates regardless.
 """
 
 from pathlib import Path
-import subprocess
+import argparse
 import sys
-import os
-import re
+
+import profiling
+from build_cache import BuildManifest, fingerprint, pdf_inputs
+from pdf_backends import BACKEND_HELP, BrowserNotFoundError, PdfError, backend_name, get_backend
 
 # Paths
 BASE_DIR = Path(__file__).parent
 DOCS_DIR = BASE_DIR / "docs"
 SITE_DIR = BASE_DIR / "site"
-HTML_FILE = SITE_DIR / "cv.html"
+HTML_FILE = SITE_DIR / "cv-print.html"
 OUTPUT_PDF = DOCS_DIR / "assets" / "cv.pdf"
 
-def find_chrome():
-    """Find Chrome or Edge browser executable"""
-    # Try Chrome first
-    chrome_paths = [
-        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
-    ]
-    
-    for path in chrome_paths:
-        if os.path.exists(path):
-            return path
-    
-    # Try Edge
-    edge_paths = [
-        r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-        r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
-    ]
-    
-    for path in edge_paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
-
-def generate_pdf():
-    """Generate PDF from HTML file using headless browser"""
-    
-    if not HTML_FILE.exists():
-        print(f"Error: {HTML_FILE} not found. Run 'mkdocs build' first.")
-        return False
-
-    # Ensure output directory exists
-    OUTPUT_PDF.parent.mkdir(parents=True, exist_ok=True)
-
-    # Check whether the output file is locked by another process (e.g. Adobe Acrobat)
-    if OUTPUT_PDF.exists():
+def output_is_locked(output_pdf):
+    """Check whether the output file is locked by another process (e.g. Adobe Acrobat)"""
+    if output_pdf.exists():
         try:
-            with OUTPUT_PDF.open('r+b'):
+            with output_pdf.open('r+b'):
                 pass
         except PermissionError:
-            print(f"Error: {OUTPUT_PDF} is locked by another application (e.g. Adobe Acrobat).")
+            print(f"Error: {output_pdf} is locked by another application (e.g. Adobe Acrobat).")
             print("Sluit de PDF-viewer en probeer opnieuw.")
-            return False
-
-    browser_path = find_chrome()
-    if not browser_path:
-        print("Error: Chrome or Edge browser not found.")
-        print("\nPlease install Chrome or manually:")
-        print(f"  1. Open {HTML_FILE} in your browser")
-        print("  2. Press Ctrl+P (Print)")
-        print("  3. Select 'Save as PDF' as destination")
-        print("  4. Enable 'Background graphics' in More settings")
-        print(f"  5. Save as {OUTPUT_PDF}")
-        return False
-    
-    print(f"Using browser: {browser_path}")
-    print(f"Reading HTML from: {HTML_FILE}")
-    print(f"Generating PDF: {OUTPUT_PDF}")
-    
-    # Create a temporary HTML with expanded engagements for PDF.
-    # Written into SITE_DIR (not BASE_DIR) so relative asset paths (assets/img/..., stylesheets/...)
-    # still resolve correctly when Chrome loads it from disk.
-    temp_html = SITE_DIR / "cv_temp.html"
-    html_content = HTML_FILE.read_text(encoding='utf-8')
-    
-    # Remove title to prevent it showing in PDF header
-    html_content = re.sub(r'<title>.*?</title>', '<title></title>', html_content, flags=re.IGNORECASE)
-    
-    print("✓ Sidebar kept in PDF (download button will be hidden via CSS)")
-    
-    # Read the CSS file and inline it for PDF
-    css_file = SITE_DIR / "stylesheets" / "style.css"
-    css_content = css_file.read_text(encoding='utf-8') if css_file.exists() else ""
-
-    # Find and replace any CSS link tag with inline CSS
-    css_link_pattern = r"<link rel=[\"']stylesheet[\"'] href=[\"'][^\"']*style\.css[^\"']*[\"']>"
-    html_content = re.sub(css_link_pattern, f"<style>{css_content}</style>", html_content)
+            return True
+    return False
+
+def print_manual_instructions(html_file, output_pdf):
+    print("Error: Chrome or Edge browser not found.")
+    print("\nPlease install Chrome or manually:")
+    print(f"  1. Open {html_file} in your browser")
+    print("  2. Press Ctrl+P (Print)")
+    print("  3. Select 'Save as PDF' as destination")
+    print("  4. Enable 'Background graphics' in More settings")
+    print(f"  5. Save as {output_pdf}")
+
+def format_stages(stages):
+    """'dom 3.1ms, expand 0.4ms, ...' from a backend's stage timings (seconds)"""
+    return ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in stages.items())
+
+def generate_pdf(html_file=HTML_FILE, output_pdf=OUTPUT_PDF, backend=None):
+    """Generate PDF from HTML file using headless browser (or the given backend)"""
+    html_file = Path(html_file)
+    output_pdf = Path(output_pdf)
     
-    # Add print-specific CSS and JavaScript for expanding engagements
-    html_content = html_content.replace('</head>', '''
-    <style>
-        /* Always apply these styles for PDF generation */
-        @page {
-            margin: 0.5in;
-            size: A4;
-        }
-        
-        /* Expand all engagements - show all details */
-        .engagement-details {
-            max-height: none !important;
-            overflow: visible !important;
-            padding-top: 12px !important;
-        }
-        
-        /* Hide toggle arrow */
-        .engagement-toggle {
-            display: none !important;
-        }
-        
-        /* Remove pointer cursor */
-        .engagement-summary {
-            cursor: default !important;
-        }
-        
-        /* Avoid page breaks inside engagements */
-        .engagement-item {
-            page-break-inside: avoid;
-        }
-        
-        /* Keep section title with content */
-        .block-title {
-            page-break-after: avoid !important;
-        }
-        
-        /* Remove generated timestamp footer */
-        .generated {
-            display: none !important;
-        }
-        
-        /* Body and html: remove browser default margins */
-        html, body {
-            margin: 0 !important;
-            padding: 0 !important;
-        }
-
-        /* Container: keep flex layout, remove auto-centering and max-width */
-        .container {
-            display: flex !important;
-            flex-direction: row !important;
-            margin: 0 !important;
-            padding: 8px 0 0 0 !important;
-            max-width: none !important;
-            align-items: flex-start !important;
-            gap: 20px !important;
-        }
-
-        /* Sidebar: remove sticky positioning, strip all borders, add only right separator */
-        .urls-sidebar {
-            position: static !important;
-            top: auto !important;
-            align-self: flex-start !important;
-            width: 155px !important;
-            min-width: 155px !important;
-            flex-shrink: 0 !important;
-            padding: 0 16px 0 0 !important;
-            margin: 0 !important;
-            border: none !important;
-            border-right: 1px solid #c8c8c8 !important;
-            background: transparent !important;
-            gap: 5px !important;
-        }
-
-        /* Sidebar logo */
-        .sidebar-logo {
-            margin-bottom: 14px !important;
-        }
-
-        .sidebar-logo-img {
-            max-width: 130px !important;
-            max-height: 80px !important;
-        }
-
-        /* Sidebar contact links: compact for print */
-        .contact-link {
-            font-size: 0.77em !important;
-            padding: 2px 0 !important;
-            gap: 5px !important;
-            border-radius: 0 !important;
-            background: transparent !important;
-        }
+    if not html_file.exists():
+        print(f"Error: {html_file} not found. Run 'mkdocs build' first.")
+        return False
 
-        .contact-link::before {
-            width: 15px !important;
-            height: 15px !important;
-            flex-shrink: 0 !important;
-        }
+    # Ensure output directory exists
+    output_pdf.parent.mkdir(parents=True, exist_ok=True)
+    if output_is_locked(output_pdf):
+        return False
 
-        /* Main content: no extra padding needed, flex takes care of spacing */
-        .main-content {
-            flex: 1 !important;
-            min-width: 0 !important;
-        }
+    own_backend = backend is None
+    try:
+        backend = backend or get_backend()
+    except BrowserNotFoundError:
+        print_manual_instructions(html_file, output_pdf)
+        return False
 
-        /* Sections 2+ and separators: extend full width (under sidebar area) */
-        .main-content > section:not(:first-child),
-        .main-content > .block-sep {
-            margin-left: -175px !important;
-            width: calc(100% + 175px) !important;
-            box-sizing: border-box !important;
-        }
+    print(f"Using PDF backend: {backend.name}")
+    print(f"Reading HTML from: {html_file}")
+    print(f"Generating PDF: {output_pdf}")
 
-        /* Hide download button in PDF */
-        .pdf-download-btn {
-            display: none !important;
-        }
-    </style>
-    <script>
-        // Auto-expand all engagements when page loads (before print)
-        window.addEventListener('DOMContentLoaded', function() {
-            document.querySelectorAll('.engagement-summary').forEach(summary => {
-                if (summary.getAttribute('aria-expanded') !== 'true') {
-                    summary.click();
-                }
-            });
-        });
-    </script>
-    </head>''')
-    
-    # Debug: Save a copy to see what we're generating
-    debug_file = SITE_DIR / "cv_debug.html"
-    debug_file.write_text(html_content, encoding='utf-8')
-    print(f"✓ Debug HTML saved to: {debug_file}")
-    
-    temp_html.write_text(html_content, encoding='utf-8')
-    
-    # Run headless browser to generate PDF - wait for page to load completely
-    cmd = [
-        browser_path,
-        "--headless=new",
-        "--disable-gpu",
-        "--no-sandbox",
-        "--disable-dev-shm-usage",
-        f"--print-to-pdf={OUTPUT_PDF}",
-        "--print-to-pdf-no-header",
-        "--no-pdf-header-footer",
-        "--disable-web-security",
-        "--disable-features=VizDisplayCompositor",
-        "--run-all-compositor-stages-before-draw",
-        "--virtual-time-budget=15000",  # Wait 15 seconds for rendering
-        f"file:///{temp_html.resolve().as_posix()}"
-    ]
-    
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        # Clean up temp file
-        if temp_html.exists():
-            temp_html.unlink()
-        
-        if OUTPUT_PDF.exists():
-            print(f"✓ PDF generated successfully: {OUTPUT_PDF}")
-            print("  All werkervaring sections are fully expanded")
-            print("  Section headers stay with their content")
-            print("  Sidebar and download button removed")
-            return True
-        else:
-            print("Error: PDF was not created")
-            if result.stderr:
-                print(f"Error output: {result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        print("Error: PDF generation timed out")
-        if temp_html.exists():
-            temp_html.unlink()
-        return False
-    except Exception as e:
+        with profiling.span("pdf", backend.name):
+            stages = backend.print_pdf(html_file, output_pdf)
+        profiling.record_stages(f"pdf {backend.name}", stages)
+        print(f"✓ PDF generated successfully: {output_pdf}")
+        if stages:
+            print(f"  Stages: {format_stages(stages)}")
+        print("  All werkervaring sections are fully expanded")
+        print("  Section headers stay with their content")
+        return True
+    except PdfError as e:
         print(f"Error: {e}")
-        if temp_html.exists():
-            temp_html.unlink()
         return False
+    finally:
+        if own_backend:
+            backend.close()
+
+def generate_pdf_if_changed(html_file=HTML_FILE, output_pdf=OUTPUT_PDF, backend=None, force=False, manifest=None):
+    """generate_pdf(), skipped when the manifest says output_pdf was already
+    built from identical inputs. `backend` is a backend name here (part of the
+    fingerprint: a fake PDF must not satisfy a real build)."""
+    html_file = Path(html_file)
+    output_pdf = Path(output_pdf)
+    if not html_file.exists():
+        return generate_pdf(html_file, output_pdf)
+
+    own_manifest = manifest is None
+    manifest = manifest or BuildManifest()
+    name = backend_name(backend)
+    fp = fingerprint(pdf_inputs(html_file, DOCS_DIR), extra=[name])
+    if manifest.is_fresh(output_pdf.name, fp, output_pdf, force):
+        print(f"✓ {output_pdf.name} is up to date (inputs unchanged), skipped")
+        success = True
+    else:
+        try:
+            pdf_backend = get_backend(name)
+        except BrowserNotFoundError:
+            print_manual_instructions(html_file, output_pdf)
+            return False
+        with pdf_backend:
+            success = generate_pdf(html_file, output_pdf, pdf_backend)
+        if success:
+            manifest.record(output_pdf.name, fp, output_pdf)
+        else:
+            manifest.forget(output_pdf.name)
+    if own_manifest:
+        manifest.save()
+        print(f"  {manifest.summary()}")
+    return success
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate docs/assets/cv.pdf from site/cv-print.html")
+    parser.add_argument("--backend", choices=["cli", "pool", "fake"], help=BACKEND_HELP)
+    parser.add_argument("--force", action="store_true", help="regenerate even if the inputs are unchanged")
+    args = parser.parse_args()
     try:
-        success = generate_pdf()
+        success = generate_pdf_if_changed(backend=args.backend, force=args.force)
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\nCancelled by user")
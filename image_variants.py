@@ -0,0 +1,107 @@
+"""Output-specific derivatives of the profile photo (`photo` in personal-data.yml).
+
+The source photo is a multi-megabyte camera JPEG, yet it is shown at most
+110 CSS px wide on the site, ~1.15 inch in the PDF and 1.2 inch in the DOCX.
+Instead of shipping the original everywhere, each output gets its own
+variant, resized with Pillow, converted to sRGB and stripped of metadata:
+
+- site:  AVIF + WebP `srcset`s at 1x/2x/3x plus a JPEG fallback (<picture>)
+- print: one JPEG at ~300 dpi for cv-print.html / cv.pdf
+- docx:  one small JPEG for generate_docx.py's add_picture()
+
+Variants are cached in .cache/img/<source digest>/, so each is computed once
+per distinct source photo. Their public names carry that digest too
+(assets/img/derived/<stem>-<digest>-<size>.<ext>), so a new photo never
+collides with a cached old one.
+"""
+import hashlib
+import io
+import tempfile
+from pathlib import Path
+
+from PIL import Image, ImageCms, ImageOps, features
+
+ROOT = Path(__file__).resolve().parent
+CACHE_DIR = ROOT / ".cache" / "img"
+DERIVED_DIR = "assets/img/derived"  # relative to the site root
+
+DISPLAY_WIDTH = 110  # .profile-photo width in style.css (CSS px)
+WEB_WIDTHS = (110, 220, 330)
+WEB_FALLBACK_WIDTH = 220
+PRINT_WIDTH = 360  # ~1.15in at 300 dpi
+DOCX_WIDTH = 300  # 1.2in at 250 dpi
+
+# format -> (Pillow format, file extension, MIME type, save options)
+FORMATS = {
+    "avif": ("AVIF", "avif", "image/avif", {"quality": 55}),
+    "webp": ("WEBP", "webp", "image/webp", {"quality": 80, "method": 6}),
+    "jpeg": ("JPEG", "jpg", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+WEB_FORMATS = [f for f in ("avif", "webp") if features.check(f)]
+
+_SRGB = ImageCms.createProfile("sRGB")
+
+
+def source_digest(path):
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=8).hexdigest()
+
+
+def _open_srgb(source, width):
+    image = Image.open(source)
+    image.draft("RGB", (width * 2, width * 4))  # JPEG: decode at a reduced scale, far faster
+    image = ImageOps.exif_transpose(image)
+    icc = image.info.get("icc_profile")
+    if icc:
+        image = ImageCms.profileToProfile(image, ImageCms.ImageCmsProfile(io.BytesIO(icc)), _SRGB, outputMode="RGB")
+    return image.convert("RGB")
+
+
+def derive(source, width, fmt, digest=None):
+    """Cached path of `source` resized to `width` px and encoded as `fmt`."""
+    pil_format, ext, _, options = FORMATS[fmt]
+    target = CACHE_DIR / (digest or source_digest(source)) / f"{width}w.{ext}"
+    if not target.is_file():
+        image = _open_srgb(source, width)
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp file, then an atomic rename: parallel batch workers may derive the same variant.
+        with tempfile.NamedTemporaryFile(dir=target.parent, prefix=f"{target.name}.", suffix=".tmp",
+                                         delete=False) as tmp:
+            image.save(tmp, pil_format, **options)
+        Path(tmp.name).replace(target)
+    return target
+
+
+def photo_variants(source, print_layout=False):
+    """Template variables for the photo plus the files they reference.
+
+    Returns (variables, files): `variables` has `photo_src` (JPEG),
+    `photo_sources` (list of {"type", "srcset"}, empty for print) and
+    `photo_sizes`; `files` maps each public path (relative to the site root)
+    to its cached file."""
+    source = Path(source)
+    digest = source_digest(source)
+    files = {}
+
+    def add(width, fmt):
+        name = f"{DERIVED_DIR}/{source.stem}-{digest}-{width}w.{FORMATS[fmt][1]}"
+        files[name] = derive(source, width, fmt, digest)
+        return name
+
+    if print_layout:
+        return {"photo_src": add(PRINT_WIDTH, "jpeg"), "photo_sources": [], "photo_sizes": None}, files
+    sources = [
+        {
+            "type": FORMATS[fmt][2],
+            "srcset": ", ".join(f"{add(width, fmt)} {width}w" for width in WEB_WIDTHS),
+        }
+        for fmt in WEB_FORMATS
+    ]
+    variables = {"photo_src": add(WEB_FALLBACK_WIDTH, "jpeg"), "photo_sources": sources, "photo_sizes": f"{DISPLAY_WIDTH}px"}
+    return variables, files
+
+
+def docx_photo(source):
+    """Small JPEG to embed in the DOCX instead of the original."""
+    return derive(source, DOCX_WIDTH, "jpeg")
@@ -3,120 +3,365 @@
 This is the ONLY place technical logic lives for turning docs/data/**
 (plain YAML/Markdown content, safe for non-technical editors) into the
 HTML structure defined by templates/*.html (owns all CSS classes).
+
+File reading/parsing goes through cv_data's shared DataStore, so every macro
+and on_env see the same parsed data and each docs/data/** file is parsed once
+per change - not once per macro call, and not again on every serve rebuild.
+The macros render from cv_model's CV (built from that data once per change,
+and shared with generate_docx.py), not from the raw YAML.
+
+The *_html(store, ...) functions hold the actual rendering and take the data
+store explicitly, so batch_build.py can render any consultant's data tree with
+them outside MkDocs; the macros below are thin wrappers bound to docs/data/.
 """
-from datetime import datetime, timezone
+import hashlib
+import logging
+import sys
+from datetime import date, datetime, timezone
 from pathlib import Path
 
-import markdown as md
-import yaml
 from babel.dates import format_date
 from jinja2 import Environment, FileSystemLoader
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import File
 
 ROOT = Path(__file__).resolve().parent
 DATA_DIR = ROOT / "docs" / "data"
 TEMPLATES_DIR = ROOT / "templates"
 
-jinja_env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
-jinja_env.filters["markdown"] = lambda text: md.markdown(text.strip()) if text else ""
+# mkdocs-macros-plugin executes this file by path, without putting ROOT on sys.path.
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cv_data import get_store  # noqa: E402
+from cv_markdown import markdown_filter  # noqa: E402
+from cv_model import load_cv  # noqa: E402
+from fragment_cache import FRAGMENTS, LAZY_DETAILS, digest  # noqa: E402
+from image_variants import photo_variants  # noqa: E402
+from periods import experience_index  # noqa: E402
+from profiling import profiled  # noqa: E402
+from search_index import BYTE_BUDGET, build_search_index, encode  # noqa: E402
+from site_optimize import optimize_site  # noqa: E402
+from template_cache import bytecode_cache, format_stats, take_stats  # noqa: E402
+
+jinja_env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), bytecode_cache=bytecode_cache("templates"))
+jinja_env.filters["markdown"] = markdown_filter
+
+store = get_store(DATA_DIR)
+log = logging.getLogger("mkdocs.hooks.main")  # warnings count for `mkdocs build --strict`
 
 
 def load_yaml(name):
-    return yaml.safe_load((DATA_DIR / name).read_text(encoding="utf-8"))
+    return store.load_yaml(name)
 
 
 def load_engagements():
-    """All engagement records, newest first, sorted by their explicit `order` field."""
-    eng_dir = DATA_DIR / "engagements"
-    files = sorted(
-        eng_dir.glob("*.yml"),
-        key=lambda p: yaml.safe_load(p.read_text(encoding="utf-8"))["order"],
-        reverse=True,
-    )
-    return [yaml.safe_load(f.read_text(encoding="utf-8")) for f in files]
+    """All engagements (cv_model.Engagement), newest first, sorted by their explicit `order` field."""
+    return load_cv(store).engagements
 
 
-def compute_experience_years(engagements):
-    """Years since the earliest engagement's start year - a single computed
-    number, so it never has to be hand-maintained in sync with the data."""
-    years = [e["order"] // 10000 for e in engagements if e.get("order")]
-    if not years:
+def compute_experience_years(engagements, today=None):
+    """Years covered by the engagements' periods (see periods.py; parallel
+    engagements count once, gaps not at all) - a single computed number, so
+    it never has to be hand-maintained in sync with the data."""
+    if not any(item.dates for item in engagements):
         return None
-    return datetime.now().year - min(years)
+    return int(experience_index(engagements, today).years((None, None)))
+
+
+def collect_expertise_tags(store):
+    """Deduplicated tag list from every engagement's keywords plus every
+    certification name - a single scannable summary derived entirely from
+    existing content, nothing hand-authored twice (see cv_model.expertise_tags)."""
+    return load_cv(store).tags
+
+
+def profile_photo_variants(store, print_layout=False):
+    """(template variables, files) for the resized profile photo - see
+    image_variants.photo_variants; nothing when there is no photo file."""
+    source = load_cv(store).photo_path
+    if source is None:
+        return {}, {}
+    return photo_variants(source, print_layout)
+
+
+def personal_data_html(store, print_layout=False):
+    cv = load_cv(store)
+    photo, _ = profile_photo_variants(store, print_layout)
+    return jinja_env.get_template("personal_data.html").render(
+        headline=cv.headline, fields=cv.fields, photo=cv.photo, **photo
+    )
+
+
+def personal_text_html(store, render=lambda text: text):
+    """`render` expands macros inside personal-text.md (env.render under MkDocs)."""
+    return f"<div class='tekstblok'>{render(load_cv(store).personal_text)}</div>"
+
+
+def education_table_html(store, source, bold=False):
+    rows = load_cv(store).rows(source)
+    return jinja_env.get_template("education_table.html").render(rows=rows, bold=bold)
+
+
+def courses_html(store, source):
+    groups = load_cv(store).rows(source)
+    return jinja_env.get_template("course_table.html").render(groups=groups)
+
+
+LAZY_DETAILS_DIR = "assets/engagements"  # relative to the site root
+
+
+def engagements_html(store, expand_all=False, lazy_details=None):
+    """`expand_all` (print layout) renders every item expanded server-side;
+    otherwise only the two most recent start expanded.
+
+    With a `lazy_details` dict, collapsed items get an empty details block
+    pointing at a separate fragment (cv.js fetches it on first expand); the
+    fragments are added to the dict as {site path: html} for the caller to
+    write out. Their names carry the record's content digest, so they can be
+    cached like fingerprinted assets.
+
+    Each item is rendered on its own and cached in FRAGMENTS, keyed on the
+    template sources, the record's content and its `expanded`/lazy state (the
+    only position-dependent parts), so a rebuild re-renders only changed items."""
+    item_template = jinja_env.get_template("engagement_item.html")
+    details_template = jinja_env.get_template("engagement_details.html")
+    template_digest = digest([
+        jinja_env.loader.get_source(jinja_env, name)[0]
+        for name in ("engagement_item.html", "engagement_details.html")
+    ])
+    fragments = []
+    for index, item in enumerate(load_cv(store).engagements):
+        expanded = expand_all or index < 2
+        item_digest = item.digest
+        details_url = None
+        if lazy_details is not None and not expanded:
+            details_url = f"{LAZY_DETAILS_DIR}/{item_digest}.html"
+            lazy_details[details_url] = FRAGMENTS.get(
+                (template_digest, item_digest, "details"), lambda: details_template.render(item=item)
+            )
+        key = (template_digest, item_digest, expanded, details_url)
+        fragments.append(FRAGMENTS.get(
+            key, lambda: item_template.render(
+                item=item, engagement_id=item.id, expanded=expanded, details_url=details_url
+            )
+        ))
+    return "".join(f"{fragment}\n" for fragment in fragments)
+
+
+TIMELINE_TICK_YEARS = 5
+
+
+def timeline_lanes(periods, today=None):
+    """Greedy lane assignment: each period goes into the first lane whose last
+    period has ended by its start, so overlapping engagements stack."""
+    lanes = []
+    for index, period in sorted(enumerate(periods), key=lambda p: p[1]):
+        lane = next((lane for lane in lanes if periods[lane[-1]].end_or(today) <= period.start), None)
+        if lane is None:
+            lanes.append(lane := [])
+        lane.append(index)
+    return lanes
+
+
+def timeline_html(store, today=None):
+    """Engagements as bars on a year axis (web layout, above the list);
+    engagements whose period can't be read have no bar."""
+    engagements = [item for item in load_cv(store).engagements if item.dates is not None]
+    if not engagements:
+        return ""
+    today = today or date.today()
+    periods = [item.dates for item in engagements]
+    first = min(p.start for p in periods).year
+    last = max(p.end_or(today) for p in periods).year + 1
+    origin = date(first, 1, 1)
+    span = (date(last, 1, 1) - origin).days
+
+    def offset(day):
+        return round(100 * (day - origin).days / span, 2)
+
+    lanes = [
+        [
+            {
+                "left": offset(periods[i].start),
+                "width": round(offset(periods[i].end_or(today)) - offset(periods[i].start), 2),
+                "ongoing": periods[i].ongoing,
+                "period": engagements[i].period,
+                "organisation": engagements[i].organisation,
+                "label": " — ".join(filter(None, [engagements[i].organisation, engagements[i].role])),
+            }
+            for i in lane
+        ]
+        for lane in timeline_lanes(periods, today)
+    ]
+    ticks = [
+        {"year": year, "left": offset(date(year, 1, 1))}
+        for year in range(first - first % TIMELINE_TICK_YEARS + TIMELINE_TICK_YEARS, last, TIMELINE_TICK_YEARS)
+    ]
+    return jinja_env.get_template("timeline.html").render(lanes=lanes, ticks=ticks)
+
+
+def expertise_tags_html(store):
+    return jinja_env.get_template("expertise_tags.html").render(tags=collect_expertise_tags(store))
+
+
+def download_name(store):
+    """Base name of the PDF/DOCX downloads: "CV - <name>" (CV.name)."""
+    name = load_cv(store).name
+    return f"CV - {name}" if name else "CV"
+
+
+def contact_sidebar_html(store):
+    links = load_cv(store).contacts
+    return jinja_env.get_template("contact_sidebar.html").render(links=links)
+
+
+SEARCH_INDEX_DIR = "assets"  # relative to the site root
+
+
+def search_index_file(store):
+    """(site path, search_index.Encoded) of the search index over `store`'s
+    data (see search_index.py). The name carries the content hash, like the
+    fingerprinted assets, because search.js fetches it by URL."""
+    encoded = encode(build_search_index(store))
+    return f"{SEARCH_INDEX_DIR}/search-index.{hashlib.blake2b(encoded.data, digest_size=5).hexdigest()}.json", encoded
+
+
+def search_index_summary(encoded):
+    size = f"{len(encoded.data) / 1024:.1f} KB (budget {BYTE_BUDGET / 1024:.0f} KB)"
+    if encoded.over_budget:
+        return f"search index: {size} - over budget even with all {encoded.dropped} prose terms pruned"
+    return f"✓ search index: {size}" + (f", {encoded.dropped} prose terms pruned to fit" if encoded.dropped else "")
+
+
+def write_files(root, files):
+    """Write {relative path: text} under `root` (e.g. lazy engagement details)."""
+    for rel, text in files.items():
+        target = Path(root) / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+
+
+def inline_asset(docs_dir, path):
+    """Text of a docs/ asset (e.g. stylesheets/style.css), for templates that
+    inline it instead of linking it - overrides/print.html."""
+    return (Path(docs_dir) / path).read_text(encoding="utf-8")
+
+
+def publication_dates(today=None):
+    """Single source of truth for "today", computed once per build, so the
+    visible publication date and the PDF download filename can never drift
+    apart. Dutch month name via Babel's CLDR data - locale-independent
+    (doesn't rely on the OS/browser locale) and no hardcoded month names."""
+    today = today or datetime.now(timezone.utc).date()
+    return {
+        "publicatiedatum_nl": format_date(today, format="d MMMM y", locale="nl_NL"),
+        "publicatiedatum_iso": today.isoformat(),
+        "publicatiedatum_spaced": today.strftime("%Y %m %d"),
+    }
 
 
 def define_env(env):
     """mkdocs-macros-plugin hook: registers macros usable as {{ macro() }} in docs/*.md"""
 
     @env.macro
-    def render_personal_data():
-        data = load_yaml("personal-data.yml")
-        return jinja_env.get_template("personal_data.html").render(**data)
+    @profiled("macro")
+    def render_personal_data(print_layout=False):
+        return personal_data_html(store, bool(print_layout))
 
     @env.macro
+    @profiled("macro")
     def experience_years():
-        """Years since the earliest engagement's start year. Not currently
+        """Years covered by the engagements (compute_experience_years). Not currently
         wired into any template/page - available to call from docs/*.md or a
         template (e.g. {{ experience_years() }}) if/when wanted."""
         return compute_experience_years(load_engagements())
 
     @env.macro
+    @profiled("macro")
     def render_personal_text():
-        text = (DATA_DIR / "personal-text.md").read_text(encoding="utf-8")
-        return f"<div class='tekstblok'>{env.render(text)}</div>"
+        return personal_text_html(store, env.render)
 
     @env.macro
+    @profiled("macro")
     def render_education_table(source, bold=False):
-        rows = load_yaml(f"{source}.yml")
-        return jinja_env.get_template("education_table.html").render(rows=rows, bold=bold)
+        return education_table_html(store, source, bold)
 
     @env.macro
+    @profiled("macro")
     def render_courses(source):
-        groups = load_yaml(f"{source}.yml")
-        return jinja_env.get_template("course_table.html").render(groups=groups)
+        return courses_html(store, source)
+
+    @env.macro
+    @profiled("macro")
+    def render_engagements(expand_all=False, lazy=False):
+        return engagements_html(store, bool(expand_all), LAZY_DETAILS if lazy else None)
 
     @env.macro
-    def render_engagements():
-        return jinja_env.get_template("engagement_item.html").render(items=load_engagements())
+    @profiled("macro")
+    def render_timeline():
+        return timeline_html(store)
 
     @env.macro
+    @profiled("macro")
     def render_expertise_tags():
         """Deduplicated tag list from every engagement's keywords plus every
-        certification name - a single scannable summary derived entirely from
-        existing content, nothing hand-authored twice."""
-        seen = set()
-        tags = []
+        certification name (see collect_expertise_tags)."""
+        return expertise_tags_html(store)
 
-        def add(raw):
-            tag = (raw or "").strip()
-            key = tag.lower()
-            if tag and key not in seen:
-                seen.add(key)
-                tags.append(tag)
 
-        for engagement in load_engagements():
-            for kw in (engagement.get("keywords") or "").split(","):
-                add(kw)
-        for cert in load_yaml("certifications.yml") or []:
-            add(cert.get("name", ""))
+_search_index_path = None
 
-        return jinja_env.get_template("expertise_tags.html").render(tags=tags)
 
+@profiled("hook")
+def on_files(files, config):
+    """Native MkDocs hook: adds the profile photo variants (site + print
+    layout, generated into .cache/img/) and the search index to the files
+    MkDocs writes to site/."""
+    for layout in (False, True):
+        for path, cached in profile_photo_variants(store, layout)[1].items():
+            if files.get_file_from_path(path) is None:
+                files.append(File.generated(config, path, abs_src_path=str(cached)))
+    global _search_index_path
+    _search_index_path, encoded = search_index_file(store)
+    files.append(File.generated(config, _search_index_path, content=encoded.data))
+    if encoded.over_budget:
+        log.warning(search_index_summary(encoded))
+    else:
+        print(search_index_summary(encoded))
+    return files
 
+
+@profiled("hook")
 def on_env(env, config, files):
     """Native MkDocs hook (separate mechanism from mkdocs-macros-plugin's define_env
-    above): makes the contact sidebar available to overrides/main.html, the page
-    shell template, which is rendered outside mkdocs-macros-plugin's per-page
-    macro context.
+    above): makes the contact sidebar, the download file name and the search
+    index URL available to overrides/main.html, the page shell template, which
+    is rendered outside mkdocs-macros-plugin's per-page macro context. The theme templates share the on-disk bytecode cache too.
     """
-    links = load_yaml("contact.yml")
-    env.globals["contact_sidebar_html"] = jinja_env.get_template("contact_sidebar.html").render(links=links)
-
-    # Single source of truth for "today", computed once per build, so the
-    # visible publication date and the PDF download filename can never drift
-    # apart. Dutch month name via Babel's CLDR data - locale-independent
-    # (doesn't rely on the OS/browser locale) and no hardcoded month names.
-    today = datetime.now(timezone.utc).date()
-    env.globals["publicatiedatum_nl"] = format_date(today, format="d MMMM y", locale="nl_NL")
-    env.globals["publicatiedatum_iso"] = today.isoformat()
-    env.globals["publicatiedatum_spaced"] = today.strftime("%Y %m %d")
+    env.bytecode_cache = bytecode_cache("theme")
+    env.globals["contact_sidebar_html"] = contact_sidebar_html(store)
+    env.globals["download_name"] = download_name(store)
+    env.globals["search_index_url"] = _search_index_path  # built once, in on_files
+    env.globals["inline_asset"] = lambda path: inline_asset(config["docs_dir"], path)
+    env.globals.update(publication_dates())
     return env
+
+
+@profiled("hook")
+def on_post_build(config):
+    """Native MkDocs hook: minifies, fingerprints and precompresses site/
+    (see site_optimize.py), refreshes the data snapshot when a file had to be
+    parsed (see cv_data.py) and reports template/fragment cache statistics."""
+    if not isinstance(config, MkDocsConfig):
+        return  # mkdocs-macros-plugin calls a module-level on_post_build(env) too
+    write_files(config["site_dir"], LAZY_DETAILS)
+    LAZY_DETAILS.clear()
+    store.save_snapshot()
+    optimize_site(config["site_dir"])
+    stats = take_stats()
+    if stats["compiled"] or stats["cached"]:
+        print(f"✓ {format_stats(stats)}")
+    fragments = FRAGMENTS.take_stats()
+    if fragments["reused"] or fragments["rendered"]:
+        print(f"✓ engagement fragments: {fragments['rendered']} rendered, {fragments['reused']} reused")
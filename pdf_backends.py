@@ -0,0 +1,561 @@
+"""Pluggable HTML -> PDF printers used by generate_pdf.py.
+
+- "pool": the default. One long-lived headless browser, driven over the
+          DevTools protocol (CDP) with a pool of pre-opened pages, printing
+          many documents concurrently via Page.printToPDF. Prints as soon as
+          the page signals readiness (window.__cvPrintReady from
+          docs/javascripts/print-ready.js, inlined by overrides/print.html:
+          fonts loaded, images decoded) rather than after a fixed time budget.
+- "cli":  one headless Chrome/Edge process per PDF (--print-to-pdf), the
+          original approach; no extra moving parts, but pays browser cold start
+          and a fixed virtual-time budget for every document: the command line
+          can't wait for the readiness signal, so it prints when that budget
+          (15 s) runs out. Used when "pool" is the default but the browser
+          won't open a DevTools port (get_backend() falls back to it).
+- "fake": in-process stand-in that writes a small valid PDF without any
+          browser, for tests and machines without Chrome/Edge.
+
+All backends share the same interface: print_pdf(html_file, output_pdf) for a
+single document and print_many([(html_file, output_pdf), ...]) for a batch.
+print_pdf() returns the stage timings it could measure ({stage: seconds},
+possibly empty), so slow fonts/images/printing show up per document.
+The CDP client is plain stdlib (socket-level WebSocket), so no new
+dependencies are needed.
+"""
+
+import base64
+import json
+import os
+import queue
+import shutil
+import socket
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import profiling
+
+DEFAULT_TIMEOUT = 30  # seconds per document
+
+# Flags shared by every headless launch (see generate_pdf.py's original command line).
+BROWSER_FLAGS = [
+    "--headless=new",
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor",
+    "--run-all-compositor-stages-before-draw",
+]
+
+
+class PdfError(RuntimeError):
+    """A document could not be printed."""
+
+
+class BrowserNotFoundError(PdfError):
+    """No Chrome/Edge executable available for a browser-based backend."""
+
+
+def find_chrome():
+    """Find Chrome or Edge browser executable"""
+    # Try Chrome first, then Edge (Windows install locations)
+    candidates = [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
+        r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+        r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+
+    # Linux / CI runners: whatever is on PATH
+    for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "msedge"):
+        path = shutil.which(name)
+        if path:
+            return path
+
+    return None
+
+
+def file_url(path):
+    return Path(path).resolve().as_uri()
+
+
+class PdfBackend:
+    """Base class: subclasses implement print_pdf(); print_many() fans out over threads."""
+
+    name = None
+    concurrency = 1
+
+    def print_pdf(self, html_file, output_pdf):
+        raise NotImplementedError
+
+    def print_many(self, jobs):
+        """Print every (html_file, output_pdf) pair. Returns one dict per job, in
+        input order: {"html", "pdf", "ok", "error", "seconds", "stages"} - a
+        failing document never aborts the rest of the batch."""
+
+        def run(job):
+            html_file, output_pdf = job
+            started = time.perf_counter()
+            stages, error = {}, None
+            try:
+                with profiling.span("pdf", self.name, {"html": str(html_file)}):
+                    stages = self.print_pdf(html_file, output_pdf) or {}
+                profiling.record_stages(f"pdf {self.name}", stages)
+            except Exception as e:  # any failure is this job's, not the batch's
+                error = str(e) if isinstance(e, PdfError) else f"{type(e).__name__}: {e}"
+            return {
+                "html": html_file,
+                "pdf": output_pdf,
+                "ok": error is None,
+                "error": error,
+                "seconds": time.perf_counter() - started,
+                "stages": stages,
+            }
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            return list(pool.map(run, jobs))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ChromeCliBackend(PdfBackend):
+    """One headless browser process per PDF (--print-to-pdf)."""
+
+    name = "cli"
+
+    def __init__(self, browser_path=None, timeout=DEFAULT_TIMEOUT, concurrency=1):
+        self.browser_path = browser_path or find_chrome()
+        if not self.browser_path:
+            raise BrowserNotFoundError("Chrome or Edge browser not found.")
+        self.timeout = timeout
+        self.concurrency = concurrency
+
+    def print_pdf(self, html_file, output_pdf):
+        output_pdf = Path(output_pdf)
+        if output_pdf.exists():
+            output_pdf.unlink()
+        # Wait for page to load completely - the command line offers no way to
+        # wait for a readiness signal, only a virtual-time budget.
+        cmd = [
+            self.browser_path,
+            *BROWSER_FLAGS,
+            f"--print-to-pdf={output_pdf}",
+            "--print-to-pdf-no-header",
+            "--no-pdf-header-footer",
+            "--virtual-time-budget=15000",  # Wait 15 seconds for rendering
+            file_url(html_file),
+        ]
+        started = time.perf_counter()
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            raise PdfError("PDF generation timed out") from None
+        if not output_pdf.exists():
+            detail = f"\nError output: {result.stderr}" if result.stderr else ""
+            raise PdfError(f"PDF was not created{detail}")
+        return {"browser": time.perf_counter() - started}
+
+
+class _WebSocket:
+    """Minimal RFC 6455 client: text frames only, enough to speak CDP."""
+
+    def __init__(self, url, timeout=DEFAULT_TIMEOUT):
+        parts = urlsplit(url)
+        self.sock = socket.create_connection((parts.hostname, parts.port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall(
+            (
+                f"GET {parts.path} HTTP/1.1\r\n"
+                f"Host: {parts.hostname}:{parts.port}\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Key: {key}\r\n"
+                "Sec-WebSocket-Version: 13\r\n\r\n"
+            ).encode()
+        )
+        buf = b""
+        while b"\r\n\r\n" not in buf:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("DevTools endpoint closed during handshake")
+            buf += chunk
+        head, _, self._buf = buf.partition(b"\r\n\r\n")
+        if b" 101 " not in head.split(b"\r\n", 1)[0]:
+            raise ConnectionError(f"DevTools handshake failed: {head.splitlines()[0]!r}")
+        self.sock.settimeout(None)
+        self._send_lock = threading.Lock()
+
+    def _send_frame(self, opcode, payload):
+        n = len(payload)
+        header = bytearray([0x80 | opcode])
+        if n < 126:
+            header.append(0x80 | n)
+        elif n < 1 << 16:
+            header.append(0x80 | 126)
+            header += struct.pack(">H", n)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack(">Q", n)
+        mask = os.urandom(4)
+        header += mask
+        if n:
+            key = int.from_bytes((mask * (n // 4 + 1))[:n], "big")
+            payload = (int.from_bytes(payload, "big") ^ key).to_bytes(n, "big")
+        with self._send_lock:
+            self.sock.sendall(bytes(header) + payload)
+
+    def send(self, text):
+        self._send_frame(0x1, text.encode("utf-8"))
+
+    def _read_exact(self, n):
+        while len(self._buf) < n:
+            chunk = self.sock.recv(max(65536, n - len(self._buf)))
+            if not chunk:
+                raise ConnectionError("DevTools connection closed")
+            self._buf += chunk
+        data, self._buf = self._buf[:n], self._buf[n:]
+        return data
+
+    def recv(self):
+        message = bytearray()
+        while True:
+            b0, b1 = self._read_exact(2)
+            opcode, n = b0 & 0x0F, b1 & 0x7F
+            if n == 126:
+                n = struct.unpack(">H", self._read_exact(2))[0]
+            elif n == 127:
+                n = struct.unpack(">Q", self._read_exact(8))[0]
+            if b1 & 0x80:
+                mask = self._read_exact(4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._read_exact(n)))
+            else:
+                payload = self._read_exact(n)
+
+            if opcode == 0x8:
+                raise ConnectionError("DevTools connection closed")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode in (0x0, 0x1, 0x2):
+                message += payload
+                if b0 & 0x80:
+                    return message.decode("utf-8")
+
+    def close(self):
+        try:
+            self._send_frame(0x8, b"")
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class _CdpConnection:
+    """Request/response + event dispatch over one browser-level CDP socket
+    (flattened sessions: every page is addressed by its sessionId)."""
+
+    def __init__(self, ws_url):
+        self.ws = _WebSocket(ws_url)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._pending = {}  # id -> [threading.Event, message]
+        self._waiters = []  # [session_id, method, threading.Event, message]
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self):
+        try:
+            while True:
+                msg = json.loads(self.ws.recv())
+                with self._lock:
+                    if "id" in msg:
+                        slot = self._pending.pop(msg["id"], None)
+                        if slot:
+                            slot[1] = msg
+                            slot[0].set()
+                        continue
+                    for waiter in list(self._waiters):
+                        if waiter[0] == msg.get("sessionId") and waiter[1] == msg.get("method"):
+                            waiter[3] = msg.get("params", {})
+                            waiter[2].set()
+                            self._waiters.remove(waiter)
+        except (ConnectionError, OSError, ValueError):
+            with self._lock:
+                self._closed = True
+                for slot in self._pending.values():
+                    slot[0].set()
+                for waiter in self._waiters:
+                    waiter[2].set()
+
+    def call(self, method, params=None, session_id=None, timeout=DEFAULT_TIMEOUT):
+        with self._lock:
+            if self._closed:
+                raise PdfError("browser connection lost")
+            self._next_id += 1
+            msg_id = self._next_id
+            slot = self._pending[msg_id] = [threading.Event(), None]
+        msg = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id:
+            msg["sessionId"] = session_id
+        self.ws.send(json.dumps(msg))
+        if not slot[0].wait(timeout):
+            with self._lock:
+                self._pending.pop(msg_id, None)
+            raise PdfError(f"{method} timed out")
+        reply = slot[1]
+        if reply is None:
+            raise PdfError("browser connection lost")
+        if "error" in reply:
+            raise PdfError(f"{method}: {reply['error'].get('message')}")
+        return reply.get("result", {})
+
+    def expect(self, session_id, method):
+        """Register interest in an event *before* triggering it; returns a
+        waiter to pass to wait()."""
+        waiter = [session_id, method, threading.Event(), None]
+        with self._lock:
+            self._waiters.append(waiter)
+        return waiter
+
+    def wait(self, waiter, timeout=DEFAULT_TIMEOUT):
+        if not waiter[2].wait(timeout):
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            raise PdfError(f"timed out waiting for {waiter[1]}")
+        if waiter[3] is None:
+            raise PdfError("browser connection lost")
+        return waiter[3]
+
+    def close(self):
+        self.ws.close()
+
+
+# Evaluated in the page: the readiness promise print-ready.js sets up (inlined
+# by overrides/print.html), or the load event for other pages. Resolves with {stage: milliseconds}.
+READY_EXPRESSION = """
+window.__cvPrintReady || (document.readyState === 'complete'
+    ? Promise.resolve({})
+    : new Promise(resolve => window.addEventListener('load', () => resolve({}), {once: true})))
+"""
+
+
+class ChromePoolBackend(PdfBackend):
+    """One long-lived headless browser with `size` reusable pages."""
+
+    name = "pool"
+
+    def __init__(self, size=4, browser_path=None, timeout=DEFAULT_TIMEOUT):
+        self.browser_path = browser_path or find_chrome()
+        if not self.browser_path:
+            raise BrowserNotFoundError("Chrome or Edge browser not found.")
+        self.concurrency = size
+        self.timeout = timeout
+        self._profile_dir = tempfile.mkdtemp(prefix="cv-pdf-")
+        self._process = subprocess.Popen(
+            [
+                self.browser_path,
+                *BROWSER_FLAGS,
+                "--remote-debugging-port=0",
+                f"--user-data-dir={self._profile_dir}",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "about:blank",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            self._cdp = _CdpConnection(self._browser_ws_url())
+            self._pages = queue.Queue()
+            for _ in range(size):
+                target = self._cdp.call("Target.createTarget", {"url": "about:blank"})
+                session = self._cdp.call(
+                    "Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}
+                )["sessionId"]
+                self._cdp.call("Page.enable", session_id=session)
+                self._pages.put(session)
+        except Exception:
+            self.close()
+            raise
+
+    def _browser_ws_url(self):
+        """Chrome writes the port it picked (and the browser target path) to
+        DevToolsActivePort in the profile dir once it is listening."""
+        port_file = Path(self._profile_dir) / "DevToolsActivePort"
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise PdfError(f"browser exited during startup (code {self._process.returncode})")
+            if port_file.exists():
+                lines = port_file.read_text().split()
+                if len(lines) >= 2:
+                    return f"ws://127.0.0.1:{lines[0]}{lines[1]}"
+            time.sleep(0.05)
+        raise PdfError("browser did not open a DevTools port in time")
+
+    def _load(self, session, html_file, stages):
+        """Navigate, then wait for the page's readiness promise (or, for pages
+        not rendered with overrides/print.html, the load event)."""
+        t = time.perf_counter()
+        dom_ready = self._cdp.expect(session, "Page.domContentEventFired")
+        result = self._cdp.call("Page.navigate", {"url": file_url(html_file)}, session, self.timeout)
+        if result.get("errorText"):
+            raise PdfError(f"navigation failed: {result['errorText']}")
+        self._cdp.wait(dom_ready, self.timeout)
+        stages["navigate"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        ready = self._cdp.call(
+            "Runtime.evaluate",
+            {"expression": READY_EXPRESSION, "awaitPromise": True, "returnByValue": True},
+            session,
+            self.timeout,
+        )
+        if "exceptionDetails" in ready:
+            raise PdfError(f"page readiness check failed: {ready['exceptionDetails'].get('text')}")
+        page_stages = ready.get("result", {}).get("value") or {}
+        page_stages.pop("total", None)
+        stages.update({name: ms / 1000 for name, ms in page_stages.items()})
+        stages["ready"] = time.perf_counter() - t
+
+    def print_pdf(self, html_file, output_pdf):
+        stages = {}
+        session = self._pages.get()
+        try:
+            self._load(session, html_file, stages)
+            t = time.perf_counter()
+            result = self._cdp.call(
+                "Page.printToPDF",
+                {
+                    "printBackground": True,
+                    "preferCSSPageSize": True,  # @page { size: A4; margin: 0.5in }
+                    "displayHeaderFooter": False,
+                },
+                session,
+                self.timeout,
+            )
+            stages["print"] = time.perf_counter() - t
+        finally:
+            self._pages.put(session)
+        output_pdf = Path(output_pdf)
+        output_pdf.parent.mkdir(parents=True, exist_ok=True)
+        output_pdf.write_bytes(base64.b64decode(result["data"]))
+        return stages
+
+    def close(self):
+        cdp = getattr(self, "_cdp", None)
+        if cdp:
+            try:
+                cdp.call("Browser.close", timeout=5)
+            except PdfError:
+                pass
+            cdp.close()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        shutil.rmtree(self._profile_dir, ignore_errors=True)
+
+
+class FakeBackend(PdfBackend):
+    """Writes a one-page PDF naming the source file - no browser involved.
+    Records every printed job in `printed` so tests can assert on it."""
+
+    name = "fake"
+
+    def __init__(self, concurrency=4):
+        self.concurrency = concurrency
+        self.printed = []
+        self._lock = threading.Lock()
+
+    def print_pdf(self, html_file, output_pdf):
+        html_file = Path(html_file)
+        if not html_file.is_file():
+            raise PdfError(f"{html_file} not found")
+        label = html_file.name.replace("\\", "").replace("(", "").replace(")", "")
+        stream = f"BT /F1 12 Tf 72 770 Td (Fake PDF of {label}) Tj ET".encode("latin-1", "replace")
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        ]
+        out = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for i, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+        out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+        output_pdf = Path(output_pdf)
+        output_pdf.parent.mkdir(parents=True, exist_ok=True)
+        output_pdf.write_bytes(bytes(out))
+        with self._lock:
+            self.printed.append((html_file, output_pdf))
+        return {}
+
+
+BACKENDS = {
+    "cli": ChromeCliBackend,
+    "pool": ChromePoolBackend,
+    "fake": FakeBackend,
+}
+
+
+DEFAULT_BACKEND = "pool"
+
+# --pdf-backend/--backend help shared by build.py, batch_build.py and generate_pdf.py.
+BACKEND_HELP = ("PDF backend (default: $CV_PDF_BACKEND or pool, which prints as soon as the page is ready; "
+                "cli waits a fixed 15 s virtual-time budget per PDF)")
+
+
+def backend_name(name=None):
+    """The backend that get_backend(name) would use: name, else $CV_PDF_BACKEND, else DEFAULT_BACKEND."""
+    return name or os.environ.get("CV_PDF_BACKEND") or DEFAULT_BACKEND
+
+
+def get_backend(name=None, **kwargs):
+    """Instantiate a backend by name (default: $CV_PDF_BACKEND, else
+    DEFAULT_BACKEND). When nobody chose one and the pool's browser can't be
+    driven over the DevTools protocol, falls back to "cli"."""
+    chosen = name or os.environ.get("CV_PDF_BACKEND")
+    name = backend_name(name)
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown PDF backend {name!r} (choose from {', '.join(BACKENDS)})") from None
+    try:
+        return cls(**kwargs)
+    except BrowserNotFoundError:
+        raise
+    except PdfError as e:
+        if chosen or cls is not ChromePoolBackend:
+            raise
+        print(f"! PDF backend pool unavailable ({e}), using cli")
+        return ChromeCliBackend(kwargs.get("browser_path"), kwargs.get("timeout", DEFAULT_TIMEOUT),
+                                kwargs.get("size", 1))
@@ -0,0 +1,239 @@
+"""Parsed engagement periods and an interval index over them.
+
+Engagements carry a free-text `period` ("2021 – 2024", "2026 – heden",
+"mrt 2019 – jun 2020") plus an `order` integer (YYYYMMDD). parse_period()
+turns that into a Period with real dates:
+
+- start: the `order` date when it is a valid date in the period's start year,
+  else the 1st of the start month/year;
+- end (exclusive): the 1st of the month/year after the last one named - so
+  "2025 – 2025" is all of 2025 - except that a year-only end different from
+  the start year counts up to that year: "2010 – 2018" and "2018 – 2020" are
+  handovers, not an overlapping year;
+- "heden"/"nu"/"present"/a trailing dash: open-ended, i.e. up to `today`.
+
+Ranges may be written without spaces ("1997-2005", "1997–2005", as the data
+files are named). The period stays free text: engagement_period() gives None
+for text it can't read ("zomer 2019", a missing period), and such engagements
+are simply left out of the timeline and the experience figures.
+
+IntervalIndex keeps (period, key) entries sorted on start with a running
+maximum end, so overlap queries are a binary search plus a short scan, and
+caches the merged coverage per key. Total experience and per-keyword
+experience (the union of the covered days, so parallel engagements aren't
+counted twice) are then answered from the cache, even for a roster-wide
+index keyed on (person, keyword) - nothing is rescanned per question.
+"""
+import bisect
+import re
+from dataclasses import dataclass, field
+from datetime import date
+
+DAYS_PER_YEAR = 365.2425
+_ANY = object()
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mrt": 3, "maa": 3, "mar": 3, "apr": 4, "mei": 5, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "okt": 10, "oct": 10, "nov": 11, "dec": 12,
+}
+OPEN_ENDED = re.compile(r"heden|^nu$|present|now|^$", re.IGNORECASE)
+# "<start> – <end>": an en/em dash, or a hyphen with whitespace on one side
+# (a bare hyphen belongs to a "03-2021" date).
+_RANGE = re.compile(r"^(?P<start>.+?)\s*(?:[–—]|\s-|-\s|-$)\s*(?P<end>.*)$")
+# "1997-2005", "03-2019-06-2020", "2019-heden": a bare hyphen after a year.
+_BARE_RANGE = re.compile(r"^(?P<start>(?:\d{1,2}-)?\d{4})-(?P<end>(?:\d{1,2}-)?\d{4}|[^\d\s-]+)$")
+_POINT = re.compile(r"^(?:(?P<month>[a-z]+)\.?\s+|(?P<num>\d{1,2})[-/])?(?P<year>\d{4})$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Period:
+    start: date
+    end: date | None = None  # exclusive; None = ongoing
+    text: str = field(default="", compare=False)
+
+    @property
+    def ongoing(self):
+        return self.end is None
+
+    def __lt__(self, other):
+        # On start, then end - an ongoing period ends last (no None < date).
+        return (self.start, self.end or date.max) < (other.start, other.end or date.max)
+
+    def end_or(self, today=None):
+        return self.end or today or date.today()
+
+    def overlaps(self, other, today=None):
+        return self.start < other.end_or(today) and other.start < self.end_or(today)
+
+    def days(self, today=None):
+        return max(0, (self.end_or(today) - self.start).days)
+
+    def years(self, today=None):
+        return self.days(today) / DAYS_PER_YEAR
+
+
+def _parse_point(text):
+    """'2021' -> (2021, None), 'mrt 2021' / '03-2021' -> (2021, 3)."""
+    match = _POINT.match(text.strip())
+    if not match:
+        raise ValueError(f"unrecognised date {text!r}")
+    month = match["num"] and int(match["num"])
+    if match["month"]:
+        month = MONTHS.get(match["month"][:3].lower())
+        if month is None:
+            raise ValueError(f"unrecognised month {match['month']!r}")
+    return int(match["year"]), month
+
+
+def _first_after(year, month):
+    if month is None:
+        return date(year + 1, 1, 1)
+    return date(year + month // 12, month % 12 + 1, 1)
+
+
+def parse_period(text, order=None):
+    """Period of an engagement's `period` text (and optional `order`).
+    Raises ValueError for text it can't read."""
+    text = str(text or "").strip()
+    match = _BARE_RANGE.match(text) or _RANGE.match(text)
+    start_text, end_text = (match["start"], match["end"]) if match else (text, text)
+    start_year, start_month = _parse_point(start_text)
+    start = date(start_year, start_month or 1, 1)
+    if order:
+        try:
+            from_order = date(order // 10000, order // 100 % 100, order % 100)
+        except ValueError:
+            from_order = None
+        if from_order and from_order.year == start_year:
+            start = from_order
+    if OPEN_ENDED.search(end_text):
+        return Period(start, None, text)
+    end_year, end_month = _parse_point(end_text)
+    if end_month is None and end_year > start_year:
+        end = date(end_year, 1, 1)  # handover year, see module docstring
+    else:
+        end = _first_after(end_year, end_month)
+    if end <= start:
+        raise ValueError(f"period {text!r} ends before it starts")
+    return Period(start, end, text)
+
+
+def engagement_period(item):
+    """Period of an engagement record, or None when its period can't be read."""
+    try:
+        return parse_period(item.get("period"), item.get("order"))
+    except ValueError:
+        return None
+
+
+def merge(periods, today=None):
+    """Sorted, non-overlapping (start, end) date pairs covering `periods`."""
+    merged = []
+    for period in sorted(periods):
+        start, end = period.start, period.end_or(today)
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class IntervalIndex:
+    """(Period, key) entries; overlap queries and per-key merged coverage."""
+
+    def __init__(self, today=None):
+        self.today = today or date.today()
+        self._entries = []  # (period, key), sorted on start
+        self._starts = []
+        self._max_end = []  # running max of end over _entries[:i + 1]
+        self._coverage = {}  # key -> merged (start, end) pairs
+        self._by_key = {}
+
+    def add(self, period, key=None):
+        entry = (period, key)
+        position = bisect.bisect(self._starts, period.start)
+        self._entries.insert(position, entry)
+        self._starts.insert(position, period.start)
+        self._max_end = []  # rebuilt on the next query
+        self._by_key.setdefault(key, []).append(period)
+        self._coverage.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _running_max(self):
+        if len(self._max_end) != len(self._entries):
+            running, self._max_end = date.min, []
+            for period, _ in self._entries:
+                running = max(running, period.end_or(self.today))
+                self._max_end.append(running)
+        return self._max_end
+
+    def overlapping(self, period, key=_ANY):
+        """Entries (period, key) overlapping `period`, in start order;
+        only those under `key` when given."""
+        max_end = self._running_max()
+        end = period.end_or(self.today)
+        hits = []
+        i = bisect.bisect_left(self._starts, end) - 1
+        while i >= 0 and max_end[i] > period.start:
+            other, other_key = self._entries[i]
+            if other.end_or(self.today) > period.start and key in (_ANY, other_key):
+                hits.append((other, other_key))
+            i -= 1
+        return hits[::-1]
+
+    def overlaps(self, key=_ANY):
+        """All pairs of entries (under `key`, when given) that overlap each
+        other - a sweep over start order."""
+        pairs, active = [], []
+        for period, entry_key in self._entries:
+            if key not in (_ANY, entry_key):
+                continue
+            active = [(p, k) for p, k in active if p.end_or(self.today) > period.start]
+            pairs += [((p, k), (period, entry_key)) for p, k in active]
+            active.append((period, entry_key))
+        return pairs
+
+    def coverage(self, key=None):
+        if key not in self._coverage:
+            self._coverage[key] = merge(self._by_key.get(key, ()), self.today)
+        return self._coverage[key]
+
+    def keys(self):
+        return list(self._by_key)
+
+    def years(self, key=None):
+        """Covered years for `key`: overlapping periods are counted once."""
+        return sum((end - start).days for start, end in self.coverage(key)) / DAYS_PER_YEAR
+
+
+def keyword_key(keyword):
+    return keyword.strip().lower()
+
+
+def experience_index(engagements, today=None, person=None):
+    """IntervalIndex with every engagement (cv_model.Engagement) under key
+    (person, None) and under (person, keyword) for each of its keywords. For
+    a roster, add the other consultants to the same index with add_engagements()."""
+    return add_engagements(IntervalIndex(today), engagements, person)
+
+
+def add_engagements(index, engagements, person=None):
+    for item in engagements:
+        if item.dates is not None:
+            add_entry(index, item.dates, item.keyword_list, person)
+    return index
+
+
+def add_entry(index, dates, keywords, person=None):
+    """One engagement's `dates` under (person, None) and (person, keyword)."""
+    index.add(dates, (person, None))
+    for keyword in {keyword_key(k) for k in keywords if k.strip()}:
+        index.add(dates, (person, keyword))
+
+
+def keyword_experience(index, person=None):
+    """{keyword: covered years} for `person`, most experience first."""
+    years = {key[1]: index.years(key) for key in index.keys() if key[0] == person and key[1] is not None}
+    return dict(sorted(years.items(), key=lambda item: (-item[1], item[0])))
@@ -0,0 +1,271 @@
+"""Build profiling: where does a build spend its time?
+
+Off by default. Switched on by the CV_PROFILE environment variable (`1`, or a
+directory for the trace files) or the `--profile` flag of build.py and
+batch_build.py, which set that variable so MkDocs subprocesses and batch
+workers profile too:
+
+    python build.py --profile
+    CV_PROFILE=1 python -m mkdocs build
+
+Instrumented: every define_env macro and MkDocs hook in main.py (and the batch
+renderer's macros), every data file read and parsed (cv_data.py), every
+Markdown conversion (cv_markdown.py), each section of generate_docx(), each
+PDF backend stage and each build.py stage. At exit a process prints a table
+(calls, total/mean/max per name, most expensive first) and writes its events
+as a Chrome trace (build/profile/<program>.<pid>.json, open it in
+https://ui.perfetto.dev or chrome://tracing); build.py merges the traces of
+its stages and the mkdocs process into build/profile/trace.json. Only files
+named like that are ever read or deleted, since CV_PROFILE may point at a
+directory holding other JSON.
+
+When off, span() hands out one shared no-op context manager and profiled()
+functions cost a flag check - nothing is recorded.
+"""
+import atexit
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+PROFILE_DIR = ROOT / "build" / "profile"
+ENV_VAR = "CV_PROFILE"
+MERGED_TRACE = "trace.json"
+_TRACE_FILE = re.compile(r"^[\w.-]+\.\d+\.json$")  # <program>.<pid>.json, as finish() writes
+
+_events = []  # (category, name, start ns, duration ns, pid, thread id, args)
+_lock = threading.Lock()
+_enabled = False
+_finished = False
+
+
+def _configure():
+    global _enabled
+    value = os.environ.get(ENV_VAR, "").strip()
+    _enabled = value not in ("", "0")
+    return _enabled
+
+
+def enable(directory=None):
+    """Profile this process and (through CV_PROFILE) its child processes."""
+    os.environ[ENV_VAR] = str(directory) if directory else "1"
+    _configure()
+
+
+def enabled():
+    return _enabled
+
+
+def trace_dir():
+    value = os.environ.get(ENV_VAR, "").strip()
+    return PROFILE_DIR if value in ("", "0", "1") else Path(value)
+
+
+def record(category, name, start_ns, duration_ns, args=None):
+    if _enabled:
+        event = (category, name, start_ns, duration_ns, os.getpid(), threading.get_native_id(), args)
+        with _lock:
+            _events.append(event)
+
+
+class _Span:
+    __slots__ = ("category", "name", "args", "start")
+
+    def __init__(self, category, name, args):
+        self.category, self.name, self.args = category, name, args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.category, self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(category, name, args=None):
+    """`with span("docx", "WERKERVARING"):` - times the block when profiling."""
+    return _Span(category, name, args) if _enabled else _NO_SPAN
+
+
+def profiled(category, name=None):
+    """Decorator: time every call of the function under `category`."""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(category, label, start, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+class phases:
+    """Consecutive sections of one long function: each call ends the running
+    section and starts the next one; end() (or leaving a `with`) ends the last.
+
+        phase = profiling.phases("docx")
+        phase("PERSOONLIJKE GEGEVENS")
+        ...
+        phase("WERKERVARING")
+        ...
+        phase.end()
+    """
+
+    def __init__(self, category):
+        self.category = category
+        self.current = None
+
+    def __call__(self, name):
+        self.end()
+        if _enabled:
+            self.current = (name, time.perf_counter_ns())
+
+    def end(self):
+        if self.current:
+            name, start = self.current
+            record(self.category, name, start, time.perf_counter_ns() - start)
+            self.current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.end()
+
+
+def record_stages(category, stages, end_ns=None):
+    """Timings measured elsewhere ({name: seconds}, e.g. a PDF backend's
+    stages), laid out back to back so that the last one ends at `end_ns`."""
+    if not _enabled or not stages:
+        return
+    start = (end_ns or time.perf_counter_ns()) - int(sum(stages.values()) * 1e9)
+    for name, seconds in stages.items():
+        record(category, name, start, int(seconds * 1e9))
+        start += int(seconds * 1e9)
+
+
+def take_events():
+    """This process' events so far (e.g. to send from a worker to its parent)."""
+    global _events
+    with _lock:
+        events, _events = _events, []
+    return events
+
+
+def add_events(events):
+    with _lock:
+        _events.extend(tuple(e) for e in events)
+
+
+def summary(events):
+    """(category, name) -> [calls, total ns, max ns], most expensive first."""
+    totals = {}
+    for category, name, _, duration, *_ in events:
+        entry = totals.setdefault((category, name), [0, 0, 0])
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] = max(entry[2], duration)
+    return dict(sorted(totals.items(), key=lambda item: -item[1][1]))
+
+
+def format_table(events, limit=40):
+    rows = list(summary(events).items())
+    width = max([len(f"{c} {n}") for (c, n), _ in rows[:limit]] + [10])
+    lines = [f"{'profile':<{width}}  {'calls':>6}  {'total':>10}  {'mean':>9}  {'max':>9}"]
+    for (category, name), (calls, total, longest) in rows[:limit]:
+        lines.append(
+            f"{category + ' ' + name:<{width}}  {calls:>6}  {total / 1e6:>8.1f}ms"
+            f"  {total / calls / 1e6:>7.2f}ms  {longest / 1e6:>7.2f}ms"
+        )
+    if len(rows) > limit:
+        lines.append(f"... {len(rows) - limit} more in the trace file")
+    return "\n".join(lines)
+
+
+def trace_events(events):
+    """Chrome trace format "complete" events (microseconds)."""
+    return [
+        {
+            "name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+            "ts": start / 1000, "dur": duration / 1000, **({"args": args} if args else {}),
+        }
+        for category, name, start, duration, pid, tid, args in events
+    ]
+
+
+def write_trace(path, events):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": trace_events(events), "displayTimeUnit": "ms"}), encoding="utf-8")
+    return path
+
+
+def trace_files(directory):
+    """The per-process trace files finish() wrote into `directory`."""
+    return sorted(path for path in Path(directory).glob("*.json") if _TRACE_FILE.match(path.name))
+
+
+def clear_traces(directory):
+    """Delete an earlier run's trace files (and merged trace) from `directory`;
+    nothing else in it is touched."""
+    for path in trace_files(directory) + [Path(directory) / MERGED_TRACE]:
+        path.unlink(missing_ok=True)
+
+
+def merge_traces(directory, target):
+    """Combine the trace files in `directory` (other than `target`) into `target`."""
+    target = Path(target)
+    merged = []
+    for path in trace_files(directory):
+        if path.resolve() != target.resolve():
+            merged += json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    target.write_text(json.dumps({"traceEvents": merged, "displayTimeUnit": "ms"}), encoding="utf-8")
+    return target, len(merged)
+
+
+def finish(program=None):
+    """Print the table and write the trace of everything recorded so far
+    (once; also run at exit). Returns the trace path, or None."""
+    global _finished
+    if not _enabled or _finished:
+        return None
+    _finished = True
+    events = take_events()
+    if not events:
+        return None
+    if program is None:
+        script = Path(sys.argv[0] if sys.argv and sys.argv[0] else "python")
+        program = script.parent.name if script.stem == "__main__" else script.stem  # python -m mkdocs
+    path = write_trace(trace_dir() / f"{program}.{os.getpid()}.json", events)
+    print()
+    print(format_table(events))
+    print(f"✓ profile trace: {path}")
+    return path
+
+
+_configure()
+atexit.register(finish)
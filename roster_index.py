@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Roster index: full-text search over many consultants' CV data trees.
+
+Builds and incrementally refreshes a local SQLite database with an FTS5
+table, so questions like "who did IAM and OpenShift after 2020" are a
+millisecond query instead of grepping hundreds of docs/data/ folders:
+
+    python roster_index.py update roster/*/docs/data
+    python roster_index.py search "IAM OpenShift" --since 2020
+    python roster_index.py search "archimate" --people
+    python roster_index.py experience kubernetes
+    python roster_index.py experience --person jan-jansen
+    python roster_index.py overlaps --person jan-jansen
+    python roster_index.py during "2019 – 2020" --keyword azure
+
+Each argument is a data directory laid out like docs/data/ (one per
+consultant, named like batch_build.py names its output folders - see
+consultants.py; a second tree with the same folder name becomes "<name>-2").
+People are keyed on the tree's resolved path. Its files are read into
+cv_model's CV, the same model main.py and generate_docx.py render from.
+Indexed per person: every engagement (organisation, role, keywords,
+activities, achievements), every courses.yml / courses-short.yml group and
+every certification, each with its dates as periods.py parses them (an
+engagement's Engagement.dates; end exclusive, none for ongoing work) and
+the years they cover. Entries whose period can't be read have no dates and
+match no year filter.
+
+A person whose data files are unchanged since the last update (content
+fingerprint, as in build_cache.py) is skipped; a changed one is re-indexed
+as a whole.
+
+`experience`, `overlaps` and `during` answer from periods.py's
+IntervalIndex, built from the database's engagement dates and keywords (no
+data tree is read): covered years per keyword (parallel engagements count
+once), engagements that run in parallel and who was engaged in a period.
+
+Queries match word prefixes, all words required. `search` ranks single
+entries (FTS5 bm25, keywords and titles weigh more than body text);
+`--people` ranks consultants for whom every word matches some entry within
+the year filter, e.g. IAM in one engagement and OpenShift in another.
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+from build_cache import fingerprint
+from consultants import consultant_name, unique_name
+from cv_data import get_store
+from cv_model import load_cv
+from periods import IntervalIndex, Period, add_entry, keyword_experience, keyword_key, parse_period
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_DB = ROOT / "build" / "roster.sqlite"
+
+# Bump when what gets indexed changes: every person is re-indexed.
+INDEX_VERSION = 2
+# Bump when SCHEMA changes: an older database is dropped and rebuilt.
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    data_dir TEXT NOT NULL UNIQUE,
+    fingerprint TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    person_id INTEGER NOT NULL REFERENCES people(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    period TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    start_year INTEGER,
+    end_year INTEGER
+);
+CREATE INDEX IF NOT EXISTS entries_person ON entries(person_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    title, keywords, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# bm25 column weights for entries_fts (title, keywords, body).
+WEIGHTS = (4.0, 3.0, 1.0)
+
+
+@dataclass
+class Match:
+    name: str
+    kind: str
+    title: str
+    period: str
+    score: float
+    snippet: str
+
+
+def connect(db_path=DEFAULT_DB):
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(db_path)
+    db.execute("PRAGMA foreign_keys = ON")
+    if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        db.executescript("DROP TABLE IF EXISTS entries_fts; DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS people;")
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    db.executescript(SCHEMA)
+    return db
+
+
+def period_of(text):
+    """Period of a course/certification `period` text, or None (periods.py)."""
+    try:
+        return parse_period(text)
+    except ValueError:
+        return None
+
+
+def span(dates):
+    """(start date, end date, start year, end year) columns of a Period: ISO
+    dates, the end exclusive; the end year is the last year it covers.
+    Ongoing: no end; no Period: nothing."""
+    if dates is None:
+        return None, None, None, None
+    end = dates.end and dates.end.isoformat()
+    end_year = dates.end and (dates.end - timedelta(days=1)).year
+    return dates.start.isoformat(), end, dates.start.year, end_year
+
+
+def entries(store):
+    """(kind, period, start date, end date, start year, end year, title,
+    keywords, body) rows for one data tree."""
+    cv = load_cv(store)
+    for item in cv.engagements:
+        title = " — ".join(filter(None, [item.organisation, item.role]))
+        yield ("engagement", item.period, *span(item.dates),
+               title, item.keywords, f"{item.activities}\n{item.achievements}")
+    for group in cv.courses + cv.courses_short:
+        yield ("course", group.period, *span(period_of(group.period)), "", "", group.items_text)
+    for cert in cv.certifications:
+        yield ("certification", cert.period, *span(period_of(cert.period)), cert.name, "", cert.institute)
+
+
+def data_fingerprint(data_dir):
+    files = [p for p in Path(data_dir).rglob("*") if p.is_file() and p.suffix in (".yml", ".yaml", ".md")]
+    return fingerprint(files, extra=[INDEX_VERSION])
+
+
+def _delete_person(db, person_id):
+    db.execute("DELETE FROM entries_fts WHERE rowid IN (SELECT id FROM entries WHERE person_id = ?)", (person_id,))
+    db.execute("DELETE FROM people WHERE id = ?", (person_id,))  # entries cascade
+
+
+def update(db, data_dirs, force=False, prune=False):
+    """Index new/changed data trees; with `prune`, drop people not among
+    `data_dirs`. Returns {"indexed": [...], "unchanged": [...], "removed": [...]}."""
+    report = {"indexed": [], "unchanged": [], "removed": []}
+    seen = set()
+    for data_dir in data_dirs:
+        path = str(Path(data_dir).resolve())
+        seen.add(path)
+        fp = data_fingerprint(data_dir)
+        row = db.execute("SELECT id, fingerprint, name FROM people WHERE data_dir = ?", (path,)).fetchone()
+        if row:
+            name = row[2]
+        else:
+            taken = {n for (n,) in db.execute("SELECT name FROM people")}
+            name = unique_name(consultant_name(data_dir), taken)
+        if row and row[1] == fp and not force:
+            report["unchanged"].append(name)
+            continue
+        store = get_store(data_dir)
+        rows = list(entries(store))  # parse before touching the db
+        store.save_snapshot()
+        with db:
+            if row:
+                _delete_person(db, row[0])
+            person_id = db.execute(
+                "INSERT INTO people (name, data_dir, fingerprint, indexed_at) VALUES (?, ?, ?, ?)",
+                (name, path, fp, time.time()),
+            ).lastrowid
+            for kind, period, start_date, end_date, start, end, title, keywords, body in rows:
+                entry_id = db.execute(
+                    "INSERT INTO entries (person_id, kind, period, start_date, end_date, start_year, end_year)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (person_id, kind, period, start_date, end_date, start, end),
+                ).lastrowid
+                db.execute(
+                    "INSERT INTO entries_fts (rowid, title, keywords, body) VALUES (?, ?, ?, ?)",
+                    (entry_id, title, keywords, body),
+                )
+        report["indexed"].append(name)
+    if prune:
+        with db:
+            for person_id, name, path in db.execute("SELECT id, name, data_dir FROM people").fetchall():
+                if path not in seen:
+                    _delete_person(db, person_id)
+                    report["removed"].append(name)
+    return report
+
+
+def fts_query(text):
+    """User words -> FTS5 expression: every word required, prefix match.
+    Words are quoted, so FTS5 operators in the input are just text."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        raise ValueError("empty query")
+    return " AND ".join(f'"{word}"*' for word in words)
+
+
+def _filters(since, until, kinds):
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("e.start_year IS NOT NULL AND COALESCE(e.end_year, 9999) >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("e.start_year <= ?")  # NULL (no dates) never matches
+        params.append(until)
+    if kinds:
+        clauses.append(f"e.kind IN ({', '.join('?' * len(kinds))})")
+        params += list(kinds)
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def search(db, text, since=None, until=None, kinds=None, limit=20):
+    """Best matching entries, most relevant first."""
+    where, params = _filters(since, until, kinds)
+    rows = db.execute(
+        f"""SELECT p.name, e.kind, f.title, COALESCE(e.period, ''), bm25(entries_fts, {', '.join(map(str, WEIGHTS))}) AS rank,
+                   snippet(entries_fts, -1, '[', ']', '…', 12)
+            FROM entries_fts f JOIN entries e ON e.id = f.rowid JOIN people p ON p.id = e.person_id
+            WHERE entries_fts MATCH ?{where}
+            ORDER BY rank LIMIT ?""",
+        [fts_query(text), *params, limit],
+    ).fetchall()
+    return [Match(name, kind, title, period, -rank, snippet) for name, kind, title, period, rank, snippet in rows]
+
+
+def search_people(db, text, since=None, until=None, kinds=None, limit=20):
+    """Consultants for whom every word matches at least one entry (not
+    necessarily the same one). Returns [(name, score, [Match, ...])], the
+    score summing each word's best entry score."""
+    where, params = _filters(since, until, kinds)
+    per_word = []
+    for word in re.findall(r"\w+", text) or [""]:
+        best = {}
+        for match in db.execute(
+            f"""SELECT p.name, e.kind, f.title, COALESCE(e.period, ''), bm25(entries_fts, {', '.join(map(str, WEIGHTS))}),
+                       snippet(entries_fts, -1, '[', ']', '…', 12)
+                FROM entries_fts f JOIN entries e ON e.id = f.rowid JOIN people p ON p.id = e.person_id
+                WHERE entries_fts MATCH ?{where}""",
+            [fts_query(word), *params],
+        ):
+            name, kind, title, period, rank, snippet = match
+            if name not in best or -rank > best[name].score:
+                best[name] = Match(name, kind, title, period, -rank, snippet)
+        per_word.append(best)
+    names = set.intersection(*(set(best) for best in per_word))
+    people = [(name, sum(best[name].score for best in per_word), [best[name] for best in per_word]) for name in names]
+    return sorted(people, key=lambda p: (-p[1], p[0]))[:limit]
+
+
+def roster_index(db, today=None):
+    """periods.IntervalIndex over every indexed engagement with dates: under
+    (name, None) and (name, keyword) per keyword, as periods.experience_index()."""
+    index = IntervalIndex(today)
+    for name, period, start, end, keywords in db.execute(
+        """SELECT p.name, e.period, e.start_date, e.end_date, f.keywords
+           FROM entries e JOIN people p ON p.id = e.person_id JOIN entries_fts f ON f.rowid = e.id
+           WHERE e.kind = 'engagement' AND e.start_date IS NOT NULL"""
+    ):
+        dates = Period(date.fromisoformat(start), end and date.fromisoformat(end), period)
+        add_entry(index, dates, keywords.split(","), name)
+    return index
+
+
+def experience(index, keyword, limit=20):
+    """[(name, years)] covered by engagements with `keyword`, most first."""
+    key = keyword_key(keyword)
+    people = {name for name, _ in index.keys()}
+    ranked = [(name, index.years((name, key))) for name in people]
+    return sorted((p for p in ranked if p[1] > 0), key=lambda p: (-p[1], p[0]))[:limit]
+
+
+def overlaps(index, name=None):
+    """[(name, Period, Period)]: engagements of one person that run in
+    parallel, for `name` or everyone."""
+    people = [name] if name else sorted({n for n, _ in index.keys()})
+    return [(person, a, b) for person in people for (a, _), (b, _) in index.overlaps((person, None))]
+
+
+def during(index, period, keyword=None):
+    """[(name, Period)]: engagements (with `keyword`, when given) overlapping
+    `period`, in start order."""
+    key = keyword and keyword_key(keyword)
+    return [(name, dates) for dates, (name, entry_key) in index.overlapping(period) if entry_key == key]
+
+
+def _print_matches(matches):
+    for m in matches:
+        heading = " · ".join(filter(None, [m.name, m.kind, m.period, m.title]))
+        print(f"{m.score:6.2f}  {heading}")
+        print(f"        {' '.join(m.snippet.split())}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Full-text index over many consultants' CV data.")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="SQLite database (default: build/roster.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update_cmd = commands.add_parser("update", help="index new or changed data trees")
+    update_cmd.add_argument("data_dirs", nargs="+", type=Path, help="docs/data-style directories, one per consultant")
+    update_cmd.add_argument("--force", action="store_true", help="re-index unchanged trees too")
+    update_cmd.add_argument("--prune", action="store_true", help="drop people not among data_dirs")
+
+    search_cmd = commands.add_parser("search", help="ranked matches for some words (prefix match, all required)")
+    search_cmd.add_argument("query")
+    search_cmd.add_argument("--since", type=int, help="only entries running in or after this year")
+    search_cmd.add_argument("--until", type=int, help="only entries starting in or before this year")
+    search_cmd.add_argument("--kind", action="append", choices=["engagement", "course", "certification"],
+                            help="restrict to entry kind (repeatable)")
+    search_cmd.add_argument("--people", action="store_true", help="rank people: each word may match a different entry")
+    search_cmd.add_argument("--limit", type=int, default=20)
+
+    experience_cmd = commands.add_parser("experience", help="years of experience per keyword (parallel work counts once)")
+    experience_cmd.add_argument("keyword", nargs="?", help="rank people by years with this keyword")
+    experience_cmd.add_argument("--person", help="every keyword of one person instead")
+    experience_cmd.add_argument("--limit", type=int, default=20)
+
+    overlaps_cmd = commands.add_parser("overlaps", help="engagements running in parallel")
+    overlaps_cmd.add_argument("--person", help="only this person")
+
+    during_cmd = commands.add_parser("during", help="who was engaged during a period")
+    during_cmd.add_argument("period", help='a period as in the data files, e.g. "2019 – 2020"')
+    during_cmd.add_argument("--keyword", help="only engagements with this keyword")
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    if args.command in ("experience", "overlaps", "during"):
+        return _interval_command(parser, args, roster_index(db))
+    if args.command == "update":
+        missing = [d for d in args.data_dirs if not d.is_dir()]
+        if missing:
+            parser.error(f"not a directory: {', '.join(map(str, missing))}")
+        started = time.perf_counter()
+        report = update(db, args.data_dirs, args.force, args.prune)
+        total = db.execute("SELECT COUNT(*) FROM people").fetchone()[0]
+        print(f"✓ {len(report['indexed'])} indexed, {len(report['unchanged'])} unchanged, "
+              f"{len(report['removed'])} removed in {time.perf_counter() - started:.2f}s ({total} people in {args.db})")
+        return 0
+
+    started = time.perf_counter()
+    try:
+        if args.people:
+            people = search_people(db, args.query, args.since, args.until, args.kind, args.limit)
+        else:
+            matches = search(db, args.query, args.since, args.until, args.kind, args.limit)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = (time.perf_counter() - started) * 1000
+    if args.people:
+        for name, score, matches in people:
+            print(f"{score:6.2f}  {name}")
+            _print_matches(matches)
+        print(f"✓ {len(people)} people in {elapsed:.1f} ms")
+    else:
+        _print_matches(matches)
+        print(f"✓ {len(matches)} matches in {elapsed:.1f} ms")
+    return 0
+
+
+def _interval_command(parser, args, index):
+    started = time.perf_counter()
+    if args.command == "during":
+        try:
+            period = parse_period(args.period)
+        except ValueError as error:
+            parser.error(str(error))
+        hits = during(index, period, args.keyword)
+        for name, dates in hits:
+            print(f"{name}: {dates.text}")
+        print(f"✓ {len(hits)} engagements in {(time.perf_counter() - started) * 1000:.1f} ms")
+    elif args.command == "overlaps":
+        pairs = overlaps(index, args.person)
+        for name, a, b in pairs:
+            print(f"{name}: {a.text}  ∥  {b.text}")
+        print(f"✓ {len(pairs)} overlapping pairs in {(time.perf_counter() - started) * 1000:.1f} ms")
+    elif args.person:
+        years = keyword_experience(index, args.person)
+        for keyword, value in list(years.items())[:args.limit]:
+            print(f"{value:6.1f}  {keyword}")
+        print(f"✓ {len(years)} keywords for {args.person} in {(time.perf_counter() - started) * 1000:.1f} ms")
+    elif args.keyword:
+        ranked = experience(index, args.keyword, args.limit)
+        for name, value in ranked:
+            print(f"{value:6.1f}  {name}")
+        print(f"✓ {len(ranked)} people in {(time.perf_counter() - started) * 1000:.1f} ms")
+    else:
+        parser.error("experience needs a keyword or --person")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main_cli())
+    except KeyboardInterrupt:
+        print("\nCancelled by user")
+        sys.exit(1)
@@ -9,7 +9,8 @@ references).
 Already run; its output is committed under docs/includes/. Kept here for
 historical reference only - generate_site.py has since been removed, so this
 script is no longer runnable as-is. Going forward, edit docs/includes/*.md
-directly instead of content/*.txt.
+directly instead of content/*.txt. Legacy engagement .txt files (e.g. from
+other consultants) are imported with scripts/import_legacy.py instead.
 """
 import sys
 import html
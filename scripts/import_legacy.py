@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Bulk importer: legacy content/engagements/*.txt (pipe-delimited DSL) ->
+docs/data/engagements/*.yml.
+
+The legacy format is one `key|value` line per field, the key optionally in
+backticks or quotes; lines without a pipe (often "• " bullets) continue the
+previous field:
+
+    `periode`|2021 – 2024
+    organisatie|Gemeente Utrecht
+    functie|Solution Architect
+    werkzaamheden|
+    • Werkzaamheid 1.
+    • Werkzaamheid 2.
+
+Keys are matched through SYNONYMS (the variants the old generate_site.py
+accepted), normalised once into LOOKUP (lowercase, a-z0-9 only), so each key
+is a single dict lookup. Files are parsed line by line, never read whole.
+`order` is derived from the period's start date (periods.py), so an
+unreadable period is reported instead of producing an unsortable record.
+
+Each argument is a directory tree; every *.txt below it is converted to the
+same relative location under --out, with a `content/engagements` segment
+mapped to `docs/data/engagements`:
+
+    python scripts/import_legacy.py legacy/ --out roster/ --jobs 8
+
+Files are converted in parallel (process pool). Outputs newer than their
+source are skipped unless --force. At the end: a per-file error list, the
+number of converted/skipped files and files/second.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from cv_data import to_yaml  # noqa: E402
+from periods import parse_period  # noqa: E402
+
+# engagement YAML field -> legacy key variants
+SYNONYMS = {
+    "period": ["periode", "period"],
+    "organisation": ["organisatie", "organisatie_naam", "organization", "organisation", "employer"],
+    "role": ["functie", "functienaam", "job", "jobtitle", "job_title", "role"],
+    "activities": ["werkzaamheden", "work", "workdetails", "textblockwork", "text_block_work", "work_description"],
+    "achievements": ["belangrijksteprestaties", "prestaties", "achievements", "achievements_text",
+                     "text_block_achievements", "achievements_list"],
+    "keywords": ["trefwoorden", "keywords", "text_block_keywords", "keywords_list"],
+}
+FIELDS = ["period", "order", "organisation", "role", "activities", "achievements", "keywords"]
+REQUIRED = ("period", "organisation")
+
+
+def normalize_key(key):
+    return re.sub(r"[^a-z0-9]", "", key.lower())
+
+
+LOOKUP = {normalize_key(variant): field for field, variants in SYNONYMS.items() for variant in variants}
+
+_BULLET = re.compile(r"^\s*[•·*-]\s+")
+
+
+def parse_fields(lines):
+    """(key, value) pairs from an iterable of DSL lines, as they complete."""
+    key, buf = None, []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if "|" in stripped:
+            if key is not None:
+                yield key, "\n".join(buf).strip()
+            raw_key, value = stripped.split("|", 1)
+            key, buf = raw_key.strip().strip("`'\"").strip(), [value.strip()] if value.strip() else []
+        elif key is not None and _BULLET.match(line):
+            if buf and not buf[-1].startswith("- "):
+                buf.append("")  # Markdown needs a blank line before a list
+            buf.append(_BULLET.sub("- ", line).strip())
+        elif key is not None:
+            buf.append(stripped)
+    if key is not None:
+        yield key, "\n".join(buf).strip()
+
+
+def parse_engagement(path):
+    """Engagement record (FIELDS order) from a legacy .txt file, plus the keys
+    that matched no field. Raises ValueError for a file that can't be imported."""
+    record, unknown = {}, []
+    with open(path, encoding="utf-8-sig") as lines:
+        for key, value in parse_fields(lines):
+            field = LOOKUP.get(normalize_key(key))
+            if field is None:
+                unknown.append(key)
+            elif value:
+                record[field] = value
+    missing = [f for f in REQUIRED if f not in record]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    start = parse_period(record["period"]).start
+    record["order"] = int(start.strftime("%Y%m%d"))
+    if "keywords" in record:
+        record["keywords"] = ", ".join(k.strip().lstrip("- ") for k in re.split(r"[,\n]", record["keywords"]) if k.strip())
+    return {f: record[f] for f in FIELDS if f in record}, unknown
+
+
+def output_path(source, root, out_root):
+    rel = list(source.relative_to(root).with_suffix(".yml").parts)
+    for i in range(len(rel) - 2):
+        if rel[i:i + 2] == ["content", "engagements"]:
+            rel[i:i + 2] = ["docs", "data", "engagements"]
+            break
+    return Path(out_root, *rel)
+
+
+def convert_one(source, target, force=False):
+    """Convert one file. Returns (source, status, detail): status is
+    "converted", "skipped" or "error"."""
+    try:
+        if not force and target.is_file() and target.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+            return source, "skipped", None
+        record, unknown = parse_engagement(source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".yml.tmp")
+        tmp.write_text(to_yaml(record), encoding="utf-8")
+        tmp.replace(target)
+        return source, "converted", f"ignored keys: {', '.join(unknown)}" if unknown else None
+    except Exception as e:  # one bad file is that file's failure, not the run's
+        return source, "error", f"{type(e).__name__}: {e}"
+
+
+def _convert_task(task):
+    return convert_one(*task)
+
+
+def import_trees(roots, out_root, jobs=None, force=False):
+    """Convert every *.txt below `roots`. Returns (results, seconds)."""
+    tasks = [
+        (source, output_path(source, root, out_root), force)
+        for root in map(Path, roots)
+        for source in sorted(root.rglob("*.txt"))
+    ]
+    started = time.perf_counter()
+    if jobs == 1 or len(tasks) < 2:
+        results = [_convert_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_convert_task, tasks, chunksize=max(1, len(tasks) // ((jobs or os.cpu_count()) * 8))))
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import legacy pipe-delimited engagement .txt files as YAML.")
+    parser.add_argument("roots", nargs="+", type=Path, help="directory trees containing legacy *.txt files")
+    parser.add_argument("--out", type=Path, required=True, help="output root (relative layout is preserved)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="convert files whose output is already up to date")
+    args = parser.parse_args()
+    missing = [r for r in args.roots if not r.is_dir()]
+    if missing:
+        parser.error(f"not a directory: {', '.join(map(str, missing))}")
+
+    results, seconds = import_trees(args.roots, args.out, args.jobs, args.force)
+    counts = {"converted": 0, "skipped": 0, "error": 0}
+    for source, status, detail in results:
+        counts[status] += 1
+        if status == "error":
+            print(f"✗ {source}: {detail}")
+        elif detail:
+            print(f"! {source}: {detail}")
+    rate = len(results) / seconds if seconds else 0.0
+    print(f"✓ {counts['converted']} converted, {counts['skipped']} up to date, {counts['error']} failed "
+          f"in {seconds:.2f}s ({rate:.0f} files/s)")
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\nCancelled by user")
+        sys.exit(1)
@@ -0,0 +1,119 @@
+"""Build-time inverted index for the CV page's search box (javascripts/search.js).
+
+Documents are the engagements (organisation, role, keywords, activities,
+achievements), each courses.yml / courses-short.yml group and each
+certification. The index maps every normalised term to the documents that
+contain it, serialised as compact JSON:
+
+    {"docs": [["e", "<record id>"], ["s", "<section id>"], ...],
+     "terms": {"<term>": [<doc index>, <gap>, <gap>, ...], ...},
+     "stop": ["aan", "als", ...]}
+
+"e" documents point at an engagement item (data-engagement="<record id>"),
+"s" documents at the collapsible block in a cv.md section (id="<section id>");
+documents with the same target (every certification -> "achtergrond") are
+one entry. Postings are ascending doc indexes stored as gaps from the
+previous one, so a term found in most engagements costs a digit or two per
+engagement instead of three or four.
+The browser only does prefix lookups over `terms`; nothing is tokenised or
+indexed client-side. Normalisation (NFD, accents stripped, lowercase, split
+on anything but a-z0-9, STOPWORDS dropped) must stay in sync with search.js's
+normalize(); the stopwords ship in the index as "stop", since a query word
+that was never indexed would otherwise match nothing.
+
+The serialised index is kept within BYTE_BUDGET. When it would be larger,
+terms are pruned in this order: numbers, then prose words (found only in
+activities/achievements text) from the rarest up. Terms of organisations,
+roles, keywords, course and certification names - what people search for -
+are never pruned; if those alone don't fit, the index is written anyway and
+encode() reports it as over budget (main.py warns).
+"""
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+
+from cv_model import load_cv
+
+BYTE_BUDGET = 24 * 1024
+
+MIN_TERM_LENGTH = 2
+STOPWORDS = frozenset("""
+    aan als bij dat de den der des die dit door een en er het hun in is je kan
+    met na naar niet nog of om op over te ten ter tot uit van voor was wat we
+    werd worden zijn zo
+    a an and are as at be by for from in is it of on or the to with
+""".split())
+
+def normalize(text):
+    text = unicodedata.normalize("NFD", str(text or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return [t for t in re.split(r"[^a-z0-9]+", text) if len(t) >= MIN_TERM_LENGTH and t not in STOPWORDS]
+
+
+def documents(store):
+    """(doc, key text, prose text) for one consultant's data: key text holds
+    the names people search for, prose the descriptions around them."""
+    cv = load_cv(store)
+    for item in cv.engagements:
+        key = " ".join([item.organisation, item.role, item.period, item.keywords])
+        yield ["e", item.id], key, " ".join([item.activities, item.achievements])
+    for section, groups in (("cursussen", cv.courses), ("overige-cursussen", cv.courses_short)):
+        for group in groups:
+            yield ["s", section], " ".join([group.period, group.items_text]), ""
+    for cert in cv.certifications:
+        yield ["s", "achtergrond"], " ".join([cert.name, cert.institute, cert.period]), ""
+
+
+def build_search_index(store):
+    """{"docs": [...], "terms": {term: [doc index, ...]}, "key_terms": {...}}."""
+    docs, positions, terms, key_terms = [], {}, {}, set()
+    for doc, key, prose in documents(store):
+        index = positions.setdefault(tuple(doc), len(docs))
+        if index == len(docs):
+            docs.append(doc)
+        key_words = normalize(key)
+        key_terms.update(key_words)
+        for term in key_words + normalize(prose):
+            postings = terms.setdefault(term, [])
+            if not postings or postings[-1] < index:
+                postings.append(index)
+    return {"docs": docs, "terms": dict(sorted(terms.items())), "key_terms": key_terms}
+
+
+@dataclass
+class Encoded:
+    data: bytes
+    dropped: int  # pruned terms
+    over_budget: bool  # even the protected terms alone don't fit
+
+
+def gaps(postings):
+    return [doc - previous for previous, doc in zip([0] + postings, postings)]
+
+
+def _dump(docs, terms):
+    return json.dumps({"docs": docs, "terms": terms, "stop": sorted(STOPWORDS)}, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def encode(index, budget=BYTE_BUDGET):
+    """Compact JSON bytes of `index` (see the module docstring), pruned to
+    fit `budget`."""
+    terms = {term: gaps(postings) for term, postings in index["terms"].items()}
+    key_terms = index.get("key_terms", set())
+    prunable = sorted(
+        (t for t in terms if t not in key_terms),
+        key=lambda t: (not t.isdigit(), len(index["terms"][t]), -len(t), t),
+    )
+    dropped = 0
+    while True:
+        data = _dump(index["docs"], terms)
+        if len(data) <= budget:
+            return Encoded(data, dropped, False)
+        if dropped == len(prunable):
+            return Encoded(data, dropped, True)
+        # Prune in batches proportional to the overshoot instead of re-encoding per term.
+        batch = max(1, len(terms) * (len(data) - budget) // len(data))
+        for term in prunable[dropped:dropped + batch]:
+            del terms[term]
+        dropped = min(len(prunable), dropped + batch)
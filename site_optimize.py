@@ -0,0 +1,260 @@
+"""Post-build optimisation of a built site (site/ or a batch CV tree).
+
+Run after MkDocs has written the site (main.py's on_post_build), and again by
+build.py's publish stage / batch_build.py once cv.pdf and cv.docx are final:
+
+1. minify every .css/.js file (and inline <style>/<script> blocks);
+2. fingerprint asset URLs (asset_manifest.py) - after minifying, so the hash
+   is that of the bytes actually served;
+3. inline the stylesheet rules the first screen needs (sidebar, personal
+   block, block titles - CRITICAL_CLASSES) into each page that links a
+   stylesheet, and load the full stylesheet without blocking rendering;
+4. minify the HTML;
+5. write .gz (and .br, when the `brotli` package is installed) siblings of
+   every text file for static hosts that serve precompressed files.
+
+Every step is idempotent, so running it twice over the same tree is safe.
+
+The minifiers are deliberately conservative - no parsing beyond what each
+step needs: CSS drops comments and whitespace outside strings; JS only
+strips indentation, blank lines, line comments and block comments that
+start a line (newlines are kept, so automatic semicolon insertion is
+unaffected); HTML drops comments and
+collapses whitespace, except inside <pre>/<textarea>/<script>/<style> and
+.tekstblok elements, which are `white-space: pre-wrap` in style.css.
+"""
+import fnmatch
+import gzip
+import re
+from pathlib import Path
+
+from asset_manifest import fingerprint_site, logical_name
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz siblings without it
+    brotli = None
+
+# Classes whose rules are needed for the first screen. Rules whose selectors
+# use only these classes (or no class at all: body, table, :root, ...) are
+# inlined; everything else (engagements, courses, ...) is deferred.
+CRITICAL_CLASSES = (
+    "container", "main-content", "urls-sidebar", "sidebar-logo*", "pdf-download-btn", "cv-search*",
+    "contact-*", "block", "block-title", "block-sep", "personal-*", "profile-*",
+    "tekstblok", "label", "value",
+)
+PRESERVE_WHITESPACE_CLASSES = ("tekstblok",)
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".xml", ".svg", ".txt"}
+
+_STRING_OR_COMMENT = re.compile(r"""("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')|/\*.*?\*/""", re.S)
+
+
+def minify_css(css):
+    strings = []
+
+    def stash(match):
+        if match.group(1) is None:
+            return " "  # comment
+        strings.append(match.group(1))
+        return f"\0{len(strings) - 1}\0"
+
+    css = _STRING_OR_COMMENT.sub(stash, css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}").strip()
+    return re.sub(r"\0(\d+)\0", lambda m: strings[int(m.group(1))], css)
+
+
+def minify_js(js):
+    if "`" in js:
+        return js  # template literals may span lines; leave them alone
+    lines = []
+    in_comment = False
+    for line in js.splitlines():
+        stripped = line.strip()
+        # Leading block comments go; code after the closing */ stays.
+        while in_comment or stripped.startswith("/*"):
+            end = stripped.find("*/", 0 if in_comment else 2)
+            in_comment = end < 0
+            stripped = "" if in_comment else stripped[end + 2:].strip()
+            if in_comment:
+                break
+        if stripped and not stripped.startswith("//"):
+            lines.append(stripped)
+    return "\n".join(lines)
+
+
+_VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_HTML_TOKEN = re.compile(r"<!--.*?-->|<![^>]*>|<(/?)([a-zA-Z][\w-]*)([^>]*)>|[^<]+|<", re.S)
+_CLASS_ATTR = re.compile(r"""\bclass=["']([^"']*)["']""")
+
+
+def minify_html(html):
+    out = []
+    stack = []  # (tag name, preserves whitespace)
+    space = False  # out ends in collapsed whitespace (a dropped comment may sit in between)
+    pos = 0
+    while pos < len(html):
+        match = _HTML_TOKEN.match(html, pos)
+        token, pos = match.group(0), match.end()
+        closing, name = match.group(1), (match.group(2) or "").lower()
+        if token.startswith("<!--"):
+            continue
+        if not name:
+            if any(p for _, p in stack) or token.startswith("<!"):
+                out.append(token)
+                space = False
+            else:
+                text = re.sub(r"\s+", " ", token)
+                text = text[1:] if space and text.startswith(" ") else text
+                out.append(text)
+                space = text.endswith(" ") or (space and not text)
+            continue
+        space = False
+        out.append(token)
+        if closing:
+            if any(open_name == name for open_name, _ in stack):
+                while stack.pop()[0] != name:
+                    pass
+        elif name in ("script", "style"):
+            end = html.lower().find(f"</{name}", pos)
+            end = len(html) if end < 0 else end
+            body = html[pos:end]
+            out.append(minify_css(body) if name == "style" else minify_js(body))
+            pos = end
+        elif name not in _VOID and not token.endswith("/>"):
+            classes = (_CLASS_ATTR.search(match.group(3)) or [None, ""])[1].split()
+            preserve = name in ("pre", "textarea") or any(c in PRESERVE_WHITESPACE_CLASSES for c in classes)
+            stack.append((name, preserve))
+    return "".join(out).strip()
+
+
+def _css_blocks(css):
+    """Top-level (prelude, body) pairs of a minified stylesheet."""
+    blocks, depth, start, prelude = [], 0, 0, None
+    for i, char in enumerate(css):
+        if char == "{":
+            if depth == 0:
+                prelude, start = css[start:i], i + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:i]))
+                start = i + 1
+    return blocks
+
+
+def _is_critical(selector_list):
+    for selector in selector_list.split(","):
+        classes = re.findall(r"\.([\w-]+)", selector)
+        if all(any(fnmatch.fnmatchcase(c, p) for p in CRITICAL_CLASSES) for c in classes):
+            return True
+    return False
+
+
+def critical_css(css):
+    """The CRITICAL_CLASSES subset of a (minified) stylesheet, @media blocks included."""
+    out = []
+    for prelude, body in _css_blocks(css):
+        if prelude.startswith("@media"):
+            inner = critical_css(body)
+            if inner:
+                out.append(f"{prelude}{{{inner}}}")
+        elif not prelude.startswith("@") and _is_critical(prelude):
+            out.append(f"{prelude}{{{body}}}")
+    return "".join(out)
+
+
+_STYLESHEET_LINK = re.compile(r"""<link rel="stylesheet" href="([^"]+)">""")
+
+
+def inline_critical_css(html, page_dir):
+    """Inline the critical rules of every linked stylesheet and load the
+    stylesheet itself asynchronously (with a <noscript> fallback)."""
+    def replace(match):
+        href = match.group(1)
+        css = (page_dir / href.split("?", 1)[0]).read_text(encoding="utf-8")
+        return (
+            f"<style data-critical>{critical_css(minify_css(css))}</style>"
+            f"""<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel='stylesheet'">"""
+            f"""<noscript><link rel="stylesheet" href="{href}"></noscript>"""
+        )
+
+    return _STYLESHEET_LINK.sub(replace, html)
+
+
+def precompress(path):
+    """Write .gz/.br siblings of `path` (only when they are smaller). Returns
+    (gzip size, brotli size); the original size where no sibling was written."""
+    siblings = [path.with_name(path.name + suffix) for suffix in (".gz", ".br")]
+    mtime = path.stat().st_mtime_ns
+    if all(s.is_file() and s.stat().st_mtime_ns >= mtime for s in siblings[: 2 if brotli else 1]):
+        return tuple(s.stat().st_size if s.is_file() else path.stat().st_size for s in siblings)  # up to date
+    data = path.read_bytes()
+    sizes = []
+    for suffix, compress in ((".gz", lambda d: gzip.compress(d, 9, mtime=0)),
+                             (".br", brotli and (lambda d: brotli.compress(d, quality=11)))):
+        sibling = path.with_name(path.name + suffix)
+        packed = compress(data) if compress else None
+        if packed is not None and len(packed) < len(data):
+            sibling.write_bytes(packed)
+            sizes.append(len(packed))
+        else:
+            sibling.unlink(missing_ok=True)
+            sizes.append(len(data))
+    return tuple(sizes)
+
+
+def _kb(n):
+    return f"{n / 1024:.1f} KB"
+
+
+def optimize_site(site_dir, log=print):
+    """Run all steps over site_dir and log before/after byte counts."""
+    site_dir = Path(site_dir)
+
+    def own_files(*suffixes):
+        # Skip fingerprinted copies: they mirror an original and are redone from it.
+        return [p for p in site_dir.rglob("*") if p.suffix in suffixes and p.is_file()
+                and logical_name(p.name) == p.name]
+
+    sizes = {}
+    for path in own_files(".css", ".js"):
+        text = path.read_text(encoding="utf-8")
+        minified = minify_css(text) if path.suffix == ".css" else minify_js(text)
+        before, after = sizes.get(path.suffix, (0, 0))
+        sizes[path.suffix] = (before + len(text.encode()), after + len(minified.encode()))
+        if minified != text:
+            path.write_text(minified, encoding="utf-8")
+
+    manifest = fingerprint_site(site_dir)
+
+    critical = []
+    for page in own_files(".html"):
+        html = original = page.read_text(encoding="utf-8")
+        if "<style data-critical>" not in html:
+            inlined = inline_critical_css(html, page.parent)
+            if inlined != html:
+                critical.append(len(inlined.encode()) - len(html.encode()))
+                html = inlined
+        minified = minify_html(html)
+        before, after = sizes.get(".html", (0, 0))
+        sizes[".html"] = (before + len(html.encode()), after + len(minified.encode()))
+        if minified != original:
+            page.write_text(minified, encoding="utf-8")
+
+    total = gz = br = 0
+    for path in site_dir.rglob("*"):
+        if path.suffix in COMPRESSIBLE and path.is_file():
+            g, b = precompress(path)
+            total, gz, br = total + path.stat().st_size, gz + g, br + b
+
+    log(f"✓ {len(manifest)} asset URLs fingerprinted (assets/manifest.json)")
+    log("✓ minified: " + ", ".join(
+        f"{suffix[1:]} {_kb(before)} → {_kb(after)}" for suffix, (before, after) in sorted(sizes.items())
+    ))
+    if critical:
+        log(f"✓ critical CSS inlined in {len(critical)} page(s) (+{_kb(sum(critical))}), full stylesheet deferred")
+    log(f"✓ precompressed: {_kb(total)} → gzip {_kb(gz)}" + (f", brotli {_kb(br)}" if brotli else " (install brotli for .br)"))
@@ -0,0 +1,93 @@
+"""On-disk Jinja bytecode caches shared by every process that renders templates.
+
+Each `mkdocs build`, `mkdocs serve` rebuild and batch_build.py worker used to
+parse and compile templates/*.html (and the theme overrides) from scratch.
+With `bytecode_cache=bytecode_cache("<namespace>")` on an Environment, the
+compiled code is stored in .cache/jinja/<namespace>/ and loaded from there by
+the next process; Jinja checks the source checksum, so an edited template
+simply compiles again.
+
+One namespace per Environment setup: compiled code depends on the filters the
+environment had at compile time (e.g. MkDocs' context-aware `url` filter vs
+batch_build.py's plain one), so differently configured environments must not
+share entries for the same template file.
+
+Compiles and cache hits are counted (with their time) for the build output.
+"""
+import threading
+import time
+from pathlib import Path
+
+from jinja2 import FileSystemBytecodeCache
+
+ROOT = Path(__file__).resolve().parent
+BYTECODE_DIR = ROOT / ".cache" / "jinja"
+
+_lock = threading.Lock()
+_caches = {}
+_stats = {}
+
+
+def take_stats():
+    """Template loads (all namespaces) since the last call, then start
+    counting from zero again."""
+    global _stats
+    with _lock:
+        stats, _stats = _stats, {"compiled": 0, "compile_seconds": 0.0, "cached": 0, "cached_seconds": 0.0}
+    return stats
+
+
+take_stats()
+
+
+def _count(kind, seconds_key, seconds):
+    with _lock:
+        _stats[kind] += 1
+        _stats[seconds_key] += seconds
+
+
+class TimedBytecodeCache(FileSystemBytecodeCache):
+    """FileSystemBytecodeCache that counts compiled vs cached template loads.
+
+    Jinja calls load_bytecode() before compiling and dump_bytecode() right
+    after (same thread), so a miss's compile time is the time in between."""
+
+    def __init__(self, directory):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        super().__init__(str(directory))
+        self._pending = threading.local()
+
+    def load_bytecode(self, bucket):
+        start = time.perf_counter()
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            self._pending.start = start
+        else:
+            # The code object is unmarshalled in load_bytecode, so this is the full hit cost.
+            _count("cached", "cached_seconds", time.perf_counter() - start)
+
+    def dump_bytecode(self, bucket):
+        start = getattr(self._pending, "start", None)
+        if start is not None:
+            self._pending.start = None
+            _count("compiled", "compile_seconds", time.perf_counter() - start)
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass  # read-only checkout: still works, just without the speed-up
+
+
+def bytecode_cache(namespace):
+    """The process-wide bytecode cache for one kind of Environment."""
+    with _lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = _caches[namespace] = TimedBytecodeCache(BYTECODE_DIR / namespace)
+        return cache
+
+
+def format_stats(stats):
+    return (
+        f"templates: {stats['compiled']} compiled ({stats['compile_seconds'] * 1000:.1f} ms), "
+        f"{stats['cached']} from bytecode cache ({stats['cached_seconds'] * 1000:.1f} ms)"
+    )
@@ -0,0 +1,25 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def make_tree(tmp_path):
+    """make_tree(name, {file stem: engagement YAML}) -> a copy of docs/data/
+    at <tmp>/<name>/docs/data with only the given engagements."""
+
+    def make(name, engagements, parent=None):
+        data_dir = (parent or tmp_path) / name / "docs" / "data"
+        shutil.copytree(ROOT / "docs" / "data", data_dir)
+        shutil.rmtree(data_dir / "engagements")
+        (data_dir / "engagements").mkdir()
+        for stem, text in engagements.items():
+            (data_dir / "engagements" / f"{stem}.yml").write_text(text, encoding="utf-8")
+        return data_dir
+
+    return make
@@ -0,0 +1,12 @@
+import yaml
+
+from cv_data import parse_yaml, to_yaml
+
+
+def test_to_yaml_round_trips_and_keeps_the_field_order():
+    record = {"period": "2021 – heden", "order": 20210101, "organisation": "Gemeente Utrecht",
+              "activities": "- Ontwerpen van de keten\n- Begeleiden van het team", "keywords": "ArchiMate, Kafka"}
+    text = to_yaml(record)
+    assert parse_yaml(text) == record
+    assert list(yaml.safe_load(text)) == list(record)
+    assert "activities: |" in text and "2021 – heden" in text  # block scalar, unicode kept
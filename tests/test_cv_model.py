@@ -0,0 +1,21 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from cv_data import get_store
+from cv_model import Field, load_cv
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "docs" / "data"
+
+
+@pytest.mark.parametrize("fields, name", [
+    ({"Naam": "Johannes Blok", "Roepnaam": "Hans"}, "Hans Blok"),
+    ({"Naam": "Johanna Maria van der Berg", "Roepnaam": "Anne"}, "Anne van der Berg"),
+    ({"Naam": "Pieter Jansen"}, "Pieter Jansen"),
+    ({"naam": "Jansen", "Roepnaam": "Piet"}, "Piet"),
+    ({}, ""),
+])
+def test_name(fields, name):
+    cv = replace(load_cv(get_store(DATA_DIR)), fields=tuple(Field(k, v) for k, v in fields.items()))
+    assert cv.name == name
@@ -0,0 +1,18 @@
+import generate_docx
+from build_cache import BuildManifest
+
+
+def test_switching_the_writer_regenerates_the_docx(tmp_path, monkeypatch):
+    written = []
+
+    def fake_generate(data_dir, output_file, cv, writer):
+        written.append(writer)
+        output_file.write_bytes(writer.encode())
+        return True
+
+    monkeypatch.setattr(generate_docx, "generate_docx", fake_generate)
+    manifest = BuildManifest(tmp_path / "manifest.json")
+    output = tmp_path / "cv.docx"
+    for writer in ("python-docx", "python-docx", "fast", "fast", "python-docx"):
+        assert generate_docx.generate_docx_if_changed(output_file=output, manifest=manifest, writer=writer)
+    assert written == ["python-docx", "fast", "python-docx"]
@@ -0,0 +1,103 @@
+import importlib.util
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "legacy"
+ENGAGEMENTS = FIXTURES / "jan" / "content" / "engagements"
+
+_spec = importlib.util.spec_from_file_location("import_legacy", ROOT / "scripts" / "import_legacy.py")
+import_legacy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(import_legacy)
+
+
+def test_lookup_maps_every_synonym_whatever_its_spelling():
+    for field, variants in import_legacy.SYNONYMS.items():
+        for variant in variants:
+            assert import_legacy.LOOKUP[import_legacy.normalize_key(variant)] == field
+    assert import_legacy.LOOKUP[import_legacy.normalize_key("`Job_Title`")] == "role"
+    assert import_legacy.normalize_key("klant_nummer") not in import_legacy.LOOKUP
+
+
+def test_parse_fields_joins_continuation_lines_and_bullets():
+    lines = ["`periode`|2021 – 2024\n", "werkzaamheden|Intro.\n", "\n", "• Een.\n", "* Twee.\n",
+             "vervolg zonder pipe\n", "trefwoorden|a|b\n"]
+    assert list(import_legacy.parse_fields(lines)) == [
+        ("periode", "2021 – 2024"),
+        ("werkzaamheden", "Intro.\n\n- Een.\n- Twee.\nvervolg zonder pipe"),
+        ("trefwoorden", "a|b"),
+    ]
+
+
+def test_parse_engagement_reads_a_legacy_file():
+    # BOM, CRLF line endings, quoted/backticked keys, bullets and a keyword list.
+    record, unknown = import_legacy.parse_engagement(ENGAGEMENTS / "2018-2020.txt")
+    assert record == {
+        "period": "mrt 2018 – jun 2020",
+        "order": 20180301,
+        "organisation": "Gemeente Utrecht",
+        "role": "Solution Architect",
+        "activities": "Architectuur voor het zaaksysteem.\n\n- Doelarchitectuur opgesteld.\n- Leveranciers begeleid.",
+        "achievements": "Migratie naar Common Ground afgerond.",
+        "keywords": "ArchiMate, Common Ground, GEMMA",
+    }
+    assert list(record) == [f for f in import_legacy.FIELDS if f in record]
+    assert unknown == ["klant_nummer"]
+
+
+@pytest.mark.parametrize("name, message", [
+    ("zomer-2019.txt", "month"),
+    ("zonder-organisatie.txt", "missing organisation"),
+])
+def test_parse_engagement_rejects_unimportable_files(name, message):
+    with pytest.raises(ValueError, match=message):
+        import_legacy.parse_engagement(ENGAGEMENTS / name)
+
+
+def test_output_path_maps_content_engagements_to_docs_data():
+    source = FIXTURES / "jan" / "content" / "engagements" / "2021-heden.txt"
+    assert import_legacy.output_path(source, FIXTURES, Path("/out")) == \
+        Path("/out/jan/docs/data/engagements/2021-heden.yml")
+    assert import_legacy.output_path(FIXTURES / "los" / "a.txt", FIXTURES, Path("/out")) == Path("/out/los/a.yml")
+
+
+def test_import_trees_converts_reports_and_skips_up_to_date_files(tmp_path):
+    out = tmp_path / "roster"
+    results, _ = import_legacy.import_trees([FIXTURES], out, jobs=1)
+    status = {source.name: (state, detail) for source, state, detail in results}
+    assert status["2018-2020.txt"] == ("converted", "ignored keys: klant_nummer")
+    assert status["2021-heden.txt"] == ("converted", None)
+    assert status["zomer-2019.txt"][0] == status["zonder-organisatie.txt"][0] == "error"
+
+    target = out / "jan" / "docs" / "data" / "engagements" / "2021-heden.yml"
+    assert yaml.safe_load(target.read_text(encoding="utf-8"))["organisation"] == "Kadaster"
+    assert not (out / "jan" / "docs" / "data" / "engagements" / "zomer-2019.yml").exists()
+
+    results, _ = import_legacy.import_trees([FIXTURES], out, jobs=1)
+    assert {state for source, state, _ in results if source.name.endswith("heden.txt")} == {"skipped"}
+    results, _ = import_legacy.import_trees([FIXTURES], out, jobs=1, force=True)
+    assert {state for source, state, _ in results if source.name.endswith("heden.txt")} == {"converted"}
+
+
+def test_a_newer_source_is_converted_again(tmp_path):
+    source = tmp_path / "a.txt"
+    shutil.copy(ENGAGEMENTS / "2021-heden.txt", source)
+    target = tmp_path / "a.yml"
+    assert import_legacy.convert_one(source, target)[1] == "converted"
+    assert import_legacy.convert_one(source, target)[1] == "skipped"
+    stat = target.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert import_legacy.convert_one(source, target)[1] == "converted"
+
+
+def test_any_exception_is_that_files_failure(tmp_path, monkeypatch):
+    def broken(path):
+        raise KeyError("period")
+
+    monkeypatch.setattr(import_legacy, "parse_engagement", broken)
+    source, status, detail = import_legacy.convert_one(ENGAGEMENTS / "2021-heden.txt", tmp_path / "a.yml")
+    assert (status, detail) == ("error", "KeyError: 'period'")
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+import pdf_backends
+from pdf_backends import FakeBackend, PdfError, backend_name, file_url, get_backend
+
+
+class FlakyBackend(FakeBackend):
+    def print_pdf(self, html_file, output_pdf):
+        if "broken" in str(html_file):
+            raise OSError("disk full")
+        return super().print_pdf(html_file, output_pdf)
+
+
+def test_print_many_records_any_exception_as_that_jobs_failure(tmp_path):
+    jobs = []
+    for name in ("a", "broken", "b"):
+        html = tmp_path / f"{name}.html"
+        html.write_text("<html><body>cv</body></html>", encoding="utf-8")
+        jobs.append((html, tmp_path / f"{name}.pdf"))
+    with FlakyBackend(concurrency=2) as backend:
+        results = backend.print_many(jobs)
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert results[1]["error"] == "OSError: disk full"
+    assert (tmp_path / "b.pdf").exists()
+
+
+def test_file_url_quotes_the_path(tmp_path):
+    path = tmp_path / "mijn cv#1.html"
+    assert file_url(path) == path.resolve().as_uri()
+    assert "%20" in file_url(path) and "%231" in file_url(path)
+    assert file_url(Path("x.html")).startswith("file:///")
+
+
+@pytest.fixture
+def no_devtools(monkeypatch):
+    """A browser that is found but won't open a DevTools port."""
+    def refuse(self, *args, **kwargs):
+        raise PdfError("browser did not open a DevTools port in time")
+
+    monkeypatch.delenv("CV_PDF_BACKEND", raising=False)
+    monkeypatch.setattr(pdf_backends, "find_chrome", lambda: "/usr/bin/chrome")
+    monkeypatch.setattr(pdf_backends.ChromePoolBackend, "__init__", refuse)
+
+
+def test_pool_is_the_default(monkeypatch):
+    monkeypatch.delenv("CV_PDF_BACKEND", raising=False)
+    assert backend_name() == "pool"
+    monkeypatch.setenv("CV_PDF_BACKEND", "fake")
+    assert backend_name() == "fake"
+
+
+def test_the_default_falls_back_to_cli_without_devtools(no_devtools):
+    backend = get_backend(size=3)
+    assert (backend.name, backend.concurrency) == ("cli", 3)
+
+
+def test_a_chosen_pool_backend_does_not_fall_back(no_devtools, monkeypatch):
+    with pytest.raises(PdfError):
+        get_backend("pool")
+    monkeypatch.setenv("CV_PDF_BACKEND", "pool")
+    with pytest.raises(PdfError):
+        get_backend()
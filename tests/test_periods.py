@@ -0,0 +1,98 @@
+from datetime import date
+
+import pytest
+
+from periods import IntervalIndex, engagement_period, keyword_experience, parse_period
+
+TODAY = date(2026, 10, 1)
+
+
+def period(text):
+    return parse_period(text)
+
+
+@pytest.fixture
+def index():
+    index = IntervalIndex(TODAY)
+    index.add(period("2010 – 2018"), "a")
+    index.add(period("mrt 2017 – jun 2019"), "b")
+    index.add(period("2020 – heden"), "a")
+    index.add(period("2021 – 2021"), "b")
+    return index
+
+
+def test_overlapping_returns_entries_in_start_order(index):
+    hits = index.overlapping(period("2017 – 2017"))
+    assert [(p.text, key) for p, key in hits] == [("2010 – 2018", "a"), ("mrt 2017 – jun 2019", "b")]
+
+
+def test_overlapping_filters_on_key(index):
+    assert [p.text for p, _ in index.overlapping(period("2015 – 2022"), "b")] == ["mrt 2017 – jun 2019", "2021 – 2021"]
+
+
+def test_overlapping_treats_the_end_as_exclusive(index):
+    # "2010 – 2018" ends on 2018-01-01; "mrt 2017 – jun 2019" on 2019-07-01.
+    assert index.overlapping(period("jul 2019 – dec 2019")) == []
+
+
+def test_ongoing_periods_run_until_today(index):
+    assert [p.text for p, _ in index.overlapping(period("sep 2026 – sep 2026"))] == ["2020 – heden"]
+    assert index.overlapping(period("2027 – 2027")) == []
+
+
+def test_overlaps_pairs_every_parallel_entry(index):
+    pairs = [(a.text, b.text) for (a, _), (b, _) in index.overlaps()]
+    assert pairs == [("2010 – 2018", "mrt 2017 – jun 2019"), ("2020 – heden", "2021 – 2021")]
+    assert index.overlaps("a") == []
+
+
+def test_years_count_parallel_periods_once():
+    index = IntervalIndex(TODAY)
+    index.add(period("2010 – 2010"), "x")
+    index.add(period("jul 2010 – jun 2011"), "x")
+    assert index.years("x") == pytest.approx(1.5, abs=0.01)
+    index.add(period("2030 – 2030"), "x")  # cached coverage is refreshed
+    assert index.years("x") == pytest.approx(2.5, abs=0.01)
+    assert index.years("missing") == 0
+
+
+def test_keyword_experience_sorts_most_experience_first():
+    index = IntervalIndex(TODAY)
+    index.add(period("2010 – 2012"), ("jan", "kafka"))
+    index.add(period("2010 – 2015"), ("jan", "azure"))
+    index.add(period("2010 – 2020"), ("piet", "kafka"))
+    index.add(period("2010 – 2020"), ("jan", None))
+    assert list(keyword_experience(index, "jan")) == ["azure", "kafka"]
+
+
+@pytest.mark.parametrize("text, start, end", [
+    ("2021 – 2024", date(2021, 1, 1), date(2024, 1, 1)),
+    ("2025 – 2025", date(2025, 1, 1), date(2026, 1, 1)),
+    ("mrt 2019 – jun 2020", date(2019, 3, 1), date(2020, 7, 1)),
+    ("03-2019 – 06-2020", date(2019, 3, 1), date(2020, 7, 1)),
+    ("1997-2005", date(1997, 1, 1), date(2005, 1, 1)),
+    ("1997–2005", date(1997, 1, 1), date(2005, 1, 1)),
+    ("2026 – heden", date(2026, 1, 1), None),
+    ("2019-heden", date(2019, 1, 1), None),
+    ("2024 –", date(2024, 1, 1), None),
+])
+def test_parse_period(text, start, end):
+    parsed = parse_period(text)
+    assert (parsed.start, parsed.end, parsed.text) == (start, end, text)
+
+
+def test_parse_period_takes_the_start_from_order_in_the_start_year():
+    assert parse_period("2021 – 2024", order=20210315).start == date(2021, 3, 15)
+    assert parse_period("2021 – 2024", order=20190315).start == date(2021, 1, 1)
+
+
+@pytest.mark.parametrize("text", ["zomer 2019", "", "heden", "2019 – zomer 2020", "20-21"])
+def test_parse_period_rejects_unreadable_text(text):
+    with pytest.raises(ValueError):
+        parse_period(text)
+
+
+def test_engagement_period_is_none_for_unreadable_periods():
+    assert engagement_period({"period": "zomer 2019", "order": 20190701}) is None
+    assert engagement_period({"order": 20190701}) is None
+    assert engagement_period({"period": "1997-2005", "order": 19970101}).end == date(2005, 1, 1)
@@ -0,0 +1,18 @@
+import json
+
+import profiling
+
+
+def test_clear_and_merge_only_touch_this_tools_trace_files(tmp_path):
+    for name in ("build.123.json", "mkdocs.4567.json"):
+        profiling.write_trace(tmp_path / name, [("stage", name, 0, 1000, 1, 1, None)])
+    (tmp_path / "trace.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "results.json").write_text("[1, 2]", encoding="utf-8")
+    (tmp_path / "2024-10-01.json").write_text("x", encoding="utf-8")
+
+    target, count = profiling.merge_traces(tmp_path, tmp_path / profiling.MERGED_TRACE)
+    assert count == 2
+    assert len(json.loads(target.read_text(encoding="utf-8"))["traceEvents"]) == 2
+
+    profiling.clear_traces(tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["2024-10-01.json", "results.json"]
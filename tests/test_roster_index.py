@@ -0,0 +1,101 @@
+from datetime import date
+
+import pytest
+
+import roster_index
+from periods import parse_period
+
+TODAY = date(2026, 10, 1)
+
+
+def engagement(period, keywords, organisation="Kadaster", order=20000101):
+    return (f"period: {period}\norder: {order}\norganisation: {organisation}\nrole: Architect\n"
+            f"activities: Ontwerpen van de keten.\nachievements: Opgeleverd.\nkeywords: {keywords}\n")
+
+
+@pytest.fixture
+def db(tmp_path, make_tree):
+    jan = make_tree("jan", {
+        "a": engagement("2010 – 2015", "Kafka, Azure", order=20100101),
+        "b": engagement("2014 – 2016", "kafka", organisation="ProRail", order=20140101),
+        "c": engagement("zomer 2019", "Kafka", order=20190701),
+    })
+    piet = make_tree("piet", {
+        "a": engagement("2019-2021", "Azure, ArchiMate", order=20190101),
+    })
+    db = roster_index.connect(tmp_path / "roster.sqlite")
+    roster_index.update(db, [jan, piet])
+    return db
+
+
+@pytest.fixture
+def index(db):
+    return roster_index.roster_index(db, TODAY)
+
+
+def test_experience_ranks_people_and_counts_parallel_work_once(index):
+    # jan: 2010-2015 and 2014-2016 overlap -> 6 years, not 7; "zomer 2019" has no dates.
+    assert [(name, round(years, 1)) for name, years in roster_index.experience(index, "KAFKA")] == [("jan", 6.0)]
+    assert [name for name, _ in roster_index.experience(index, "azure")] == ["jan", "piet"]
+    assert roster_index.experience(index, "cobol") == []
+
+
+def test_overlaps_per_person(index):
+    assert [(name, a.text, b.text) for name, a, b in roster_index.overlaps(index)] == [
+        ("jan", "2010 – 2015", "2014 – 2016")]
+    assert roster_index.overlaps(index, "piet") == []
+
+
+def test_during(index):
+    hits = roster_index.during(index, parse_period("2020 – 2020"))
+    assert [(name, dates.text) for name, dates in hits] == [("piet", "2019-2021")]
+    hits = roster_index.during(index, parse_period("2014 – 2020"), keyword="Azure")
+    assert [name for name, _ in hits] == ["jan", "piet"]
+
+
+def test_cli(db, tmp_path, capsys):
+    db.close()
+    assert roster_index.main_cli(["--db", str(tmp_path / "roster.sqlite"), "experience", "--person", "jan"]) == 0
+    out = capsys.readouterr().out
+    assert "azure" in out and "kafka" in out
+    with pytest.raises(SystemExit):
+        roster_index.main_cli(["--db", str(tmp_path / "roster.sqlite"), "during", "zomer 2019"])
+
+
+def periods_of(matches):
+    return sorted(m.period for m in matches)
+
+
+def test_search_ranks_entries(db):
+    matches = roster_index.search(db, "kafka", kinds=["engagement"])
+    assert {m.name for m in matches} == {"jan"}
+    assert periods_of(matches) == ["2010 – 2015", "2014 – 2016", "zomer 2019"]
+    assert roster_index.search(db, "kaf")  # prefix match
+    assert roster_index.search(db, "cobol") == []
+
+
+def test_search_year_filters_use_the_parsed_periods(db):
+    # "2010 – 2015" is a handover: it covers up to 2014. "zomer 2019" has no dates.
+    assert periods_of(roster_index.search(db, "kafka", since=2015, kinds=["engagement"])) == ["2014 – 2016"]
+    assert periods_of(roster_index.search(db, "kafka", until=2013, kinds=["engagement"])) == ["2010 – 2015"]
+
+
+def test_search_people_needs_every_word_but_not_in_one_entry(db):
+    people = roster_index.search_people(db, "kafka prorail")
+    assert [name for name, _, _ in people] == ["jan"]
+    assert {name for name, _, _ in roster_index.search_people(db, "azure")} == {"jan", "piet"}
+
+
+def test_update_skips_unchanged_trees_and_prunes(db, tmp_path):
+    jan = tmp_path / "jan" / "docs" / "data"
+    report = roster_index.update(db, [jan])
+    assert report == {"indexed": [], "unchanged": ["jan"], "removed": []}
+    report = roster_index.update(db, [jan], prune=True)
+    assert report["removed"] == ["piet"]
+
+
+def test_trees_with_the_same_folder_name_get_distinct_names(db, tmp_path, make_tree):
+    other = make_tree("jan", {"a": engagement("2001 – 2003", "Cobol", order=20010101)}, parent=tmp_path / "elders")
+    assert roster_index.update(db, [other])["indexed"] == ["jan-2"]
+    assert {m.name for m in roster_index.search(db, "cobol")} == {"jan-2"}
+    assert {m.name for m in roster_index.search(db, "prorail")} == {"jan"}
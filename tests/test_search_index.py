@@ -0,0 +1,97 @@
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cv_data import get_store
+from search_index import BYTE_BUDGET, STOPWORDS, build_search_index, encode, gaps, normalize
+
+NODE = shutil.which("node")
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "docs" / "data"
+
+
+def index_of(terms, key_terms=(), docs=20):
+    return {"docs": [["e", str(i)] for i in range(docs)], "terms": terms, "key_terms": set(key_terms)}
+
+
+def decode(data):
+    index = json.loads(data)
+    postings = {}
+    for term, stored in index["terms"].items():
+        doc, postings[term] = 0, []
+        for gap in stored:
+            doc += gap
+            postings[term].append(doc)
+    return postings
+
+
+SEARCH_JS = Path(__file__).resolve().parent.parent / "docs" / "javascripts" / "search.js"
+QUERIES = [
+    "Solution-Architect bij Gemeente Zaanstad, één café",
+    "architect bij de overheid",
+    "Ça va? ÅÄÖ naïve coöperatie Zürich",
+    "a b de van IAM/OpenShift 2019-2021 x86_64",
+    "",
+]
+
+
+def js_normalize(texts, stopwords):
+    """Run search.js's own normalize() (its source, cut from the file) in node."""
+    source = SEARCH_JS.read_text(encoding="utf-8")
+    function = re.search(r"^  function normalize\(text\) \{.*?^  \}", source, re.S | re.M).group(0)
+    script = (f"const stopwords = new Set({json.dumps(sorted(stopwords))});\n{function}\n"
+              f"console.log(JSON.stringify({json.dumps(texts)}.map(normalize)));")
+    return json.loads(subprocess.run([NODE, "-e", script], capture_output=True, text=True, check=True).stdout)
+
+
+def test_normalize_drops_accents_short_terms_and_stopwords():
+    assert normalize("Solution-Architect bij Gemeente Zaanstad, één café") == [
+        "solution", "architect", "gemeente", "zaanstad", "cafe"]
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_normalize_matches_search_js():
+    assert js_normalize(QUERIES, STOPWORDS) == [normalize(text) for text in QUERIES]
+
+
+def test_the_index_ships_its_stopwords():
+    assert json.loads(encode(index_of({"architect": [0]})).data)["stop"] == sorted(STOPWORDS)
+
+
+def test_postings_are_stored_as_gaps():
+    assert gaps([0, 3, 4, 10]) == [0, 3, 1, 6]
+    terms = {"kafka": [1, 5, 6], "azure": list(range(20))}
+    encoded = encode(index_of(terms))
+    assert not encoded.over_budget and encoded.dropped == 0
+    assert decode(encoded.data) == terms
+
+
+def test_encode_keeps_common_and_key_terms_and_prunes_rare_prose_first():
+    terms = {"architect": list(range(20)), "kafka": [3], "2019": [4], "bestaande": [5], "overlegstructuren": [6, 7]}
+    full = len(encode(index_of(terms, key_terms={"kafka"})).data)
+    encoded = encode(index_of(terms, key_terms={"kafka"}), budget=full - 1)
+    kept = decode(encoded.data)
+    assert "2019" not in kept  # numbers go first
+    assert {"architect", "kafka", "overlegstructuren"} <= set(kept)
+    assert len(encoded.data) <= full - 1 and not encoded.over_budget
+
+
+def test_encode_never_prunes_key_terms_and_reports_over_budget():
+    terms = {f"keyword{i}": [i] for i in range(20)}
+    encoded = encode(index_of(terms, key_terms=terms), budget=100)
+    assert encoded.over_budget and encoded.dropped == 0
+    assert set(decode(encoded.data)) == set(terms)
+
+
+@pytest.mark.parametrize("budget", [BYTE_BUDGET, 4 * 1024])
+def test_index_of_this_cv_keeps_its_key_terms(budget):
+    index = build_search_index(get_store(DATA_DIR))
+    encoded = encode(index, budget)
+    kept = decode(encoded.data)
+    assert index["key_terms"] <= set(kept)
+    assert encoded.over_budget or len(encoded.data) <= budget
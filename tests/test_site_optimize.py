@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from site_optimize import minify_css, minify_html, minify_js
+
+DOCS = Path(__file__).resolve().parent.parent / "docs"
+
+
+def test_css_drops_comments_and_whitespace():
+    css = "/* kop */\nbody {\n  margin : 0;\n  color: #333;\n}\n\na > b ,\ni { x: 1 }\n"
+    assert minify_css(css) == "body{margin :0;color:#333}a>b,i{x:1}"
+
+
+def test_css_keeps_strings_as_written():
+    css = 'a::before { content: "  /* geen commentaar */  ;{ }" ; }\nq { quotes: \'«  \' "»"; }'
+    assert minify_css(css) == 'a::before{content:"  /* geen commentaar */  ;{ }"}q{quotes:\'«  \' "»"}'
+
+
+def test_css_keeps_the_spaces_calc_needs():
+    css = ".a {\n  width: calc(100% - 2 * var(--gap));\n  margin: calc( 1rem + 2px ) auto;\n}"
+    assert minify_css(css) == ".a{width:calc(100% - 2 * var(--gap));margin:calc( 1rem + 2px ) auto}"
+
+
+def test_css_keeps_descendant_pseudo_selectors_apart():
+    assert minify_css("nav :hover { x: 1 }") == "nav :hover{x:1}"
+    assert minify_css("@media (max-width: 600px) { a { x: 1 } }") == "@media (max-width:600px){a{x:1}}"
+
+
+def test_js_strips_indentation_blank_lines_and_whole_line_comments():
+    js = "// kop\nfunction f() {\n    /* blok\n       commentaar */\n\n    return 1;  // rest\n}\n"
+    assert minify_js(js) == "function f() {\nreturn 1;  // rest\n}"
+
+
+def test_js_keeps_code_after_a_closed_block_comment():
+    assert minify_js("/* init */ start();\n  /* a */ /* b\n  c */ next();") == "start();\nnext();"
+
+
+def test_js_keeps_regex_and_string_literals():
+    js = ("  const re = /\\/\\/[^\\n]*|\\/\\*/g;\n"
+          "  const url = 'http://example.org/*x*/';\n"
+          "  const s = \"  dubbele  spaties \";\n"
+          "  /[.*+?^${}()|[\\]\\\\]/g.test(x);\n")
+    assert minify_js(js) == "\n".join(line.strip() for line in js.strip("\n").splitlines())
+
+
+def test_js_with_template_literals_is_left_alone():
+    js = "const t = `\n  // geen commentaar\n`;\n"
+    assert minify_js(js) == js
+
+
+def test_html_collapses_whitespace_and_drops_comments():
+    html = "<div>\n  <!-- weg -->\n  <p>Een   twee\n  drie</p>\n</div>\n"
+    assert minify_html(html) == "<div> <p>Een twee drie</p> </div>"
+
+
+def test_html_preserves_pre_textarea_and_tekstblok():
+    html = ("<pre>  a\n    b</pre>\n<textarea>\n  x  y\n</textarea>\n"
+            "<div class='tekstblok'>Regel 1\n\n  Regel 2 <b>vet  </b></div>\n<p>  c  </p>")
+    assert minify_html(html) == ("<pre>  a\n    b</pre> <textarea>\n  x  y\n</textarea> "
+                                 "<div class='tekstblok'>Regel 1\n\n  Regel 2 <b>vet  </b></div> <p> c </p>")
+
+
+def test_html_minifies_inline_script_and_style_without_touching_their_strings():
+    html = ("<style>\n  a { content: '  <b>  '; }\n</style>\n"
+            "<script>\n  // init\n  const s = '  a  <p>  b  ';\n  if (x < 2) go();\n</script>")
+    assert minify_html(html) == ("<style>a{content:'  <b>  '}</style> "
+                                 "<script>const s = '  a  <p>  b  ';\nif (x < 2) go();</script>")
+
+
+@pytest.mark.parametrize("minify, path", [
+    (minify_css, "stylesheets/style.css"),
+    (minify_js, "javascripts/cv.js"),
+    (minify_js, "javascripts/search.js"),
+    (minify_js, "javascripts/print-ready.js"),
+])
+def test_minifying_is_idempotent(minify, path):
+    once = minify((DOCS / path).read_text(encoding="utf-8"))
+    assert minify(once) == once
+
+
+def test_minifying_html_is_idempotent():
+    html = ("<html><head><style> a { x: 1 } </style></head><body>\n <pre> p\n q </pre>\n"
+            "<div class=\"x tekstblok\">  a\n b</div> <script> f(); </script>\n</body></html>")
+    once = minify_html(html)
+    assert minify_html(once) == once